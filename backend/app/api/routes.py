@@ -1,15 +1,51 @@
 """FastAPI endpoint definitions for ProxSecure Audit API."""
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Response
+import asyncio
+import hashlib
+from datetime import datetime
+from typing import Literal
 
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.api.timed_route import TimedRoute
 from app.core.config import get_settings
-from app.models.automation import RemediationRequest, RemediationResponse
-from app.models.check import FleetSummary, HistoricalDataPoint, NodeAuditResult
+from app.core.serialization import FastJSONResponse, default_encoder, dumps
+from app.core.timing import timed_phase
+from app.models.automation import (
+    PlaybookRequest,
+    RemediationPlanRequest,
+    RemediationPlanResponse,
+    RemediationPlaybook,
+    RemediationRequest,
+    RemediationResponse,
+)
+from app.models.check import (
+    CheckCatalog,
+    CheckVerification,
+    CompactFleetSummary,
+    CompactNodeAuditResult,
+    ControlCoverageList,
+    ControlMatrix,
+    ControlStatus,
+    CustomerRollup,
+    CustomerRollupList,
+    FleetChanges,
+    FleetSummary,
+    HistoricalDataPoint,
+    NodeAuditResult,
+    SimulationRequest,
+    SimulationResult,
+)
 from app.services.audit_service import AuditService
 from app.services.automation_service import AutomationService
-from app.services.report_service import ReportService
+from app.services.change_tracker import result_fingerprint
+from app.services.event_bus import EVENT_OVERFLOW, EVENT_REMEDIATION_OUTPUT, EVENT_TYPES, EventBus
+from app.services.remediation_output import STREAM_EXIT
+from app.services.remediation_plan import node_steps
+from app.services.report_cache import ReportCache, iter_file_range, parse_range
 
-router = APIRouter(prefix="/api/v1", tags=["audit"])
+router = APIRouter(prefix="/api/v1", tags=["audit"], route_class=TimedRoute)
 
 
 def get_audit_service(request: Request) -> AuditService:
@@ -30,22 +66,19 @@ def get_automation_service(request: Request) -> AutomationService:
 def health(request: Request) -> dict:
     """
     Return service health status for monitoring/load balancers.
-    Includes Proxmox mode, node count, and automation status.
+    Includes Proxmox mode, node count (from the connectivity monitor cache), and automation status.
     """
     settings = get_settings()
     mode = (settings.PROXMOX_MODE or "mock").lower()
+    connectivity = request.app.state.connectivity_monitor.snapshot()
     payload = {
         "status": "healthy",
         "service": "ProxSecure Audit API",
         "proxmox_mode": mode,
         "automation_enabled": settings.AUTOMATION_ENABLED,
+        "nodes_accessible": connectivity["nodes_online"],
+        "connectivity_checked_at": connectivity["last_checked"],
     }
-    try:
-        prox = request.app.state.proxmox_service
-        nodes = prox.get_all_nodes()
-        payload["nodes_accessible"] = len(nodes)
-    except Exception:
-        payload["nodes_accessible"] = 0
     try:
         auto = request.app.state.automation_service
         payload["automation_status"] = auto.get_status()
@@ -54,55 +87,163 @@ def health(request: Request) -> dict:
     return payload
 
 
+@router.get(
+    "/livez",
+    summary="Liveness probe",
+    description="Returns 200 while the process is serving requests; never touches Proxmox.",
+)
+def livez() -> dict:
+    """Liveness: the event loop is responsive."""
+    return {"status": "alive"}
+
+
+@router.get(
+    "/readyz",
+    summary="Readiness probe",
+    description="Returns 200 once background warm-up (Proxmox connection) has completed, 503 otherwise.",
+    responses={503: {"description": "Warming up or degraded"}},
+)
+def readyz(request: Request) -> JSONResponse:
+    """Readiness: report warm-up state (starting, warming, ready, degraded) and last error."""
+    snapshot = request.app.state.readiness.snapshot()
+    return JSONResponse(status_code=200 if snapshot["ready"] else 503, content=snapshot)
+
+
 @router.get(
     "/health/proxmox",
     summary="Proxmox connection diagnostics",
-    description="Detailed Proxmox connection test without executing checks.",
+    description="Cached per-cluster reachability, node status and API latency from the background connectivity monitor.",
 )
 def health_proxmox(request: Request) -> dict:
-    """Return Proxmox connectivity diagnostics."""
+    """Return Proxmox connectivity diagnostics from the monitor's last probe round."""
     settings = get_settings()
     mode = (settings.PROXMOX_MODE or "mock").lower()
-    result = {"mode": mode, "connected": False, "nodes": [], "error": None}
-    try:
-        prox = request.app.state.proxmox_service
-        nodes = prox.get_all_nodes()
-        result["connected"] = True
-        result["nodes"] = nodes
-    except Exception as e:
-        result["error"] = str(e)
-    return result
+    connectivity = request.app.state.connectivity_monitor.snapshot()
+    return {
+        "mode": mode,
+        "connected": connectivity["connected"],
+        "nodes": connectivity["nodes"],
+        "error": connectivity["error"],
+        "last_checked": connectivity["last_checked"],
+        "clusters": connectivity["clusters"],
+    }
+
+
+AuditView = Literal["full", "compact"]
+VIEW_QUERY = Query(
+    "full",
+    description="full: embed check metadata; compact: check_id/status/details only (resolve via /checks)",
+)
+CATALOG_CACHE_SECONDS = 86400
+
+
+@router.get(
+    "/checks",
+    response_model=CheckCatalog,
+    summary="Check catalog",
+    description="Versioned catalog of all compliance checks (metadata, mappings, remediation). Cacheable by version.",
+    responses={304: {"description": "Catalog unchanged (If-None-Match)"}},
+)
+def get_check_catalog(
+    request: Request,
+    version: str | None = Query(None, description="Catalog version the client wants; enables immutable caching"),
+    svc: AuditService = Depends(get_audit_service),
+) -> CheckCatalog:
+    """
+    Return the check catalog with an ETag equal to its content-hash version.
+    Requests pinned to the current version (?version=...) are cacheable for a year.
+    """
+    catalog = svc.get_check_catalog()
+    etag = f'"{catalog.version}"'
+    if version == catalog.version:
+        cache_control = "public, max-age=31536000, immutable"
+    else:
+        cache_control = f"public, max-age={CATALOG_CACHE_SECONDS}"
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status_code=304, headers=headers)
+    return FastJSONResponse(dumps(catalog.model_dump(mode="json")), headers=headers)
 
 
 @router.get(
     "/audit/nodes",
-    response_model=FleetSummary,
+    response_model=FleetSummary | CompactFleetSummary,
     summary="Fleet audit summary",
     description="Returns aggregated compliance for all nodes (target response time < 200ms).",
 )
-def get_fleet_summary(svc: AuditService = Depends(get_audit_service)) -> FleetSummary:
+def get_fleet_summary(
+    view: AuditView = VIEW_QUERY,
+    svc: AuditService = Depends(get_audit_service),
+) -> FleetSummary:
     """
     Run audits for all nodes and return fleet-wide summary.
 
+    Encoded via the fast path (pre-serialized check metadata); the response model is
+    kept for the OpenAPI schema but not re-validated.
+
+    Args:
+        view: "full" (default) or "compact" (results reference the /checks catalog by check_id).
+
     Returns:
-        FleetSummary with total_nodes, average_compliance, critical_nodes, and per-node results.
+        FleetSummary (or CompactFleetSummary) with total_nodes, average_compliance, critical_nodes, and per-node results.
     """
-    return svc.get_fleet_summary()
+    summary = svc.get_fleet_summary()
+    catalog_version = svc.get_check_catalog().version
+    with timed_phase("encode"):
+        return FastJSONResponse(
+            default_encoder.encode_fleet_summary(summary, catalog_version if view == "compact" else None),
+            headers={"X-Check-Catalog-Version": catalog_version},
+        )
+
+
+@router.get(
+    "/audit/nodes/changes",
+    response_model=FleetChanges,
+    summary="Fleet changes since version",
+    description="Delta sync: nodes added, removed or changed (score/check status) after fleet version `since`.",
+)
+def get_fleet_changes(
+    since: int = Query(0, ge=0, description="Last fleet version seen by the client (0 = everything)"),
+    view: AuditView = VIEW_QUERY,
+    svc: AuditService = Depends(get_audit_service),
+) -> FleetChanges:
+    """
+    Return only the nodes whose audit results changed after `since`.
+
+    Args:
+        since: FleetSummary.version or FleetChanges.version from the previous poll.
+        view: "full" or "compact" encoding of attached node results.
+
+    Returns:
+        FleetChanges; full_resync=True means the client must replace its node list.
+    """
+    changes = svc.get_fleet_changes(since)
+    catalog_version = svc.get_check_catalog().version
+    with timed_phase("encode"):
+        return FastJSONResponse(
+            default_encoder.encode_fleet_changes(changes, catalog_version if view == "compact" else None),
+            headers={"X-Check-Catalog-Version": catalog_version},
+        )
 
 
 @router.get(
     "/audit/nodes/{node_id}",
-    response_model=NodeAuditResult,
+    response_model=NodeAuditResult | CompactNodeAuditResult,
     summary="Node audit detail",
     description="Returns full audit result for a single node (target response time < 300ms).",
     responses={404: {"description": "Node not found"}},
 )
-def get_node_audit(node_id: str, svc: AuditService = Depends(get_audit_service)) -> NodeAuditResult:
+def get_node_audit(
+    node_id: str,
+    view: AuditView = VIEW_QUERY,
+    svc: AuditService = Depends(get_audit_service),
+) -> NodeAuditResult:
     """
     Run all compliance checks for the given node and return the audit result.
 
     Args:
         node_id: Unique node identifier (e.g. customer-a-node).
+        view: "full" (default) or "compact" (results reference the /checks catalog by check_id).
 
     Returns:
         NodeAuditResult with compliance_score, check_results, and counts.
@@ -111,13 +252,216 @@ def get_node_audit(node_id: str, svc: AuditService = Depends(get_audit_service))
         HTTPException 404: If node_id is not found.
     """
     try:
-        return svc.get_node_audit(node_id)
+        result = svc.get_node_audit(node_id)
+    except ValueError as e:
+        if "not found" in str(e).lower():
+            raise HTTPException(status_code=404, detail=str(e)) from e
+        raise
+    catalog_version = svc.get_check_catalog().version
+    with timed_phase("encode"):
+        return FastJSONResponse(
+            default_encoder.encode_node_result(result, catalog_version if view == "compact" else None),
+            headers={"X-Check-Catalog-Version": catalog_version},
+        )
+
+
+@router.post(
+    "/audit/nodes/{node_id}/checks/{check_id}/verify",
+    response_model=CheckVerification,
+    summary="Re-check one check on a node",
+    description=(
+        "Re-fetch only the config keys the check depends on and re-evaluate it (with retry/backoff until it "
+        "passes), updating the cached node result and audit history. Runs automatically after remediation."
+    ),
+    responses={404: {"description": "Node or check not found"}},
+)
+def verify_node_check(
+    node_id: str,
+    check_id: str,
+    attempts: int | None = Query(None, ge=1, le=20, description="Attempts until PASS (default from settings)"),
+    svc: AuditService = Depends(get_audit_service),
+) -> CheckVerification:
+    """Targeted re-check of check_id on node_id."""
+    try:
+        with timed_phase("verify"):
+            return svc.verify_check(node_id, check_id, attempts=attempts)
+    except ValueError as e:
+        if "not found" in str(e).lower():
+            raise HTTPException(status_code=404, detail=str(e)) from e
+        raise
+
+
+@router.post(
+    "/audit/simulate",
+    response_model=SimulationResult,
+    summary="What-if compliance simulation",
+    description=(
+        "Apply hypothetical config overrides (and/or assume checks fixed) to a node set and project per-node "
+        "scores, averages and critical-list changes from the cached results and config snapshots. "
+        "Nothing is changed or recorded."
+    ),
+    responses={404: {"description": "Node, customer or check not found"}},
+)
+def simulate_audit(
+    request: SimulationRequest,
+    svc: AuditService = Depends(get_audit_service),
+) -> SimulationResult:
+    """Project compliance under hypothetical config changes."""
+    try:
+        return svc.simulate(request)
     except ValueError as e:
         if "not found" in str(e).lower():
             raise HTTPException(status_code=404, detail=str(e)) from e
         raise
 
 
+@router.get(
+    "/customers",
+    response_model=CustomerRollupList,
+    summary="Customer rollups",
+    description="Per-customer aggregates (average score, failing checks by severity, critical and worst nodes).",
+)
+def get_customer_rollups(svc: AuditService = Depends(get_audit_service)) -> CustomerRollupList:
+    """
+    Return the rollup of every customer. Rollups are maintained incrementally as node audits
+    land, so this does not re-audit or re-aggregate the fleet.
+    """
+    rollups = svc.get_customer_rollups()
+    with timed_phase("encode"):
+        return FastJSONResponse(dumps(rollups.model_dump(mode="json")))
+
+
+@router.get(
+    "/customers/{customer_id}",
+    response_model=CustomerRollup,
+    summary="Customer rollup",
+    description="Compliance aggregates of one customer's nodes.",
+    responses={404: {"description": "Customer not found"}},
+)
+def get_customer_rollup(customer_id: str, svc: AuditService = Depends(get_audit_service)) -> CustomerRollup:
+    """
+    Return the rollup of one customer.
+
+    Raises:
+        HTTPException 404: If no audited node belongs to customer_id.
+    """
+    try:
+        rollup = svc.get_customer_rollup(customer_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    with timed_phase("encode"):
+        return FastJSONResponse(dumps(rollup.model_dump(mode="json")))
+
+
+@router.get(
+    "/controls",
+    response_model=ControlCoverageList,
+    summary="Control coverage",
+    description=(
+        "Per-control pass rates for ISO 27001, BSI IT-Grundschutz and NIS2 controls, fleet-wide or for one "
+        "customer, from the control matrix maintained as audits land (no re-audit or fleet scan)."
+    ),
+    responses={404: {"description": "Framework or customer not found"}},
+)
+def get_control_coverage(
+    framework: str | None = Query(None, description="iso_27001, bsi_grundschutz or nis2 (default: all)"),
+    customer_id: str | None = Query(None, description="Only this customer's nodes"),
+    include_nodes: bool = Query(False, description="List failing node IDs per control"),
+    svc: AuditService = Depends(get_audit_service),
+) -> ControlCoverageList:
+    """Return the status of every control."""
+    try:
+        coverage = svc.get_control_coverage(framework, customer_id, include_nodes)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    with timed_phase("encode"):
+        return FastJSONResponse(dumps(coverage.model_dump(mode="json")))
+
+
+@router.get(
+    "/controls/matrix",
+    response_model=ControlMatrix,
+    summary="Node x control matrix",
+    description="PASS/FAIL/ERROR of every control per node (null: no mapped check assessed on the node).",
+    responses={404: {"description": "Framework or customer not found"}},
+)
+def get_control_matrix(
+    framework: str | None = Query(None, description="iso_27001, bsi_grundschutz or nis2 (default: all)"),
+    customer_id: str | None = Query(None, description="Only this customer's nodes"),
+    svc: AuditService = Depends(get_audit_service),
+) -> ControlMatrix:
+    """Return the node x control status matrix."""
+    try:
+        matrix = svc.get_control_matrix(framework, customer_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    with timed_phase("encode"):
+        return FastJSONResponse(dumps(matrix.model_dump(mode="json")))
+
+
+@router.get(
+    "/controls/{framework}/{control_id:path}",
+    response_model=ControlStatus,
+    summary="Control status",
+    description="Pass rate and failing nodes of one control (e.g. /controls/iso_27001/A.8.13).",
+    responses={404: {"description": "Framework, control or customer not found"}},
+)
+def get_control_status(
+    framework: str,
+    control_id: str,
+    customer_id: str | None = Query(None, description="Only this customer's nodes"),
+    svc: AuditService = Depends(get_audit_service),
+) -> ControlStatus:
+    """Return the status of one control."""
+    try:
+        status = svc.get_control_status(framework, control_id, customer_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    with timed_phase("encode"):
+        return FastJSONResponse(dumps(status.model_dump(mode="json")))
+
+
+EXPORT_EXTENSIONS = {"csv": "csv", "ndjson": "ndjson", "parquet": "parquet", "arrow": "arrows"}
+
+
+@router.get(
+    "/export/history",
+    summary="Bulk history export",
+    description=(
+        "Streams audit history for a node set and date range as CSV, NDJSON, Parquet or Arrow IPC "
+        "(columnar formats require pyarrow). level=node: one row per audit/trend point; "
+        "level=check: one row per check outcome."
+    ),
+    responses={400: {"description": "Unsupported format or level"}},
+)
+def export_history(
+    format: Literal["csv", "ndjson", "parquet", "arrow"] = Query("csv", description="Output format"),
+    level: Literal["node", "check"] = Query("node", description="Row granularity"),
+    nodes: str | None = Query(None, description="Comma-separated node IDs (default: all nodes)"),
+    start: datetime | None = Query(None, description="Earliest timestamp (ISO 8601, UTC if no offset)"),
+    end: datetime | None = Query(None, description="Latest timestamp (ISO 8601, UTC if no offset)"),
+    svc: AuditService = Depends(get_audit_service),
+) -> StreamingResponse:
+    """
+    Stream the export in chunks; rows are generated and encoded in bounded batches so memory
+    stays constant regardless of the number of rows.
+
+    Raises:
+        HTTPException 400: If the format needs pyarrow and it is not installed.
+    """
+    node_ids = [n.strip() for n in nodes.split(",") if n.strip()] if nodes else None
+    try:
+        chunks, media_type = svc.export_history(format, level, node_ids, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    filename = f"audit-history-{level}.{EXPORT_EXTENSIONS[format]}"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get(
     "/audit/nodes/{node_id}/history",
     response_model=list[HistoricalDataPoint],
@@ -155,16 +499,18 @@ def get_node_history(
     responses={404: {"description": "Node not found"}},
 )
 def download_node_report(
-    node_id: str, svc: AuditService = Depends(get_audit_service)
+    node_id: str, request: Request, svc: AuditService = Depends(get_audit_service)
 ) -> Response:
     """
-    Generate and return compliance audit report as PDF attachment.
+    Return the compliance audit report as PDF attachment, streamed from the report cache.
+    The PDF is rendered once per audit result (concurrent downloads share one render) and
+    supports Range requests for resumed downloads.
 
     Args:
         node_id: Unique node identifier.
 
     Returns:
-        Response with PDF content and Content-Disposition attachment header.
+        Streaming response with PDF content, Content-Length and Content-Disposition attachment header.
 
     Raises:
         HTTPException 404: If node_id is not found.
@@ -180,18 +526,95 @@ def download_node_report(
         history = svc.get_node_history(node_id)
     except ValueError:
         pass  # Report still generated; trend section omitted when history unavailable
+    from app.services.report_service import ReportService  # ReportLab is heavy; import on first use
+
     report_service = ReportService()
-    pdf_bytes = report_service.generate_pdf_report(node_id, audit_result, history=history)
-    filename = report_service.get_report_filename(node_id)
-    return Response(
-        content=pdf_bytes,
+    last_point = history[-1].date if history else ""
+    fingerprint = hashlib.sha1(repr(result_fingerprint(audit_result)).encode("utf-8")).hexdigest()
+    key = f"node:{node_id}:{fingerprint}:{svc.get_check_catalog().version}:{last_point}"
+
+    def render(out) -> None:
+        report_service.render_pdf_report(node_id, audit_result, out, history=history)
+
+    return _report_response(request, key, render, report_service.get_report_filename(node_id))
+
+
+def _report_response(request: Request, key: str, render, filename: str) -> Response:
+    """
+    Serve a cached (or freshly rendered, coalesced) report from disk as a chunked stream with
+    Content-Length, ETag and single-range support (206/416; If-Range and If-None-Match honoured).
+    """
+    cache: ReportCache = request.app.state.report_cache
+    etag = cache.etag(key)
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+    }
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status_code=304, headers=headers)
+    with timed_phase("render"):
+        pdf_file, size = cache.open(key, render)
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    if if_range is not None and if_range != etag:
+        range_header = None
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        pdf_file.close()
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(iter_file_range(pdf_file, 0, size), media_type="application/pdf", headers=headers)
+    start, end = byte_range
+    headers["Content-Length"] = str(end - start + 1)
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        iter_file_range(pdf_file, start, end - start + 1),
+        status_code=206,
         media_type="application/pdf",
-        headers={
-            "Content-Disposition": f'attachment; filename="{filename}"'
-        },
+        headers=headers,
     )
 
 
+@router.get(
+    "/customers/{customer_id}/report",
+    summary="Download customer PDF report",
+    description="Consolidated report for all nodes of a customer: fleet summary, per-node findings, control coverage.",
+    responses={404: {"description": "Customer not found"}},
+)
+def download_customer_report(
+    customer_id: str, request: Request, svc: AuditService = Depends(get_audit_service)
+) -> Response:
+    """
+    Render the customer report into the report cache (bounded memory for large fleets)
+    and stream it to the client; unchanged node results are served from the cache.
+
+    Raises:
+        HTTPException 404: If no audited node belongs to customer_id.
+    """
+    try:
+        rollup = svc.get_customer_rollup(customer_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    from app.services.report_service import ReportService  # ReportLab is heavy; import on first use
+
+    report_service = ReportService()
+    # Keyed on content, not the fleet version: the cache directory outlives the process, the version may not
+    key = f"customer:{customer_id}:{svc.customer_fingerprint(customer_id)}:{svc.get_check_catalog().version}"
+
+    def render(out) -> None:
+        report_service.render_customer_report(
+            rollup,
+            svc.iter_customer_nodes(customer_id),
+            out=out,
+            controls=svc.get_control_coverage(customer_id=customer_id),
+        )
+
+    return _report_response(request, key, render, report_service.get_customer_report_filename(customer_id))
+
+
 # --- Automation endpoints ---
 
 
@@ -199,12 +622,16 @@ def download_node_report(
     "/automation/remediate",
     response_model=RemediationResponse,
     summary="Execute remediation",
-    description="Run or dry-run remediation for a node/check. Requires AUTOMATION_ENABLED.",
+    description=(
+        "Run or dry-run remediation for a node/check. Requires AUTOMATION_ENABLED. "
+        "With wait=false returns 202 at once; follow /automation/executions/{execution_id}/stream."
+    ),
     responses={403: {"description": "Automation disabled"}, 404: {"description": "Node or check not found"}},
 )
 def execute_remediation(
     body: RemediationRequest,
     request: Request,
+    response: Response,
     audit_svc: AuditService = Depends(get_audit_service),
     auto_svc: AutomationService = Depends(get_automation_service),
 ) -> RemediationResponse:
@@ -228,11 +655,146 @@ def execute_remediation(
             status_code=404,
             detail=f"Check {body.check_id} not found or has no remediation for node {body.node_id}",
         )
-    return auto_svc.execute_remediation(
-        node_id=body.node_id,
-        check_id=body.check_id,
-        ansible_snippet=snippet,
-        dry_run=body.dry_run,
+    if not body.wait:
+        response.status_code = 202
+        return auto_svc.start_remediation(body.node_id, body.check_id, snippet, dry_run=body.dry_run)
+    with timed_phase("remediate"):
+        return auto_svc.execute_remediation(
+            node_id=body.node_id,
+            check_id=body.check_id,
+            ansible_snippet=snippet,
+            dry_run=body.dry_run,
+        )
+
+
+@router.post(
+    "/automation/remediate/plan",
+    response_model=RemediationPlanResponse,
+    summary="Execute node remediation plan",
+    description=(
+        "Run or dry-run the remediations of all (or the given) failing checks of a node as one plan: "
+        "steps ordered by the checks' run_after hints, independent steps in parallel, handlers such as "
+        "restart sshd once per node. Requires AUTOMATION_ENABLED."
+    ),
+    responses={403: {"description": "Automation disabled"}, 404: {"description": "Node or check not found"}},
+)
+def execute_remediation_plan(
+    body: RemediationPlanRequest,
+    response: Response,
+    audit_svc: AuditService = Depends(get_audit_service),
+    auto_svc: AutomationService = Depends(get_automation_service),
+) -> RemediationPlanResponse:
+    """Build the plan from the node's current audit and execute it."""
+    settings = get_settings()
+    if not settings.AUTOMATION_ENABLED:
+        raise HTTPException(status_code=403, detail="Automation is disabled")
+    try:
+        audit_result = audit_svc.get_node_audit(body.node_id)
+        run_after = {c.check_id: c.run_after for c in audit_svc.get_check_catalog().checks}
+        steps = node_steps(audit_result, run_after, body.check_ids)
+    except ValueError as e:
+        if "not found" in str(e).lower():
+            raise HTTPException(status_code=404, detail=str(e)) from e
+        raise
+    if not body.wait:
+        response.status_code = 202
+        return auto_svc.start_plan(body.node_id, steps, dry_run=body.dry_run)
+    with timed_phase("remediate"):
+        return auto_svc.execute_plan(body.node_id, steps, dry_run=body.dry_run)
+
+
+@router.post(
+    "/automation/playbook",
+    response_model=RemediationPlaybook,
+    summary="Generate consolidated remediation playbook",
+    description=(
+        "Build one Ansible playbook plus inventory for the failed checks of a node set "
+        "(node_ids, customer_id, or the whole fleet). Hosts with identical failing checks share "
+        "an inventory group; each check's tasks appear once. Nothing is executed."
+    ),
+    responses={404: {"description": "Node or customer not found"}},
+)
+def generate_remediation_playbook(
+    body: PlaybookRequest,
+    audit_svc: AuditService = Depends(get_audit_service),
+    auto_svc: AutomationService = Depends(get_automation_service),
+) -> RemediationPlaybook:
+    """Generate the playbook from current audit results of the selected nodes."""
+    try:
+        if body.node_ids:
+            results = [audit_svc.get_node_audit(node_id) for node_id in body.node_ids]
+        elif body.customer_id:
+            audit_svc.get_customer_rollup(body.customer_id)
+            results = audit_svc.iter_customer_nodes(body.customer_id)
+        else:
+            results = audit_svc.get_fleet_summary().nodes
+        with timed_phase("playbook"):
+            return auto_svc.generate_playbook(results, body.check_ids)
+    except ValueError as e:
+        if "not found" in str(e).lower():
+            raise HTTPException(status_code=404, detail=str(e)) from e
+        raise
+
+
+def _sse_output_frame(entry: dict) -> bytes:
+    return b"id: " + str(entry["seq"]).encode() + b"\nevent: " + EVENT_REMEDIATION_OUTPUT.encode() + b"\ndata: " + dumps(entry) + b"\n\n"
+
+
+@router.get(
+    "/automation/executions/{run_id}/stream",
+    summary="Live remediation output (SSE)",
+    description=(
+        "Server-Sent Events with the stdout/stderr lines and step status of a running or recent execution "
+        "(execution_id) or plan (plan_id): buffered lines first, then live lines; ends with an 'exit' entry "
+        "holding the final status. The same entries are published as remediation_output on /events/stream "
+        "and /events/ws."
+    ),
+    responses={404: {"description": "Execution not found or expired"}},
+)
+async def stream_remediation_output(
+    run_id: str,
+    request: Request,
+    auto_svc: AutomationService = Depends(get_automation_service),
+) -> StreamingResponse:
+    """Replay the run's ring buffer, then follow remediation_output events for it (deduplicated by seq)."""
+    try:
+        buffer = auto_svc.get_output(run_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    bus: EventBus = request.app.state.event_bus
+    try:
+        sub = bus.subscribe([EVENT_REMEDIATION_OUTPUT])  # before the snapshot so no line is missed
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+    keepalive = get_settings().EVENT_KEEPALIVE_SECONDS
+
+    async def output_source():
+        last_seq = 0
+        try:
+            backlog = buffer.snapshot()
+            while True:
+                for entry in backlog:
+                    if entry["seq"] <= last_seq:
+                        continue
+                    last_seq = entry["seq"]
+                    yield _sse_output_frame(entry)
+                    if entry["stream"] == STREAM_EXIT:
+                        return
+                event = await sub.get(timeout=keepalive)
+                if event is None:
+                    backlog = []
+                    yield b": keepalive\n\n"
+                elif event["type"] == EVENT_OVERFLOW:
+                    backlog = buffer.snapshot(last_seq)  # fell behind: resync from the ring buffer
+                else:
+                    backlog = [event["data"]] if event["data"]["run_id"] == run_id else []
+        finally:
+            sub.close()
+
+    return StreamingResponse(
+        output_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -265,3 +827,84 @@ def get_automation_status(
         "enabled": settings.AUTOMATION_ENABLED,
         "service": auto_svc.get_status(),
     }
+
+
+# --- Event stream endpoints ---
+
+
+def _parse_topics(topics: str | None) -> list[str] | None:
+    """Parse comma-separated topics; raise 422 on unknown event types."""
+    if not topics:
+        return None
+    parsed = [t.strip() for t in topics.split(",") if t.strip()]
+    unknown = [t for t in parsed if t not in EVENT_TYPES]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown event topics: {', '.join(unknown)}")
+    return parsed
+
+
+@router.get(
+    "/events/stream",
+    summary="Live event stream (SSE)",
+    description=(
+        "Server-Sent Events for node audit completions, score changes, critical-threshold crossings and "
+        "remediation status transitions. Filter with ?topics=a,b. Slow clients receive an 'overflow' event."
+    ),
+)
+async def stream_events(request: Request, topics: str | None = Query(None)) -> StreamingResponse:
+    """Stream events as text/event-stream with periodic keep-alive comments."""
+    bus: EventBus = request.app.state.event_bus
+    try:
+        sub = bus.subscribe(_parse_topics(topics))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+    keepalive = get_settings().EVENT_KEEPALIVE_SECONDS
+
+    async def event_source():
+        try:
+            while True:
+                event = await sub.get(timeout=keepalive)
+                if event is None:
+                    yield b": keepalive\n\n"
+                    continue
+                yield b"event: " + event["type"].encode() + b"\ndata: " + dumps(event) + b"\n\n"
+        finally:
+            sub.close()
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/events/ws")
+async def events_websocket(websocket: WebSocket, topics: str | None = None) -> None:
+    """WebSocket variant of /events/stream: one JSON event per text message."""
+    bus: EventBus = websocket.app.state.event_bus
+    try:
+        parsed = _parse_topics(topics)
+        sub = bus.subscribe(parsed)
+    except (HTTPException, RuntimeError) as e:
+        await websocket.close(code=1008, reason=getattr(e, "detail", str(e)))
+        return
+    keepalive = get_settings().EVENT_KEEPALIVE_SECONDS
+    await websocket.accept()
+    receiver = asyncio.ensure_future(websocket.receive())  # detects client disconnect while idle
+    try:
+        while True:
+            getter = asyncio.ensure_future(sub.get(timeout=keepalive))
+            await asyncio.wait({getter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if receiver.done():
+                getter.cancel()
+                if receiver.result()["type"] == "websocket.disconnect":
+                    break
+                receiver = asyncio.ensure_future(websocket.receive())  # client messages are ignored
+                continue
+            event = getter.result() or {"type": "keepalive"}
+            await websocket.send_text(dumps(event).decode("utf-8"))
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        receiver.cancel()
+        sub.close()
@@ -0,0 +1,71 @@
+"""APIRoute subclass adding Server-Timing headers and admin-only ?profile=1 sampling."""
+
+import hmac
+import time
+from typing import Any, Callable
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.routing import APIRoute
+
+from app.core.config import get_settings
+from app.core.timing import request_profiling, request_timing, timed_endpoint
+
+
+def is_admin_request(request: Request) -> bool:
+    """True if ADMIN_TOKEN is configured and the X-Admin-Token header matches it."""
+    expected = get_settings().ADMIN_TOKEN
+    supplied = request.headers.get("X-Admin-Token", "")
+    return bool(expected) and hmac.compare_digest(supplied.encode(), expected.encode())
+
+
+class TimedRoute(APIRoute):
+    """
+    Route that records per-phase timings and emits them as a Server-Timing header.
+
+    Phases: "endpoint" (route function incl. service work), service-level phases recorded
+    via timed_phase() (e.g. fetch, validators, models, render), "serialize" (response
+    model validation + JSON encoding) and "total".
+
+    With ?profile=1 and a valid X-Admin-Token the request runs under a sampling profiler
+    and the response body is replaced by the collapsed-stack profile (text/plain).
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(path, timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            if request.query_params.get("profile") == "1":
+                return await self._profiled(handler, request)
+            with request_timing() as timer:
+                start = time.perf_counter()
+                response = await handler(request)
+                total_ms = (time.perf_counter() - start) * 1000
+            timer.add("serialize", max(total_ms - timer.get("endpoint"), 0.0))
+            timer.add("total", total_ms)
+            response.headers["Server-Timing"] = timer.header_value()
+            return response
+
+        return timed_handler
+
+    @staticmethod
+    async def _profiled(handler: Callable, request: Request) -> Response:
+        if not is_admin_request(request):
+            return JSONResponse(status_code=403, content={"detail": "Profiling requires admin token"})
+        interval = get_settings().PROFILE_SAMPLE_INTERVAL_MS / 1000
+        with request_timing() as timer, request_profiling(interval) as profiler:
+            start = time.perf_counter()
+            response = await handler(request)
+            total_ms = (time.perf_counter() - start) * 1000
+        timer.add("total", total_ms)
+        return PlainTextResponse(
+            profiler.collapsed(),
+            headers={
+                "Server-Timing": timer.header_value(),
+                "X-Profile-Samples": str(profiler.sample_count),
+                "X-Profiled-Status": str(response.status_code),
+            },
+        )
@@ -0,0 +1,56 @@
+"""
+Command-line tools for ProxSecure.
+
+Usage (from backend/):
+    python -m app.cli export-history --format parquet --level check --nodes pve1,pve2 \\
+        --start 2026-01-01 --end 2026-02-01 -o history.parquet
+
+Uses the same settings (.env) as the API; with STATE_BACKEND=sqlite/redis it exports the audit
+history recorded by the running service.
+"""
+
+import argparse
+import sys
+from datetime import datetime
+
+from app.services.history_export import FORMATS, LEVELS
+
+
+def _export_history(args: argparse.Namespace) -> int:
+    from main import audit_service  # builds services from settings; no network I/O until used
+
+    node_ids = [n.strip() for n in args.nodes.split(",") if n.strip()] if args.nodes else None
+    try:
+        chunks, _ = audit_service.export_history(args.format, args.level, node_ids, args.start, args.end)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    out = open(args.output, "wb") if args.output != "-" else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export-history", help="Stream audit history as CSV, NDJSON, Parquet or Arrow")
+    export.add_argument("--format", choices=FORMATS, default="csv")
+    export.add_argument("--level", choices=LEVELS, default="node")
+    export.add_argument("--nodes", help="Comma-separated node IDs (default: all nodes)")
+    export.add_argument("--start", type=datetime.fromisoformat, help="Earliest timestamp (ISO 8601, UTC)")
+    export.add_argument("--end", type=datetime.fromisoformat, help="Latest timestamp (ISO 8601, UTC)")
+    export.add_argument("-o", "--output", default="-", help="Output file (default: stdout)")
+    export.set_defaults(func=_export_history)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
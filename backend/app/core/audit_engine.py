@@ -1,15 +1,28 @@
 """Registry Pattern audit engine with pluggable compliance checks."""
 
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Callable
+from typing import Awaitable, Callable, Iterable, Optional, Union
 
+from app.core.timing import current_timer
 from app.models.check import (
+    CheckCatalog,
+    CheckCatalogEntry,
     CheckResult,
     ComplianceMapping,
     RemediationTemplate,
 )
 
+logger = logging.getLogger(__name__)
+
 """
 Compliance Framework Versions:
 - ISO 27001:2022 (Annex A controls)
@@ -20,17 +33,40 @@ All control mappings verified as of January 2026.
 """
 
 
+Validator = Union[Callable[[dict], bool], Callable[[dict], Awaitable[bool]]]
+
+
 @dataclass
 class CheckDefinition:
-    """Definition of a single compliance check: metadata, validator, and remediation."""
+    """
+    Definition of a single compliance check: metadata, validator, and remediation.
+
+    validator_func may be a plain function or an async function (for checks that do I/O).
+    Set blocking=True for a sync validator that does I/O so it runs in a worker thread.
+    timeout_seconds overrides the engine default for async/blocking validators.
+    run_after lists checks whose remediation must complete first when both are remediated together.
+    config_keys lists the node config keys the validator reads (targeted re-fetch on verification;
+    empty means unknown, i.e. the full config is fetched).
+    detail_func (optional) explains a FAIL from the config, e.g. which guests lack a recent backup;
+    its text is appended to the result details.
+    """
 
     check_id: str
     check_name: str
     category: str
     severity: str
     compliance_mapping: ComplianceMapping
-    validator_func: Callable[[dict], bool]
+    validator_func: Validator
     remediation_template: RemediationTemplate | None
+    timeout_seconds: Optional[float] = None
+    blocking: bool = False
+    run_after: tuple[str, ...] = ()
+    config_keys: tuple[str, ...] = ()
+    detail_func: Optional[Callable[[dict], Optional[str]]] = None
+
+
+# (passed, error, duration_ms); passed is None when the validator raised or timed out
+_Outcome = tuple[Optional[bool], Optional[str], float]
 
 
 # --- Validators (one per compliance check) ---
@@ -52,9 +88,29 @@ def validate_backup_schedule(config: dict) -> bool:
 
 
 def validate_backup_retention(config: dict) -> bool:
-    """Check that backup retention is at least 7 days."""
+    """
+    Check that backup retention is at least 7 days and, where the archive index reports it,
+    that every guest has a backup newer than BACKUP_MAX_AGE_HOURS (retention alone is measured
+    from the oldest archive, so a guest whose backups stopped weeks ago would still pass).
+    """
     val = config.get("backup_retention_days")
-    return isinstance(val, (int, float)) and val >= 7
+    if not (isinstance(val, (int, float)) and val >= 7):
+        return False
+    return not config.get("backup_guests_without_recent_backup")
+
+
+def backup_retention_detail(config: dict) -> Optional[str]:
+    """Explain a backup retention FAIL: short retention and/or guests without a recent backup."""
+    parts = []
+    days = config.get("backup_retention_days")
+    if not (isinstance(days, (int, float)) and days >= 7):
+        parts.append(f"retention {days if days is not None else 'unknown'} day(s) < 7")
+    stale = config.get("backup_guests_without_recent_backup") or []
+    if stale:
+        hours = config.get("backup_max_age_hours")
+        window = f"{hours:g}h" if isinstance(hours, (int, float)) else "the allowed age"
+        parts.append(f"no backup within {window} for guest(s) {', '.join(str(v) for v in stale)}")
+    return "; ".join(parts) or None
 
 
 def validate_two_factor(config: dict) -> bool:
@@ -72,13 +128,21 @@ def validate_snmp_configured(config: dict) -> bool:
     return config.get("snmp_configured") is True
 
 
+def _require_vm_inventory(config: dict) -> None:
+    """Raise (check ERROR) when some guests could not be read: their settings are unknown."""
+    if config.get("vm_inventory_error"):
+        raise RuntimeError(f"guest inventory incomplete: {config['vm_inventory_error']}")
+
+
 def validate_vm_segmentation(config: dict) -> bool:
-    """Check that VM network segmentation is enabled."""
+    """Check that VM network segmentation is enabled (ERROR if some guests are unreadable)."""
+    _require_vm_inventory(config)
     return config.get("vm_network_segmentation") is True
 
 
 def validate_resource_limits(config: dict) -> bool:
-    """Check that VM resource limits are configured."""
+    """Check that VM resource limits are configured (ERROR if some guests are unreadable)."""
+    _require_vm_inventory(config)
     return config.get("vm_resource_limits") is True
 
 
@@ -89,7 +153,7 @@ def validate_privileged_logging(config: dict) -> bool:
 
 # --- Check definitions with ISO 27001, BSI IT-Grundschutz, and Ansible remediation ---
 
-# ISO 27001:2022 A.8.2 - Privileged access rights; NIS2 Article 21(2)(a) - Access control
+# ISO 27001:2022 A.8.2 - Privileged access rights; NIS2 Art. 21(2)(i) - Access control
 CHECK_SSH_ROOT = CheckDefinition(
     check_id="ssh_root_login",
     check_name="SSH root login disabled",
@@ -98,8 +162,10 @@ CHECK_SSH_ROOT = CheckDefinition(
     compliance_mapping=ComplianceMapping(
         iso_27001=["A.8.2"],
         bsi_grundschutz=["SYS.1.3.A14"],
+        nis2=["Art.21(2)(i)"],
     ),
     validator_func=validate_ssh_root_login,
+    config_keys=("ssh_permit_root_login",),
     remediation_template=RemediationTemplate(
         description="Disable SSH root login via PermitRootLogin no",
         ansible_snippet=(
@@ -112,9 +178,10 @@ CHECK_SSH_ROOT = CheckDefinition(
         ),
         priority="HIGH",
     ),
+    run_after=("firewall_enabled",),  # firewall up before sshd is restarted
 )
 
-# ISO 27001:2022 A.8.20/A.8.21 - Network security; NIS2 Article 21(2)(b) - Security of network and information systems
+# ISO 27001:2022 A.8.20/A.8.21 - Network security; NIS2 Art. 21(2)(e) - Security of network and information systems
 CHECK_FIREWALL = CheckDefinition(
     check_id="firewall_enabled",
     check_name="Firewall enabled",
@@ -123,8 +190,10 @@ CHECK_FIREWALL = CheckDefinition(
     compliance_mapping=ComplianceMapping(
         iso_27001=["A.8.20", "A.8.21"],
         bsi_grundschutz=["NET.1.1.A5"],
+        nis2=["Art.21(2)(e)"],
     ),
     validator_func=validate_firewall_enabled,
+    config_keys=("firewall_enabled",),
     remediation_template=RemediationTemplate(
         description="Enable and start firewall (iptables/nftables)",
         ansible_snippet=(
@@ -138,7 +207,7 @@ CHECK_FIREWALL = CheckDefinition(
     ),
 )
 
-# ISO 27001:2022 A.8.13 - Information backup; NIS2 Article 21(2)(c) - Business continuity and backup management
+# ISO 27001:2022 A.8.13 - Information backup; NIS2 Art. 21(2)(c) - Business continuity and backup management
 CHECK_BACKUP_SCHEDULE = CheckDefinition(
     check_id="backup_schedule",
     check_name="Backup schedule configured",
@@ -147,8 +216,10 @@ CHECK_BACKUP_SCHEDULE = CheckDefinition(
     compliance_mapping=ComplianceMapping(
         iso_27001=["A.8.13"],
         bsi_grundschutz=["CON.3.1.A1"],
+        nis2=["Art.21(2)(c)"],
     ),
     validator_func=validate_backup_schedule,
+    config_keys=("backup_schedule",),
     remediation_template=RemediationTemplate(
         description="Configure Proxmox backup schedule (e.g. vzdump cron)",
         ansible_snippet=(
@@ -165,7 +236,7 @@ CHECK_BACKUP_SCHEDULE = CheckDefinition(
     ),
 )
 
-# ISO 27001:2022 A.8.13 - Information backup; NIS2 Article 21(2)(c) - Backup management
+# ISO 27001:2022 A.8.13 - Information backup; NIS2 Art. 21(2)(c) - Backup management
 # Technical note: This Ansible snippet demonstrates the automation concept.
 # Production implementation should integrate with Proxmox API via proxmoxer
 # or use Ansible Tower/AWX for centralized playbook execution with audit trail.
@@ -177,8 +248,11 @@ CHECK_BACKUP_RETENTION = CheckDefinition(
     compliance_mapping=ComplianceMapping(
         iso_27001=["A.8.13"],
         bsi_grundschutz=["CON.3.1.A1"],
+        nis2=["Art.21(2)(c)"],
     ),
     validator_func=validate_backup_retention,
+    config_keys=("backup_retention_days", "backup_guests_without_recent_backup", "backup_max_age_hours"),
+    detail_func=backup_retention_detail,
     remediation_template=RemediationTemplate(
         description="Set backup retention to at least 7 days (storage.cfg or backup job config)",
         ansible_snippet=(
@@ -193,9 +267,10 @@ CHECK_BACKUP_RETENTION = CheckDefinition(
         ),
         priority="MEDIUM",
     ),
+    run_after=("backup_schedule",),
 )
 
-# ISO 27001:2022 A.8.5 - Secure authentication; NIS2 Article 21(2)(a) - Multi-factor authentication
+# ISO 27001:2022 A.8.5 - Secure authentication; NIS2 Art. 21(2)(j) - Multi-factor authentication
 # Technical note: 2FA requires manual TOTP setup per user; snippet demonstrates the concept.
 CHECK_TWO_FACTOR = CheckDefinition(
     check_id="two_factor_enabled",
@@ -205,8 +280,10 @@ CHECK_TWO_FACTOR = CheckDefinition(
     compliance_mapping=ComplianceMapping(
         iso_27001=["A.8.5"],
         bsi_grundschutz=["APP.4.2.A3"],
+        nis2=["Art.21(2)(j)"],
     ),
     validator_func=validate_two_factor,
+    config_keys=("two_factor_enabled",),
     remediation_template=RemediationTemplate(
         description="Enable 2FA for Proxmox web UI (requires per-user TOTP configuration)",
         ansible_snippet=(
@@ -221,7 +298,7 @@ CHECK_TWO_FACTOR = CheckDefinition(
     ),
 )
 
-# ISO 27001:2022 A.8.15 - Logging; NIS2 Article 21(2)(d) - Security monitoring and logging
+# ISO 27001:2022 A.8.15 - Logging; NIS2 Art. 21(2)(b) - Incident handling (logging)
 CHECK_SYSLOG = CheckDefinition(
     check_id="syslog_forwarding",
     check_name="Syslog forwarding enabled",
@@ -230,8 +307,10 @@ CHECK_SYSLOG = CheckDefinition(
     compliance_mapping=ComplianceMapping(
         iso_27001=["A.8.15"],
         bsi_grundschutz=["SYS.1.1.A18"],
+        nis2=["Art.21(2)(b)"],
     ),
     validator_func=validate_syslog_forwarding,
+    config_keys=("syslog_forwarding",),
     remediation_template=RemediationTemplate(
         description="Forward syslog to central SIEM/log server",
         ansible_snippet=(
@@ -244,9 +323,10 @@ CHECK_SYSLOG = CheckDefinition(
         ),
         priority="MEDIUM",
     ),
+    run_after=("privileged_access_logging",),  # forward the sudo log once it exists
 )
 
-# ISO 27001:2022 A.8.15 - Logging; NIS2 Article 21(2)(d) - Monitoring activities
+# ISO 27001:2022 A.8.15 - Logging; NIS2 Art. 21(2)(b) - Incident handling (monitoring)
 CHECK_SNMP = CheckDefinition(
     check_id="snmp_configured",
     check_name="SNMP configured for monitoring",
@@ -255,8 +335,10 @@ CHECK_SNMP = CheckDefinition(
     compliance_mapping=ComplianceMapping(
         iso_27001=["A.8.15"],
         bsi_grundschutz=["SYS.1.1.A18"],
+        nis2=["Art.21(2)(b)"],
     ),
     validator_func=validate_snmp_configured,
+    config_keys=("snmp_configured",),
     remediation_template=RemediationTemplate(
         description="Configure SNMP agent for monitoring",
         ansible_snippet=(
@@ -270,7 +352,7 @@ CHECK_SNMP = CheckDefinition(
     ),
 )
 
-# ISO 27001:2022 A.8.20 - Network controls; NIS2 Article 21(2)(b) - Network segmentation
+# ISO 27001:2022 A.8.20 - Network controls; NIS2 Art. 21(2)(e) - Network segmentation
 # Note: community.general.proxmox redirected to community.proxmox.proxmox in Ansible 2.10+
 # Technical note: Firewall rules require network design; integrate with change management.
 CHECK_VM_SEGMENTATION = CheckDefinition(
@@ -281,8 +363,10 @@ CHECK_VM_SEGMENTATION = CheckDefinition(
     compliance_mapping=ComplianceMapping(
         iso_27001=["A.8.20"],
         bsi_grundschutz=["NET.1.1.A5"],
+        nis2=["Art.21(2)(e)"],
     ),
     validator_func=validate_vm_segmentation,
+    config_keys=("vm_network_segmentation", "vm_inventory_error"),
     remediation_template=RemediationTemplate(
         description="Enforce VM network segmentation (VLANs/firewall rules); firewall rules require network design",
         ansible_snippet=(
@@ -298,7 +382,7 @@ CHECK_VM_SEGMENTATION = CheckDefinition(
     ),
 )
 
-# ISO 27001:2022 A.8.31 - Separation of environments; NIS2 Article 21(2)(e) - Capacity management
+# ISO 27001:2022 A.8.31 - Separation of environments; NIS2 Art. 21(2)(c) - Business continuity (capacity)
 # Note: community.general.proxmox redirected to community.proxmox.proxmox in Ansible 2.10+
 CHECK_RESOURCE_LIMITS = CheckDefinition(
     check_id="vm_resource_limits",
@@ -308,8 +392,10 @@ CHECK_RESOURCE_LIMITS = CheckDefinition(
     compliance_mapping=ComplianceMapping(
         iso_27001=["A.8.31"],
         bsi_grundschutz=["SYS.1.2.A2"],
+        nis2=["Art.21(2)(c)"],
     ),
     validator_func=validate_resource_limits,
+    config_keys=("vm_resource_limits", "vm_inventory_error"),
     remediation_template=RemediationTemplate(
         description="Set CPU/memory limits on VMs",
         ansible_snippet=(
@@ -325,7 +411,7 @@ CHECK_RESOURCE_LIMITS = CheckDefinition(
     ),
 )
 
-# ISO 27001:2022 A.5.18/A.8.15 - Access rights and logging; NIS2 Article 21(2)(a,d) - Privileged access monitoring
+# ISO 27001:2022 A.5.18/A.8.15 - Access rights and logging; NIS2 Art. 21(2)(b,i) - Privileged access monitoring
 CHECK_PRIVILEGED_LOGGING = CheckDefinition(
     check_id="privileged_access_logging",
     check_name="Privileged access logging enabled",
@@ -334,8 +420,10 @@ CHECK_PRIVILEGED_LOGGING = CheckDefinition(
     compliance_mapping=ComplianceMapping(
         iso_27001=["A.5.18", "A.8.15"],
         bsi_grundschutz=["APP.4.2.A5"],
+        nis2=["Art.21(2)(b)", "Art.21(2)(i)"],
     ),
     validator_func=validate_privileged_logging,
+    config_keys=("privileged_access_logging",),
     remediation_template=RemediationTemplate(
         description="Enable logging for privileged/sudo access",
         ansible_snippet=(
@@ -370,8 +458,25 @@ class AuditEngine:
     Returns standardized CheckResult list per node.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, default_timeout_seconds: float = 5.0, blocking_workers: int = 16) -> None:
+        """
+        Args:
+            default_timeout_seconds: Timeout for async/blocking validators without their own timeout_seconds.
+            blocking_workers: Threads for blocking validators. A timed-out validator keeps its thread
+                until it returns; the audit does not wait for it.
+
+        Async and blocking validators run on one long-lived event loop thread and executor owned by
+        the engine (started on first use), not on a loop created per audit: asyncio.run() would wait
+        for timed-out blocking validators when shutting down its default executor.
+        """
         self._checks: dict[str, CheckDefinition] = {}
+        self._concurrent: set[str] = set()
+        self._catalog: CheckCatalog | None = None
+        self._default_timeout = default_timeout_seconds
+        self._blocking_workers = max(1, blocking_workers)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._loop_lock = threading.Lock()
 
     def register_check(self, check_def: CheckDefinition) -> None:
         """
@@ -381,45 +486,200 @@ class AuditEngine:
             check_def: CheckDefinition with id, validator, and remediation.
         """
         self._checks[check_def.check_id] = check_def
+        if check_def.blocking or inspect.iscoroutinefunction(check_def.validator_func):
+            self._concurrent.add(check_def.check_id)
+        else:
+            self._concurrent.discard(check_def.check_id)
+        self._catalog = None
 
     def execute_checks(self, node_config: dict) -> list[CheckResult]:
         """
         Run all registered checks against the given node configuration.
 
+        Plain validators run inline. If any check is async or blocking, all checks run
+        concurrently on an event loop, each async/blocking one bounded by its timeout.
+        A validator that raises or times out yields status ERROR instead of failing the audit.
+
         Args:
             node_config: Dict with keys expected by validators (e.g. ssh_permit_root_login).
 
         Returns:
-            List of CheckResult (one per registered check) with status PASS/FAIL and details.
+            List of CheckResult (one per registered check) with status PASS/FAIL/ERROR,
+            details and duration_ms.
         """
-        results: list[CheckResult] = []
-        for check_def in self._checks.values():
-            passed = check_def.validator_func(node_config)
-            status = "PASS" if passed else "FAIL"
-            remediation = None if passed else check_def.remediation_template
-            details = (
-                f"Check {check_def.check_name} {status}."
-                if passed
-                else f"Check {check_def.check_name} failed; remediation available."
-            )
-            results.append(
-                CheckResult(
-                    check_id=check_def.check_id,
-                    check_name=check_def.check_name,
-                    category=check_def.category,
-                    severity=check_def.severity,
-                    status=status,
-                    compliance_mapping=check_def.compliance_mapping,
-                    remediation=remediation,
-                    details=details,
-                )
-            )
+        checks = list(self._checks.values())
+        start = time.perf_counter()
+        if self._concurrent:
+            outcomes = self._run_concurrently(checks, node_config)
+        else:
+            outcomes = [self._run_inline(c, node_config) for c in checks]
+        validator_seconds = time.perf_counter() - start
+        results = [self._to_result(c, outcome, node_config) for c, outcome in zip(checks, outcomes)]
+        timer = current_timer()
+        if timer is not None:
+            total_seconds = time.perf_counter() - start
+            timer.add("validators", validator_seconds * 1000)
+            timer.add("models", (total_seconds - validator_seconds) * 1000)
         return results
 
+    @staticmethod
+    def _run_inline(check_def: CheckDefinition, node_config: dict) -> _Outcome:
+        t0 = time.perf_counter()
+        try:
+            passed, error = bool(check_def.validator_func(node_config)), None
+        except Exception as e:
+            passed, error = None, f"{type(e).__name__}: {e}"
+        return passed, error, (time.perf_counter() - t0) * 1000
+
+    async def _run_one(self, check_def: CheckDefinition, node_config: dict) -> _Outcome:
+        if check_def.check_id not in self._concurrent:
+            return self._run_inline(check_def, node_config)
+        timeout = check_def.timeout_seconds or self._default_timeout
+        t0 = time.perf_counter()
+        try:
+            if check_def.blocking:
+                awaitable = asyncio.get_running_loop().run_in_executor(
+                    self._executor, check_def.validator_func, node_config
+                )
+            else:
+                awaitable = check_def.validator_func(node_config)
+            passed, error = bool(await asyncio.wait_for(awaitable, timeout)), None
+        except asyncio.TimeoutError:
+            passed, error = None, f"timed out after {timeout:g}s"
+        except Exception as e:
+            passed, error = None, f"{type(e).__name__}: {e}"
+        return passed, error, (time.perf_counter() - t0) * 1000
+
+    def _run_concurrently(self, checks: list[CheckDefinition], node_config: dict) -> list[_Outcome]:
+        async def run_all() -> list[_Outcome]:
+            return list(await asyncio.gather(*(self._run_one(c, node_config) for c in checks)))
+
+        return asyncio.run_coroutine_threadsafe(run_all(), self._ensure_loop()).result()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the engine's event loop thread and blocking-validator executor on first use."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._blocking_workers, thread_name_prefix="audit-validator"
+                )
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="audit-engine-loop", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def close(self) -> None:
+        """Stop the event loop thread and executor (running blocking validators are not waited for)."""
+        with self._loop_lock:
+            loop, executor = self._loop, self._executor
+            self._loop = self._executor = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _status(outcome: _Outcome) -> str:
+        passed, error, _ = outcome
+        return "ERROR" if error is not None else "PASS" if passed else "FAIL"
+
+    @classmethod
+    def _to_result(cls, check_def: CheckDefinition, outcome: _Outcome, node_config: dict) -> CheckResult:
+        _, error, duration_ms = outcome
+        status = cls._status(outcome)
+        if status == "ERROR":
+            details = f"Check {check_def.check_name} could not be evaluated: {error}"
+        elif status == "PASS":
+            details = f"Check {check_def.check_name} PASS."
+        else:
+            details = f"Check {check_def.check_name} failed; remediation available."
+            explanation = cls._explain(check_def, node_config)
+            if explanation:
+                details = f"Check {check_def.check_name} failed ({explanation}); remediation available."
+        return CheckResult(
+            check_id=check_def.check_id,
+            check_name=check_def.check_name,
+            category=check_def.category,
+            severity=check_def.severity,
+            status=status,
+            compliance_mapping=check_def.compliance_mapping,
+            remediation=check_def.remediation_template if status == "FAIL" else None,
+            details=details,
+            duration_ms=round(duration_ms, 3),
+        )
+
+    @staticmethod
+    def _explain(check_def: CheckDefinition, node_config: dict) -> Optional[str]:
+        if check_def.detail_func is None:
+            return None
+        try:
+            return check_def.detail_func(node_config)
+        except Exception:
+            logger.debug("detail_func of %s failed", check_def.check_id, exc_info=True)
+            return None
+
+    def execute_check(self, check_id: str, node_config: dict) -> CheckResult:
+        """
+        Run a single registered check (e.g. to verify a remediation); same semantics as execute_checks.
+
+        Raises:
+            ValueError: If check_id is not registered.
+        """
+        check_def = self._checks.get(check_id)
+        if check_def is None:
+            raise ValueError(f"Check not found: {check_id}")
+        return self._to_result(check_def, self._run_single(check_def, node_config), node_config)
+
+    def evaluate_check(self, check_id: str, node_config: dict) -> str:
+        """Status (PASS/FAIL/ERROR) of one check without building a CheckResult (bulk re-scoring)."""
+        return self._status(self._run_single(self._checks[check_id], node_config))
+
+    def checks_reading(self, keys: Iterable[str]) -> list[str]:
+        """IDs of checks whose result may depend on any of `keys` (checks without config_keys included)."""
+        keys = set(keys)
+        return [c.check_id for c in self._checks.values() if not c.config_keys or keys.intersection(c.config_keys)]
+
+    def _run_single(self, check_def: CheckDefinition, node_config: dict) -> _Outcome:
+        if check_def.check_id in self._concurrent:
+            return self._run_concurrently([check_def], node_config)[0]
+        return self._run_inline(check_def, node_config)
+
+    def get_check(self, check_id: str) -> Optional[CheckDefinition]:
+        """Return the registered check definition, or None."""
+        return self._checks.get(check_id)
+
     def get_all_checks(self) -> list[CheckDefinition]:
         """Return all registered check definitions (for introspection/documentation)."""
         return list(self._checks.values())
 
+    def get_catalog(self) -> CheckCatalog:
+        """
+        Return the versioned check catalog (cached until the next register_check).
+
+        The version is a SHA-256 prefix over the canonical JSON of all entries, so clients
+        can cache the catalog indefinitely per version and resolve compact results by check_id.
+        """
+        catalog = self._catalog
+        if catalog is None:
+            entries = [
+                CheckCatalogEntry(
+                    check_id=c.check_id,
+                    check_name=c.check_name,
+                    category=c.category,
+                    severity=c.severity,
+                    compliance_mapping=c.compliance_mapping,
+                    remediation=c.remediation_template,
+                    run_after=list(c.run_after),
+                    config_keys=list(c.config_keys),
+                )
+                for c in self._checks.values()
+            ]
+            canonical = json.dumps([e.model_dump(mode="json") for e in entries], sort_keys=True)
+            version = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+            catalog = CheckCatalog(version=version, checks=entries)
+            self._catalog = catalog
+        return catalog
+
 
 def _create_default_engine() -> AuditEngine:
     """Build engine with all 10 compliance checks registered."""
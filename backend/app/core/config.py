@@ -27,6 +27,51 @@ class Settings(BaseSettings):
     PROXMOX_VERIFY_SSL: bool = True
     PROXMOX_HYBRID_CONFIG: Union[str, dict] = "{}"
     AUTOMATION_ENABLED: bool = False
+    REMEDIATION_MAX_PARALLEL: int = 4
+    REMEDIATION_BACKGROUND_WORKERS: int = 4
+    REMEDIATION_OUTPUT_MAX_LINES: int = 1000
+    REMEDIATION_OUTPUT_MAX_RUNS: int = 256
+    REMEDIATION_VERIFY: bool = True
+    REMEDIATION_VERIFY_ATTEMPTS: int = 5
+    REMEDIATION_VERIFY_BACKOFF_SECONDS: float = 1.0
+    REMEDIATION_VERIFY_BACKOFF_MAX_SECONDS: float = 15.0
+    ADMIN_TOKEN: str = ""
+    PROFILE_SAMPLE_INTERVAL_MS: float = 5.0
+    WARMUP_MAX_BACKOFF_SECONDS: float = 30.0
+    HEALTH_PROBE_INTERVAL_SECONDS: float = 15.0
+    EVENT_BUFFER_SIZE: int = 256
+    EVENT_KEEPALIVE_SECONDS: float = 15.0
+    STATE_BACKEND: Literal["memory", "sqlite", "redis"] = "memory"
+    STATE_SQLITE_PATH: str = "/tmp/proxsecure-state.db"
+    STATE_REDIS_URL: str = "redis://localhost:6379/0"
+    AUDIT_CACHE_TTL_SECONDS: float = 0.0
+    AUDIT_STALE_MAX_AGE_SECONDS: float = 300.0
+    AUDIT_FAILURE_BACKOFF_SECONDS: float = 5.0
+    AUDIT_FAILURE_BACKOFF_MAX_SECONDS: float = 300.0
+    NODE_CUSTOMER_MAP: str = "{}"
+    AUDIT_HISTORY_MAX_ENTRIES: int = 100000
+    REPORT_CACHE_DIR: str = ""
+    REPORT_CACHE_MAX_FILES: int = 64
+    GUEST_FETCH_CONCURRENCY: int = 8
+    GUEST_INVENTORY_REFRESH_SECONDS: float = 60.0
+    GUEST_CONFIG_MAX_AGE_SECONDS: float = 3600.0
+    BACKUP_LISTING_MAX_AGE_SECONDS: float = 3600.0
+    BACKUP_MAX_AGE_HOURS: float = 48.0
+    SSH_PROBE_ENABLED: bool = False
+    SSH_USER: str = "root"
+    SSH_KEY_FILE: str = ""
+    SSH_PORT: int = 22
+    SSH_KNOWN_HOSTS: str = ""
+    SSH_HOST_MAP: str = "{}"
+    ANSIBLE_HOST_VARS: str = "{}"
+    SSH_MAX_PARALLEL: int = 16
+    SSH_TIMEOUT_SECONDS: float = 10.0
+    SSH_CACHE_SECONDS: float = 30.0
+    LOG_SCAN_ENABLED: bool = False
+    LOG_SCAN_PATHS: str = "/var/log/auth.log,/var/log/syslog"
+    LOG_SCAN_JOURNAL: bool = True
+    LOG_SCAN_FIXTURE_DIR: str = ""
+    LOG_SCAN_RECENT_HOURS: float = 24.0
 
     @field_validator("PROXMOX_HYBRID_CONFIG", mode="before")
     @classmethod
@@ -55,6 +100,32 @@ class Settings(BaseSettings):
                 return {}
         return {}
 
+    def ssh_host_map_dict(self) -> dict[str, str]:
+        """Return parsed SSH_HOST_MAP as dict node_id -> SSH host (empty if unset or invalid)."""
+        try:
+            data = json.loads(self.SSH_HOST_MAP or "{}")
+        except json.JSONDecodeError:
+            return {}
+        return {k: str(v) for k, v in data.items()} if isinstance(data, dict) else {}
+
+    def node_customer_map_dict(self) -> dict[str, str]:
+        """Return parsed NODE_CUSTOMER_MAP as dict node_id -> customer_id (empty if unset or invalid)."""
+        try:
+            data = json.loads(self.NODE_CUSTOMER_MAP or "{}")
+        except json.JSONDecodeError:
+            return {}
+        return {k: str(v) for k, v in data.items()} if isinstance(data, dict) else {}
+
+    def ansible_host_vars_dict(self) -> dict[str, dict]:
+        """Return parsed ANSIBLE_HOST_VARS as dict node_id|"*" -> variables (empty if unset or invalid)."""
+        try:
+            data = json.loads(self.ANSIBLE_HOST_VARS or "{}")
+        except json.JSONDecodeError:
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {k: v for k, v in data.items() if isinstance(v, dict)}
+
     def validate_for_mode(self) -> None:
         """Raise ValueError if required fields missing for current mode."""
         if self.PROXMOX_MODE == "real":
@@ -0,0 +1,129 @@
+"""Startup warm-up state for liveness/readiness probes and background connection warm-up."""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+STATE_STARTING = "starting"
+STATE_WARMING = "warming"
+STATE_READY = "ready"
+STATE_DEGRADED = "degraded"
+
+
+class ReadinessState:
+    """
+    Thread-safe warm-up state shared by the background warm-up and the probe endpoints.
+    States: starting -> warming -> ready, or warming -> degraded (retrying) -> ready.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._state = STATE_STARTING
+        self._started_at = datetime.utcnow()
+        self._ready_at: Optional[datetime] = None
+        self._attempts = 0
+        self._last_error: Optional[str] = None
+        self._detail: dict = {}
+        self._warnings: list[str] = []
+
+    @property
+    def is_ready(self) -> bool:
+        with self._lock:
+            return self._state == STATE_READY
+
+    def mark_warming(self) -> None:
+        with self._lock:
+            self._state = STATE_WARMING
+            self._attempts += 1
+
+    def mark_ready(self, **detail) -> None:
+        with self._lock:
+            self._state = STATE_READY
+            self._ready_at = datetime.utcnow()
+            self._last_error = None
+            self._detail.update(detail)
+
+    def mark_degraded(self, error: str, **detail) -> None:
+        with self._lock:
+            self._state = STATE_DEGRADED
+            self._last_error = error
+            self._detail.update(detail)
+
+    def add_warning(self, warning: str) -> None:
+        """Record a non-fatal startup problem (e.g. a fallback) reported alongside the state."""
+        with self._lock:
+            self._warnings.append(warning)
+
+    def snapshot(self) -> dict:
+        """Return probe payload: state, timestamps, attempts, last_error, warnings and warm-up detail."""
+        with self._lock:
+            return {
+                "state": self._state,
+                "ready": self._state == STATE_READY,
+                "started_at": self._started_at.isoformat(),
+                "ready_at": self._ready_at.isoformat() if self._ready_at else None,
+                "attempts": self._attempts,
+                "last_error": self._last_error,
+                "warnings": list(self._warnings),
+                **self._detail,
+            }
+
+
+class WarmupRunner:
+    """
+    Runs a warm-up callable on a daemon thread, retrying with exponential backoff
+    until it succeeds or stop() is called. The callable returns a detail dict for /readyz;
+    on_ready (optional) runs once after the first success.
+    """
+
+    def __init__(
+        self,
+        state: ReadinessState,
+        warmup: Callable[[], dict],
+        initial_backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 30.0,
+        on_ready: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self._state = state
+        self._on_ready = on_ready
+        self._warmup = warmup
+        self._initial_backoff = initial_backoff_seconds
+        self._max_backoff = max_backoff_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="proxsecure-warmup", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def join(self, timeout: float | None = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        backoff = self._initial_backoff
+        while not self._stop.is_set():
+            self._state.mark_warming()
+            start = time.perf_counter()
+            try:
+                detail = self._warmup() or {}
+            except Exception as e:
+                logger.warning("Warm-up failed; retrying in %.1fs: %s", backoff, e)
+                self._state.mark_degraded(str(e))
+                if self._stop.wait(backoff):
+                    return
+                backoff = min(backoff * 2, self._max_backoff)
+                continue
+            detail["warmup_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            self._state.mark_ready(**detail)
+            logger.info("Warm-up complete: %s", detail)
+            if self._on_ready is not None:
+                self._on_ready()
+            return
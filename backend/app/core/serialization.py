@@ -0,0 +1,188 @@
+"""Fast JSON encoding for audit payloads with pre-serialized static check metadata."""
+
+import json
+from datetime import datetime
+from typing import Any
+
+from fastapi import Response
+
+from app.models.check import (
+    CheckResult,
+    ComplianceMapping,
+    FleetChanges,
+    FleetSummary,
+    NodeAuditResult,
+    RemediationTemplate,
+)
+
+
+def _get_orjson():
+    try:
+        import orjson
+        return orjson
+    except ImportError:
+        return None
+
+
+_orjson = _get_orjson()
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode obj as compact UTF-8 JSON (orjson when installed, stdlib json otherwise)."""
+    if _orjson is not None:
+        return _orjson.dumps(obj, default=_default)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class _CheckFragments:
+    """Pre-encoded JSON fragments for one check's static metadata."""
+
+    __slots__ = ("prefix", "mapping", "mapping_bytes", "remediation")
+
+    def __init__(self, result: CheckResult) -> None:
+        self.prefix = (
+            b'{"check_id":' + dumps(result.check_id)
+            + b',"check_name":' + dumps(result.check_name)
+            + b',"category":' + dumps(result.category)
+            + b',"severity":' + dumps(result.severity)
+        )
+        self.mapping: ComplianceMapping = result.compliance_mapping
+        self.mapping_bytes = dumps(result.compliance_mapping.model_dump(mode="json"))
+        # (template, encoded bytes) swapped as one tuple so concurrent readers never see a mismatch
+        self.remediation: tuple[RemediationTemplate, bytes] | None = None
+
+
+class AuditPayloadEncoder:
+    """
+    Encodes CheckResult/NodeAuditResult/FleetSummary to JSON bytes without going through
+    jsonable_encoder or response-model re-validation.
+
+    Check metadata (id, name, category, severity, compliance mapping, remediation template)
+    is identical for every node, so it is encoded once per check and spliced in as bytes;
+    only status, details and node-level fields are encoded per result. Fragments are reused
+    while the result references the same mapping/remediation objects (the engine passes the
+    CheckDefinition instances through) or equal ones (results decoded from a shared state
+    backend), otherwise they are re-encoded.
+    """
+
+    def __init__(self) -> None:
+        self._fragments: dict[tuple[str, str, str, str], _CheckFragments] = {}
+
+    def _fragments_for(self, result: CheckResult) -> _CheckFragments:
+        key = (result.check_id, result.check_name, result.category, result.severity)
+        frag = self._fragments.get(key)
+        if frag is None or (
+            frag.mapping is not result.compliance_mapping and frag.mapping != result.compliance_mapping
+        ):
+            frag = _CheckFragments(result)
+            self._fragments[key] = frag
+        return frag
+
+    def _remediation_bytes(self, frag: _CheckFragments, remediation: RemediationTemplate | None) -> bytes:
+        if remediation is None:
+            return b"null"
+        cached = frag.remediation
+        if cached is None or (cached[0] is not remediation and cached[0] != remediation):
+            cached = (remediation, dumps(remediation.model_dump(mode="json")))
+            frag.remediation = cached
+        return cached[1]
+
+    def encode_check_result(self, result: CheckResult) -> bytes:
+        frag = self._fragments_for(result)
+        return b"".join((
+            frag.prefix,
+            b',"status":', dumps(result.status),
+            b',"compliance_mapping":', frag.mapping_bytes,
+            b',"remediation":', self._remediation_bytes(frag, result.remediation),
+            b',"details":', dumps(result.details),
+            b',"duration_ms":', dumps(result.duration_ms),
+            b"}",
+        ))
+
+    @staticmethod
+    def encode_compact_check_result(result: CheckResult) -> bytes:
+        return dumps({"check_id": result.check_id, "status": result.status, "details": result.details})
+
+    def encode_node_result(self, node: NodeAuditResult, catalog_version: str | None = None) -> bytes:
+        """Encode a node result; with catalog_version, check results are compact (check_id/status/details)."""
+        head = dumps({
+            "node_id": node.node_id,
+            "node_name": node.node_name,
+            "compliance_score": node.compliance_score,
+            "total_checks": node.total_checks,
+            "passed_checks": node.passed_checks,
+            "failed_checks": node.failed_checks,
+            "error_checks": node.error_checks,
+        })
+        if catalog_version is None:
+            checks = b",".join(self.encode_check_result(r) for r in node.check_results)
+            tail = b"}"
+        else:
+            checks = b",".join(self.encode_compact_check_result(r) for r in node.check_results)
+            tail = b',"catalog_version":' + dumps(catalog_version) + b"}"
+        return b"".join((
+            head[:-1],
+            b',"check_results":[', checks, b"]",
+            b',"timestamp":', dumps(node.timestamp),
+            b',"stale":', b"true" if node.stale else b"false",
+            b',"age_seconds":', dumps(node.age_seconds),
+            b',"last_error":', dumps(node.last_error),
+            tail,
+        ))
+
+    def encode_fleet_summary(self, summary: FleetSummary, catalog_version: str | None = None) -> bytes:
+        """Encode a fleet summary; with catalog_version, every node is encoded in compact form."""
+        head = dumps({
+            "total_nodes": summary.total_nodes,
+            "average_compliance": summary.average_compliance,
+            "critical_nodes": summary.critical_nodes,
+        })
+        nodes = b",".join(self.encode_node_result(n, catalog_version) for n in summary.nodes)
+        tail = b"".join((
+            b',"version":', dumps(summary.version),
+            b',"stale":', b"true" if summary.stale else b"false",
+            b',"stale_nodes":', dumps(summary.stale_nodes),
+            b',"last_error":', dumps(summary.last_error),
+        ))
+        if catalog_version is not None:
+            tail += b',"catalog_version":' + dumps(catalog_version)
+        return b"".join((head[:-1], b',"nodes":[', nodes, b"]", tail, b"}"))
+
+    def encode_fleet_changes(self, changes: FleetChanges, catalog_version: str | None = None) -> bytes:
+        """Encode a delta; attached node results use the same (optionally compact) encoding as the fleet."""
+        parts = []
+        for change in changes.changes:
+            head = dumps({
+                "node_id": change.node_id,
+                "change_type": change.change_type,
+                "version": change.version,
+                "previous_score": change.previous_score,
+                "changed_checks": change.changed_checks,
+            })
+            node = b"null" if change.node is None else self.encode_node_result(change.node, catalog_version)
+            parts.append(b"".join((head[:-1], b',"node":', node, b"}")))
+        head = dumps({"since": changes.since, "version": changes.version, "full_resync": changes.full_resync})
+        tail = b"}" if catalog_version is None else b',"catalog_version":' + dumps(catalog_version) + b"}"
+        return b"".join((head[:-1], b',"changes":[', b",".join(parts), b"]", tail))
+
+
+default_encoder = AuditPayloadEncoder()
+
+
+class FastJSONResponse(Response):
+    """JSON response whose content is already encoded bytes (or any object, encoded via dumps)."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
@@ -0,0 +1,68 @@
+"""Single-flight request coalescing: concurrent calls with the same key share one computation."""
+
+import threading
+from typing import Callable, Hashable, Optional, TypeVar
+
+from app.core.timing import timed_phase
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: object = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Deduplicates in-flight work per key. The first caller (leader) runs fn; callers arriving
+    while it runs block until it finishes and receive the same result or exception. Nothing is
+    cached afterwards: the next call after completion computes again.
+
+    Thread-based because sync FastAPI endpoints run in the threadpool. Results are shared
+    between callers and must be treated as read-only.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.coalesced = 0
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run fn() for key, or wait for the identical call already in flight and share its outcome."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            with timed_phase("coalesced"):
+                call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[return-value]
+
+        try:
+            call.result = fn()
+            return call.result  # type: ignore[return-value]
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
@@ -0,0 +1,201 @@
+"""Per-request phase timing (Server-Timing header) and on-demand sampling profiler."""
+
+import asyncio
+import functools
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional
+
+_current_timer: ContextVar[Optional["RequestTimer"]] = ContextVar("request_timer", default=None)
+_current_profiler: ContextVar[Optional["SamplingProfiler"]] = ContextVar("request_profiler", default=None)
+
+
+class RequestTimer:
+    """
+    Accumulates named phase durations for one request.
+    Phases with the same name are summed (e.g. "fetch" across all nodes of a fleet audit).
+    """
+
+    def __init__(self) -> None:
+        self._phases: dict[str, float] = {}
+        self._counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, duration_ms: float) -> None:
+        """Add duration_ms to phase name (thread-safe)."""
+        with self._lock:
+            self._phases[name] = self._phases.get(name, 0.0) + duration_ms
+            self._counts[name] = self._counts.get(name, 0) + 1
+
+    def get(self, name: str) -> float:
+        """Return accumulated milliseconds for phase name (0.0 if never recorded)."""
+        with self._lock:
+            return self._phases.get(name, 0.0)
+
+    def phases(self) -> dict[str, float]:
+        """Return a copy of phase name -> accumulated milliseconds."""
+        with self._lock:
+            return dict(self._phases)
+
+    def header_value(self) -> str:
+        """Format phases as a Server-Timing header value (e.g. 'fetch;dur=1.20;desc="x3"')."""
+        with self._lock:
+            parts = []
+            for name, dur in self._phases.items():
+                count = self._counts.get(name, 1)
+                entry = f"{name};dur={dur:.2f}"
+                if count > 1:
+                    entry += f';desc="x{count}"'
+                parts.append(entry)
+            return ", ".join(parts)
+
+
+def current_timer() -> Optional[RequestTimer]:
+    """Return the RequestTimer bound to the current request context, if any."""
+    return _current_timer.get()
+
+
+@contextmanager
+def timed_phase(name: str) -> Iterator[None]:
+    """Record the wall time of the enclosed block as phase name; no-op outside a timed request."""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, (time.perf_counter() - start) * 1000)
+
+
+@contextmanager
+def request_timing() -> Iterator[RequestTimer]:
+    """Bind a fresh RequestTimer to the current context for the duration of the block."""
+    timer = RequestTimer()
+    token = _current_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _current_timer.reset(token)
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler for a single request.
+
+    A daemon thread snapshots the stacks of registered threads every interval and
+    aggregates them in collapsed ("folded") format: one line per unique stack,
+    frames joined by ';' root-first, followed by the sample count. Output loads
+    directly into flamegraph.pl, speedscope or inferno.
+    """
+
+    def __init__(self, interval_seconds: float = 0.005) -> None:
+        self._interval = max(interval_seconds, 0.0005)
+        self._threads: set[int] = set()
+        self._samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def add_thread(self, thread_id: int) -> None:
+        """Register a thread whose stack should be sampled (e.g. the threadpool worker)."""
+        with self._lock:
+            self._threads.add(thread_id)
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            with self._lock:
+                targets = set(self._threads)
+            if not targets:
+                continue
+            frames = sys._current_frames()
+            for thread_id in targets:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self._samples[_fold_stack(frame)] += 1
+
+    @property
+    def sample_count(self) -> int:
+        return sum(self._samples.values())
+
+    def collapsed(self) -> str:
+        """Return samples in collapsed-stack format, most frequent stacks first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self._samples.most_common())
+
+
+def _fold_stack(frame: Any) -> str:
+    """Render a frame chain root-first as 'func (file:line);...'."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+
+@contextmanager
+def request_profiling(interval_seconds: float) -> Iterator[SamplingProfiler]:
+    """Bind and run a SamplingProfiler for the enclosed block; threads opt in via profile_current_thread()."""
+    profiler = SamplingProfiler(interval_seconds=interval_seconds)
+    token = _current_profiler.set(profiler)
+    profiler.add_thread(threading.get_ident())
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _current_profiler.reset(token)
+
+
+def profile_current_thread() -> None:
+    """Register the calling thread with the active request profiler, if any."""
+    profiler = _current_profiler.get()
+    if profiler is not None:
+        profiler.add_thread(threading.get_ident())
+
+
+def timed_endpoint(endpoint: Callable) -> Callable:
+    """
+    Wrap a route endpoint so its body is recorded as the "endpoint" phase and its
+    worker thread is sampled by an active profiler. Preserves sync/async nature and
+    signature so FastAPI dependency injection is unaffected. Idempotent, since
+    include_router() re-creates routes from already wrapped endpoints.
+    """
+    if getattr(endpoint, "__timed_endpoint__", False):
+        return endpoint
+    if asyncio.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            profile_current_thread()
+            with timed_phase("endpoint"):
+                return await endpoint(*args, **kwargs)
+
+        async_wrapper.__timed_endpoint__ = True  # type: ignore[attr-defined]
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+        profile_current_thread()
+        with timed_phase("endpoint"):
+            return endpoint(*args, **kwargs)
+
+    sync_wrapper.__timed_endpoint__ = True  # type: ignore[attr-defined]
+    return sync_wrapper
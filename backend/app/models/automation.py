@@ -5,6 +5,8 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from app.models.check import CheckVerification
+
 
 class RemediationRequest(BaseModel):
     """API input for remediation execution."""
@@ -12,6 +14,9 @@ class RemediationRequest(BaseModel):
     node_id: str = Field(..., description="Target node identifier")
     check_id: str = Field(..., description="Check identifier for audit trail")
     dry_run: bool = Field(True, description="If True, validate only; do not execute")
+    wait: bool = Field(
+        True, description="If False, return at once (status running) and follow /automation/executions/{id}/stream"
+    )
 
 
 class RemediationResponse(BaseModel):
@@ -20,11 +25,14 @@ class RemediationResponse(BaseModel):
     execution_id: str = Field(..., description="Unique execution identifier")
     node_id: str = Field(..., description="Target node")
     check_id: str = Field(..., description="Check identifier")
-    status: str = Field(..., description="success | skipped | error")
+    status: str = Field(..., description="success | skipped | error (running when started with wait=false)")
     dry_run: bool = Field(..., description="Whether execution was dry-run")
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     output: Optional[str] = Field(None, description="Execution output")
     error: Optional[str] = Field(None, description="Error message if status=error")
+    verification: Optional[CheckVerification] = Field(
+        None, description="Post-remediation re-check of the check (successful executions only)"
+    )
 
 
 class RemediationExecution(BaseModel):
@@ -37,3 +45,60 @@ class RemediationExecution(BaseModel):
     timestamp: datetime
     output: Optional[str] = None
     error: Optional[str] = None
+    verification: Optional[CheckVerification] = None
+
+
+class PlaybookRequest(BaseModel):
+    """API input for consolidated playbook generation; omit node_ids and customer_id for the whole fleet."""
+
+    node_ids: Optional[list[str]] = Field(None, description="Target nodes")
+    customer_id: Optional[str] = Field(None, description="Target all nodes of this customer")
+    check_ids: Optional[list[str]] = Field(None, description="Only remediate these checks (default: all failed)")
+
+
+class PlaybookGroup(BaseModel):
+    """Inventory group of hosts sharing the same set of failing checks."""
+
+    name: str = Field(..., description="Inventory group name")
+    check_ids: list[str] = Field(..., description="Failing checks remediated on these hosts")
+    hosts: list[str] = Field(..., description="Node IDs in the group")
+
+
+class RemediationPlaybook(BaseModel):
+    """One playbook plus inventory remediating failed checks across a node set."""
+
+    playbook: str = Field(..., description="Playbook YAML (empty if nothing to remediate)")
+    inventory: str = Field(..., description="Inventory YAML with per-host variables and group check lists")
+    groups: list[PlaybookGroup] = Field(..., description="Host groups, largest first")
+    host_count: int = Field(..., description="Number of hosts with at least one check to remediate")
+    task_count: int = Field(..., description="Number of deduplicated tasks in the playbook")
+    unresolved_variables: dict[str, list[str]] = Field(
+        default_factory=dict, description="Node ID -> template variables without a value (set ANSIBLE_HOST_VARS)"
+    )
+
+
+class RemediationPlanRequest(BaseModel):
+    """API input for executing all remediations of a node as one dependency-ordered plan."""
+
+    node_id: str = Field(..., description="Target node identifier")
+    check_ids: Optional[list[str]] = Field(None, description="Only these failing checks (default: all failing)")
+    dry_run: bool = Field(True, description="If True, validate only; do not execute")
+    wait: bool = Field(
+        True, description="If False, return at once (status running) and follow /automation/executions/{plan_id}/stream"
+    )
+
+
+class RemediationPlanResponse(BaseModel):
+    """Outcome of a remediation plan: per-step results and handlers run once per node."""
+
+    plan_id: str = Field(..., description="Unique plan identifier")
+    node_id: str = Field(..., description="Target node")
+    dry_run: bool = Field(..., description="Whether execution was dry-run")
+    status: str = Field(
+        ..., description="success | skipped | error (error if any step or handler failed); running with wait=false"
+    )
+    stages: list[list[str]] = Field(..., description="Check IDs by dependency depth; each stage can run in parallel")
+    steps: list[RemediationResponse] = Field(..., description="Step results in completion order")
+    handlers: list[RemediationResponse] = Field(
+        default_factory=list, description="Handlers (e.g. restart sshd) run once after the steps that notified them"
+    )
@@ -1,16 +1,17 @@
 """Pydantic data models for compliance checks and audit results."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import BaseModel, Field
 
 
 class ComplianceMapping(BaseModel):
-    """Dual compliance framework references (ISO 27001 and BSI IT-Grundschutz)."""
+    """Compliance framework references (ISO 27001, BSI IT-Grundschutz and NIS2)."""
 
     iso_27001: list[str] = Field(..., description="ISO 27001 control references")
     bsi_grundschutz: list[str] = Field(..., description="BSI IT-Grundschutz module references")
+    nis2: list[str] = Field(default_factory=list, description="NIS2 Article 21(2) measure references")
 
 
 class RemediationTemplate(BaseModel):
@@ -28,12 +29,13 @@ class CheckResult(BaseModel):
     check_name: str = Field(..., description="Human-readable check name")
     category: str = Field(..., description="Check category (e.g., ACCESS_CONTROL)")
     severity: str = Field(..., description="Check severity (CRITICAL, HIGH, MEDIUM)")
-    status: str = Field(..., description="PASS or FAIL")
-    compliance_mapping: ComplianceMapping = Field(..., description="ISO/BSI references")
+    status: str = Field(..., description="PASS, FAIL, or ERROR (validator raised or timed out)")
+    compliance_mapping: ComplianceMapping = Field(..., description="ISO/BSI/NIS2 references")
     remediation: Optional[RemediationTemplate] = Field(
         None, description="Remediation template (typically for failed checks)"
     )
     details: str = Field(..., description="Additional details or message")
+    duration_ms: Optional[float] = Field(None, description="Validator execution time in milliseconds")
 
 
 class NodeAuditResult(BaseModel):
@@ -44,9 +46,29 @@ class NodeAuditResult(BaseModel):
     compliance_score: int = Field(..., description="Compliance score 0-100")
     total_checks: int = Field(..., description="Total number of checks executed")
     passed_checks: int = Field(..., description="Number of passed checks")
-    failed_checks: int = Field(..., description="Number of failed checks")
+    failed_checks: int = Field(..., description="Number of checks not passed (including errors)")
+    error_checks: int = Field(0, description="Number of checks that could not be evaluated (ERROR)")
     check_results: list[CheckResult] = Field(..., description="Individual check results")
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Audit execution time")
+    stale: bool = Field(False, description="True if this is the last known good result, served while refreshing")
+    age_seconds: Optional[float] = Field(None, description="Age of a stale result in seconds")
+    last_error: Optional[str] = Field(None, description="Most recent refresh error for this node, if any")
+
+
+class CheckVerification(BaseModel):
+    """Outcome of re-evaluating one check after remediation (targeted re-fetch, with retries)."""
+
+    node_id: str = Field(..., description="Node identifier")
+    check_id: str = Field(..., description="Verified check")
+    status: str = Field(..., description="Final check status: PASS, FAIL, or ERROR")
+    verified: bool = Field(..., description="True if the check passed within the allowed attempts")
+    attempts: int = Field(..., description="Number of fetch + evaluate attempts")
+    latency_ms: float = Field(..., description="Time from start of verification to the final evaluation")
+    fetched_keys: list[str] = Field(
+        default_factory=list, description="Config keys re-fetched (empty: full node config)"
+    )
+    compliance_score: int = Field(..., description="Node compliance score after applying the check result")
+    result: CheckResult = Field(..., description="Final check result (stored in the cached node result)")
 
 
 class FleetSummary(BaseModel):
@@ -56,6 +78,136 @@ class FleetSummary(BaseModel):
     average_compliance: float = Field(..., description="Average compliance score across fleet")
     critical_nodes: list[str] = Field(..., description="Node IDs with compliance_score < 60%")
     nodes: list[NodeAuditResult] = Field(..., description="Per-node audit results")
+    version: int = Field(0, description="Fleet version after this audit (baseline for /audit/nodes/changes)")
+    stale: bool = Field(False, description="True if any node result (or the node list) is a last known good copy")
+    stale_nodes: list[str] = Field(default_factory=list, description="Node IDs whose results are stale")
+    last_error: Optional[str] = Field(None, description="Most recent refresh error across the fleet, if any")
+
+
+class NodeChange(BaseModel):
+    """Change of one node's audit result since a fleet version."""
+
+    node_id: str = Field(..., description="Node identifier")
+    change_type: str = Field(..., description="added | updated | removed")
+    version: int = Field(..., description="Fleet version of the latest change to this node")
+    previous_score: Optional[int] = Field(None, description="Score before the change (updated/removed)")
+    changed_checks: list[str] = Field(default_factory=list, description="Check IDs whose status/details changed")
+    node: Optional[NodeAuditResult] = Field(None, description="Latest audit result (omitted for removed nodes)")
+
+
+class FleetChanges(BaseModel):
+    """Delta of fleet audit results between `since` and `version`."""
+
+    since: int = Field(..., description="Client's last known fleet version")
+    version: int = Field(..., description="Current fleet version")
+    full_resync: bool = Field(..., description="True if `since` is unknown/expired and changes list every node")
+    changes: list[NodeChange] = Field(..., description="One entry per changed node, oldest change first")
+
+
+class CustomerNodeScore(BaseModel):
+    """Node and score entry of a customer's worst-nodes list."""
+
+    node_id: str = Field(..., description="Node identifier")
+    compliance_score: int = Field(..., description="Compliance score 0-100")
+
+
+class CustomerRollup(BaseModel):
+    """Compliance aggregates of one customer's (tenant's) nodes."""
+
+    customer_id: str = Field(..., description="Customer identifier (NODE_CUSTOMER_MAP or node naming convention)")
+    total_nodes: int = Field(..., description="Number of audited nodes of this customer")
+    average_compliance: float = Field(..., description="Average compliance score across the customer's nodes")
+    critical_nodes: list[str] = Field(..., description="Node IDs with compliance_score < 60%")
+    failing_checks_by_severity: dict[str, int] = Field(
+        ..., description="Failed check count across the customer's nodes per severity"
+    )
+    error_checks: int = Field(0, description="Checks that could not be evaluated across the customer's nodes")
+    worst_nodes: list[CustomerNodeScore] = Field(..., description="Lowest-scoring nodes, worst first")
+    version: int = Field(0, description="Fleet version the rollup reflects")
+
+
+class CustomerRollupList(BaseModel):
+    """Rollups of all customers."""
+
+    version: int = Field(..., description="Fleet version the rollups reflect")
+    customers: list[CustomerRollup] = Field(..., description="One rollup per customer, by customer_id")
+
+
+class SimulationRequest(BaseModel):
+    """What-if input: hypothetical config overrides and/or fixed checks on a node set."""
+
+    node_ids: Optional[list[str]] = Field(None, description="Target nodes (default: customer_id or whole fleet)")
+    customer_id: Optional[str] = Field(None, description="Target all nodes of this customer")
+    overrides: dict[str, Any] = Field(
+        default_factory=dict, description="Config key -> hypothetical value (e.g. {\"two_factor_enabled\": true})"
+    )
+    fix_checks: list[str] = Field(default_factory=list, description="Checks assumed to PASS after remediation")
+    include_nodes: bool = Field(True, description="Include per-node projections (false: aggregates only)")
+
+
+class SimulatedNode(BaseModel):
+    """Projected score of one node under the simulation."""
+
+    node_id: str = Field(..., description="Node identifier")
+    current_score: int = Field(..., description="Score of the cached audit result")
+    projected_score: int = Field(..., description="Score with the overrides/fixes applied")
+    changed_checks: list[str] = Field(default_factory=list, description="Checks whose status would change")
+
+
+class SimulationResult(BaseModel):
+    """Projected impact of a what-if simulation (nothing is changed)."""
+
+    total_nodes: int = Field(..., description="Simulated nodes")
+    current_average: float = Field(..., description="Average score of the simulated nodes now")
+    projected_average: float = Field(..., description="Projected average score of the simulated nodes")
+    fleet_current_average: float = Field(..., description="Average score of the whole audited fleet now")
+    fleet_projected_average: float = Field(..., description="Projected fleet average (other nodes unchanged)")
+    critical_before: int = Field(..., description="Critical nodes (< 60%) among the simulated nodes now")
+    critical_after: int = Field(..., description="Projected critical nodes among the simulated nodes")
+    leaving_critical: list[str] = Field(default_factory=list, description="Nodes that would leave the critical list")
+    entering_critical: list[str] = Field(default_factory=list, description="Nodes that would enter the critical list")
+    improved_nodes: int = Field(0, description="Nodes whose score would increase")
+    rechecked_checks: list[str] = Field(default_factory=list, description="Checks re-evaluated against overrides")
+    fetched_nodes: int = Field(0, description="Nodes without a cached config snapshot (fetched from Proxmox)")
+    nodes: list[SimulatedNode] = Field(default_factory=list, description="Per-node projections (include_nodes)")
+
+
+class ControlStatus(BaseModel):
+    """Fleet (or customer) status of one framework control across its mapped checks."""
+
+    framework: str = Field(..., description="Framework key (iso_27001, bsi_grundschutz, nis2)")
+    control_id: str = Field(..., description="Control reference (e.g. A.8.13)")
+    check_ids: list[str] = Field(..., description="Checks mapped to this control")
+    assessed_nodes: int = Field(..., description="Nodes with a result for at least one mapped check")
+    passed_nodes: int = Field(..., description="Nodes on which every mapped check passed")
+    failed_nodes: int = Field(..., description="Nodes on which a mapped check failed or errored")
+    error_nodes: int = Field(0, description="Failed nodes whose only non-passing mapped checks errored")
+    pass_rate: float = Field(..., description="passed_nodes / assessed_nodes in percent")
+    failing_nodes: list[str] = Field(default_factory=list, description="Failing node IDs (detail views)")
+
+
+class ControlCoverageList(BaseModel):
+    """Per-control pass rates from the incrementally maintained control matrix."""
+
+    version: int = Field(..., description="Fleet version the coverage reflects")
+    customer_id: Optional[str] = Field(None, description="Customer filter, if any")
+    controls: list[ControlStatus] = Field(default_factory=list, description="Controls by framework and ID")
+
+
+class ControlMatrixRow(BaseModel):
+    """Control statuses of one node, aligned with ControlMatrix.controls."""
+
+    node_id: str = Field(..., description="Node identifier")
+    customer_id: str = Field(..., description="Customer the node belongs to")
+    statuses: list[Optional[str]] = Field(..., description="PASS/FAIL/ERROR per control (null: not assessed)")
+
+
+class ControlMatrix(BaseModel):
+    """Node x control status matrix."""
+
+    version: int = Field(..., description="Fleet version the matrix reflects")
+    controls: list[str] = Field(..., description="Column keys as framework:control_id")
+    nodes: list[ControlMatrixRow] = Field(default_factory=list, description="One row per node, by node_id")
 
 
 class HistoricalDataPoint(BaseModel):
@@ -63,3 +215,65 @@ class HistoricalDataPoint(BaseModel):
 
     date: str = Field(..., description="Date string (e.g., YYYY-MM-DD)")
     compliance_score: int = Field(..., description="Compliance score on that date")
+
+
+class CheckCatalogEntry(BaseModel):
+    """Static metadata of a registered check (referenced by check_id from compact results)."""
+
+    check_id: str = Field(..., description="Unique check identifier")
+    check_name: str = Field(..., description="Human-readable check name")
+    category: str = Field(..., description="Check category (e.g., ACCESS_CONTROL)")
+    severity: str = Field(..., description="Check severity (CRITICAL, HIGH, MEDIUM)")
+    compliance_mapping: ComplianceMapping = Field(..., description="ISO/BSI/NIS2 references")
+    remediation: Optional[RemediationTemplate] = Field(None, description="Remediation template applied on FAIL")
+    run_after: list[str] = Field(
+        default_factory=list, description="Checks whose remediation runs first when remediated together"
+    )
+    config_keys: list[str] = Field(default_factory=list, description="Node config keys the check evaluates")
+
+
+class CheckCatalog(BaseModel):
+    """Versioned catalog of all registered checks."""
+
+    version: str = Field(..., description="Content hash of the catalog; changes whenever any check changes")
+    checks: list[CheckCatalogEntry] = Field(..., description="Registered checks in execution order")
+
+
+class CompactCheckResult(BaseModel):
+    """Check result without static metadata; resolve check_id against the check catalog."""
+
+    check_id: str = Field(..., description="Check identifier (see /checks catalog)")
+    status: str = Field(..., description="PASS, FAIL, or ERROR")
+    details: str = Field(..., description="Additional details or message")
+
+
+class CompactNodeAuditResult(BaseModel):
+    """Node audit result in compact form (view=compact)."""
+
+    node_id: str = Field(..., description="Node identifier")
+    node_name: str = Field(..., description="Human-readable node name")
+    compliance_score: int = Field(..., description="Compliance score 0-100")
+    total_checks: int = Field(..., description="Total number of checks executed")
+    passed_checks: int = Field(..., description="Number of passed checks")
+    failed_checks: int = Field(..., description="Number of checks not passed (including errors)")
+    error_checks: int = Field(0, description="Number of checks that could not be evaluated (ERROR)")
+    check_results: list[CompactCheckResult] = Field(..., description="Individual check results (by check_id)")
+    timestamp: datetime = Field(..., description="Audit execution time")
+    stale: bool = Field(False, description="True if this is the last known good result, served while refreshing")
+    age_seconds: Optional[float] = Field(None, description="Age of a stale result in seconds")
+    last_error: Optional[str] = Field(None, description="Most recent refresh error for this node, if any")
+    catalog_version: str = Field(..., description="Check catalog version the check_ids refer to")
+
+
+class CompactFleetSummary(BaseModel):
+    """Fleet summary in compact form (view=compact)."""
+
+    total_nodes: int = Field(..., description="Total number of nodes audited")
+    average_compliance: float = Field(..., description="Average compliance score across fleet")
+    critical_nodes: list[str] = Field(..., description="Node IDs with compliance_score < 60%")
+    nodes: list[CompactNodeAuditResult] = Field(..., description="Per-node compact audit results")
+    version: int = Field(0, description="Fleet version after this audit (baseline for /audit/nodes/changes)")
+    stale: bool = Field(False, description="True if any node result (or the node list) is a last known good copy")
+    stale_nodes: list[str] = Field(default_factory=list, description="Node IDs whose results are stale")
+    last_error: Optional[str] = Field(None, description="Most recent refresh error across the fleet, if any")
+    catalog_version: str = Field(..., description="Check catalog version the check_ids refer to")
@@ -1,14 +1,57 @@
 """Audit orchestration: fleet summary, per-node audit, and historical trend data."""
 
-from datetime import datetime
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Iterator, Optional
 
 from app.core.audit_engine import AuditEngine
+from app.core.singleflight import SingleFlight
+from app.core.timing import timed_phase
 from app.models.check import (
+    CheckCatalog,
+    CheckResult,
+    CheckVerification,
+    ControlCoverageList,
+    ControlMatrix,
+    ControlStatus,
+    CustomerRollup,
+    CustomerRollupList,
+    FleetChanges,
     FleetSummary,
     HistoricalDataPoint,
     NodeAuditResult,
+    SimulationRequest,
+    SimulationResult,
+)
+from app.services.change_tracker import FleetChangeLog
+from app.services.control_coverage import FRAMEWORKS, ControlCoverage
+from app.services.customer_rollups import CustomerRollups, customer_resolver
+from app.services.event_bus import (
+    EVENT_CRITICAL_THRESHOLD_CROSSED,
+    EVENT_NODE_AUDIT_COMPLETED,
+    EVENT_SCORE_CHANGED,
+    EventBus,
+)
+from app.services.history_export import (
+    LEVELS,
+    MEDIA_TYPES,
+    AuditHistoryLog,
+    check_export_format,
+    encode_rows,
+    iter_check_rows,
+    iter_node_rows,
 )
 from app.services.proxmox_base import ProxmoxServiceProtocol
+from app.services.simulation import ConfigSnapshots, simulate
+from app.services.state_backend import StateBackend
+
+logger = logging.getLogger(__name__)
+
+KEY_NODE_IDS = "audit:node_ids"
 
 
 class AuditService:
@@ -23,27 +66,101 @@ class AuditService:
         self,
         proxmox_service: ProxmoxServiceProtocol,
         audit_engine: AuditEngine,
+        event_bus: EventBus | None = None,
+        state_backend: StateBackend | None = None,
+        cache_ttl_seconds: float = 0.0,
+        stale_max_age_seconds: float = 300.0,
+        customer_map: dict[str, str] | None = None,
+        history_max_entries: int = 100000,
+        verify_attempts: int = 5,
+        verify_backoff_seconds: float = 1.0,
+        verify_backoff_max_seconds: float = 15.0,
+        sleep: Callable[[float], None] = time.sleep,
+        failure_backoff_seconds: float = 5.0,
+        failure_backoff_max_seconds: float = 300.0,
     ) -> None:
         """
         Args:
             proxmox_service: Provider of node configs and history (mock, real, or hybrid).
             audit_engine: Registry-based engine that runs compliance checks.
+            event_bus: Optional bus for audit completion, score change and critical-threshold events.
+            state_backend: Store for latest results and the change log; a shared backend (SQLite/Redis)
+                lets all uvicorn workers reuse each other's audits. Defaults to process memory.
+            cache_ttl_seconds: Reuse a stored node result (and the fleet node list) younger than this
+                instead of re-auditing; 0 disables caching.
+            stale_max_age_seconds: With caching on, results up to this much older than the TTL are
+                served immediately (flagged stale) while a background refresh runs.
+            customer_map: Optional node_id -> customer_id for per-customer rollups; unmapped
+                "<customer>-node" IDs use the prefix, others are "unassigned".
+            history_max_entries: Completed node audits kept in the audit history log (bulk export).
+            verify_attempts: Default attempts of verify_check before reporting the check as not verified.
+            verify_backoff_seconds: First delay between verification attempts; doubles per attempt.
+            verify_backoff_max_seconds: Upper bound of the delay between verification attempts.
+            sleep: Sleep function used for verification backoff (injectable for tests).
+            failure_backoff_seconds: After a failed audit of a node with a known good result, retry it
+                in the background no sooner than this; doubles per consecutive failure.
+            failure_backoff_max_seconds: Upper bound of the per-node retry backoff.
+
+        If a refresh fails (Proxmox unreachable), the last known good result is served with
+        stale=True, age_seconds and last_error instead of failing the request.
         """
         self._proxmox = proxmox_service
         self._engine = audit_engine
+        self._state = state_backend
+        self._changes = FleetChangeLog(state_backend)
+        self._resolve_customer = customer_resolver(customer_map)
+        self._customers = CustomerRollups(
+            self._changes, self._resolve_customer, critical_threshold=self.CRITICAL_THRESHOLD
+        )
+        self._controls = ControlCoverage(self._changes, audit_engine.get_all_checks(), self._resolve_customer)
+        self._history = AuditHistoryLog(state_backend, max_entries=history_max_entries)
+        self._events = event_bus
+        self._cache_ttl = cache_ttl_seconds
+        self._stale_max_age = stale_max_age_seconds
+        self._flights = SingleFlight()
+        self._errors: dict[str, str] = {}
+        self._failures: dict[str, tuple[int, float]] = {}  # node_id -> (consecutive failures, retry at)
+        self._failure_backoff = failure_backoff_seconds
+        self._failure_backoff_max = failure_backoff_max_seconds
+        self._refresh_lock = threading.Lock()
+        self._refreshing: set[str] = set()
+        self._verify_attempts = verify_attempts
+        self._verify_backoff = verify_backoff_seconds
+        self._verify_backoff_max = verify_backoff_max_seconds
+        self._sleep = sleep
+        self._verify_lock = threading.Lock()
+        self._configs = ConfigSnapshots()
 
     def get_fleet_summary(self) -> FleetSummary:
         """
         Run audits for all nodes and return aggregated fleet summary.
 
+        Concurrent calls share one fleet audit (single-flight); node audits within it are shared
+        with concurrent get_node_audit callers for the same node.
+
         Returns:
             FleetSummary with total_nodes, average_compliance, critical_nodes, and per-node results.
         """
-        node_ids = self._proxmox.get_all_nodes()
+        return self._flights.do(("fleet",), self._compute_fleet_summary)
+
+    def _compute_fleet_summary(self) -> FleetSummary:
+        fleet_error = None
+        try:
+            node_ids = self._get_node_ids()
+        except Exception as e:
+            node_ids = self._changes.members()
+            if not node_ids:
+                raise
+            fleet_error = str(e)
+            logger.warning("Node list unavailable; serving last known fleet: %s", e)
+        prefetch = getattr(self._proxmox, "prefetch_node_configs", None)
+        if prefetch is not None and fleet_error is None:
+            prefetch([n for n in node_ids if self._needs_audit(n)])
         node_results: list[NodeAuditResult] = []
         for node_id in node_ids:
-            result = self._get_node_audit_internal(node_id)
+            result = self._audit_node(node_id)
             node_results.append(result)
+        self._changes.sync_membership(node_ids)
 
         total = len(node_results)
         if total == 0:
@@ -60,11 +177,16 @@ class AuditService:
             average_compliance=round(average_compliance, 2),
             critical_nodes=critical_nodes_list,
             nodes=node_results,
+            version=self._changes.version,
+            stale=fleet_error is not None or any(n.stale for n in node_results),
+            stale_nodes=[n.node_id for n in node_results if n.stale],
+            last_error=fleet_error or next((n.last_error for n in node_results if n.last_error), None),
         )
 
     def get_node_audit(self, node_id: str) -> NodeAuditResult:
         """
         Run all compliance checks for a single node and return the audit result.
+        Concurrent calls for the same node share one Proxmox fetch and check run.
 
         Args:
             node_id: Unique node identifier.
@@ -75,29 +197,477 @@ class AuditService:
         Raises:
             ValueError: If node_id is not found (caller should map to 404).
         """
-        return self._get_node_audit_internal(node_id)
+        return self._audit_node(node_id)
+
+    def _audit_node(self, node_id: str) -> NodeAuditResult:
+        """
+        Serve node_id from cache when fresh, stale-while-revalidate when slightly expired, otherwise
+        audit it (coalesced with concurrent callers). A node whose last audit failed is served from
+        its last known good result at once (no synchronous Proxmox fetch) and retried only in the
+        background, with per-node exponential backoff. ValueError (unknown node) is always raised.
+        """
+        cached = self._changes.latest(node_id)
+        if cached is not None:
+            age = self._age_seconds(cached)
+            if self._cache_ttl > 0 and age < self._cache_ttl:
+                return cached
+            if node_id in self._failures:
+                if self._retry_due(node_id):
+                    self._refresh_in_background(node_id)
+                return self._as_stale(cached, self._errors.get(node_id))
+            if self._cache_ttl > 0 and age < self._cache_ttl + self._stale_max_age:
+                self._refresh_in_background(node_id)
+                return self._as_stale(cached, self._errors.get(node_id))
+        try:
+            return self._audit_node_now(node_id)
+        except ValueError:
+            raise
+        except Exception as e:
+            if cached is None:
+                raise
+            logger.warning("Audit of %s failed; serving last known good result: %s", node_id, e)
+            return self._as_stale(cached, str(e))
+
+    def _retry_due(self, node_id: str) -> bool:
+        """False while node_id is within the backoff after its last failed audit."""
+        failure = self._failures.get(node_id)
+        return failure is None or time.monotonic() >= failure[1]
+
+    def _record_failure(self, node_id: str, error: Exception) -> None:
+        count = self._failures.get(node_id, (0, 0.0))[0] + 1
+        delay = min(self._failure_backoff * 2 ** (count - 1), self._failure_backoff_max)
+        self._errors[node_id] = str(error)
+        self._failures[node_id] = (count, time.monotonic() + delay)
+
+    def _needs_audit(self, node_id: str) -> bool:
+        """True unless a cached result for node_id is still within cache_ttl_seconds."""
+        if self._cache_ttl <= 0:
+            return True
+        cached = self._changes.latest(node_id)
+        return cached is None or self._age_seconds(cached) >= self._cache_ttl
+
+    def _audit_node_now(self, node_id: str) -> NodeAuditResult:
+        """Run (or join the in-flight) audit of node_id and track its last error."""
+        try:
+            result = self._flights.do(("node", node_id), lambda: self._get_node_audit_internal(node_id))
+        except ValueError:
+            raise
+        except Exception as e:
+            self._record_failure(node_id, e)
+            raise
+        self._errors.pop(node_id, None)
+        self._failures.pop(node_id, None)
+        return result
+
+    def _refresh_in_background(self, node_id: str) -> None:
+        """Start at most one background re-audit per node."""
+        with self._refresh_lock:
+            if node_id in self._refreshing:
+                return
+            self._refreshing.add(node_id)
+
+        def refresh() -> None:
+            try:
+                self._audit_node_now(node_id)
+            except Exception as e:
+                logger.warning("Background refresh of %s failed: %s", node_id, e)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(node_id)
+
+        threading.Thread(target=refresh, name=f"audit-refresh-{node_id}", daemon=True).start()
+
+    @staticmethod
+    def _age_seconds(result: NodeAuditResult) -> float:
+        return (datetime.utcnow() - result.timestamp).total_seconds()
+
+    def _as_stale(self, result: NodeAuditResult, error: str | None) -> NodeAuditResult:
+        return result.model_copy(update={
+            "stale": True,
+            "age_seconds": round(self._age_seconds(result), 3),
+            "last_error": error,
+        })
+
+    def _get_node_ids(self) -> list[str]:
+        """Fleet node list; cached in the state backend for cache_ttl_seconds when caching is on."""
+        if self._cache_ttl <= 0 or self._state is None:
+            return self._proxmox.get_all_nodes()
+        raw = self._state.get(KEY_NODE_IDS)
+        if raw is not None:
+            return json.loads(raw)
+        node_ids = list(self._proxmox.get_all_nodes())
+        self._state.set(KEY_NODE_IDS, json.dumps(node_ids).encode("utf-8"), ttl_seconds=self._cache_ttl)
+        return node_ids
 
     def _get_node_audit_internal(self, node_id: str) -> NodeAuditResult:
         """Execute checks for one node; raises ValueError if node not found."""
-        config = self._proxmox.get_node_config(node_id)
+        with timed_phase("fetch"):
+            config = self._proxmox.get_node_config(node_id)
+        self._configs.put(node_id, config)
         check_results = self._engine.execute_checks(config)
+        with timed_phase("models"):
+            result = self._build_result(node_id, check_results)
+        self._record_result(result)
+        return result
+
+    @staticmethod
+    def _build_result(node_id: str, check_results: list[CheckResult]) -> NodeAuditResult:
+        """Node result with counts and score computed from check_results, timestamped now."""
         total_checks = len(check_results)
         passed_checks = sum(1 for r in check_results if r.status == "PASS")
-        failed_checks = total_checks - passed_checks
         compliance_score = int((passed_checks / total_checks) * 100) if total_checks else 0
-        node_name = node_id.replace("-", " ").title()
-
         return NodeAuditResult(
             node_id=node_id,
-            node_name=node_name,
+            node_name=node_id.replace("-", " ").title(),
             compliance_score=compliance_score,
             total_checks=total_checks,
             passed_checks=passed_checks,
-            failed_checks=failed_checks,
+            failed_checks=total_checks - passed_checks,
+            error_checks=sum(1 for r in check_results if r.status == "ERROR"),
             check_results=check_results,
             timestamp=datetime.utcnow(),
         )
 
+    def _record_result(self, result: NodeAuditResult) -> None:
+        """Store a new node result: change log (cache), customer rollups, control matrix, history log and events."""
+        previous = self._changes.latest(result.node_id)
+        version = self._changes.record(result)
+        self._customers.on_recorded(result, version)
+        self._controls.on_recorded(result, version)
+        self._history.record(result)
+        self._publish_audit_events(result, previous)
+
+    def verify_check(
+        self,
+        node_id: str,
+        check_id: str,
+        attempts: Optional[int] = None,
+        backoff_seconds: Optional[float] = None,
+    ) -> CheckVerification:
+        """
+        Re-evaluate one check after remediation without a full audit.
+
+        Only the config keys the check reads (CheckDefinition.config_keys) are re-fetched, if the
+        provider supports get_node_config_keys, bypassing the provider's caches (force=True) so the
+        fix is actually observed. Until the check passes it is retried up to `attempts`
+        times with exponential backoff (changes may take a while to propagate). The final result
+        replaces that check in the cached node result (score and counts recomputed; the other checks
+        keep their values from the last audit) and is recorded like an audit: change log, rollups,
+        history and events.
+
+        Raises:
+            ValueError: If the node or check is not found (caller should map to 404).
+        """
+        check_def = self._engine.get_check(check_id)
+        if check_def is None:
+            raise ValueError(f"Check not found: {check_id}")
+        attempts = max(1, attempts if attempts is not None else self._verify_attempts)
+        delay = backoff_seconds if backoff_seconds is not None else self._verify_backoff
+        keys = list(check_def.config_keys)
+        fetch_keys = getattr(self._proxmox, "get_node_config_keys", None)
+        if fetch_keys is None:
+            keys = []
+
+        start = time.perf_counter()
+        for attempt in range(1, attempts + 1):
+            with timed_phase("fetch"):
+                config = fetch_keys(node_id, keys, force=True) if keys else self._proxmox.get_node_config(node_id)
+            (self._configs.update if keys else self._configs.put)(node_id, config)
+            check_result = self._engine.execute_check(check_id, config)
+            if check_result.status == "PASS" or attempt == attempts:
+                break
+            self._sleep(min(delay, self._verify_backoff_max))
+            delay *= 2
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        def apply() -> NodeAuditResult:
+            cached = self._changes.latest(node_id)
+            if cached is None:
+                return self._audit_node_now(node_id)
+            results = [check_result if r.check_id == check_id else r for r in cached.check_results]
+            if all(r.check_id != check_id for r in results):
+                results.append(check_result)
+            updated = self._build_result(node_id, results)
+            self._record_result(updated)
+            return updated
+
+        with self._verify_lock:  # read-modify-write of the cached result
+            updated = apply()
+        logger.info(
+            "Verified %s on %s: %s after %d attempt(s) in %.0f ms", check_id, node_id, check_result.status,
+            attempt, latency_ms,
+        )
+        return CheckVerification(
+            node_id=node_id,
+            check_id=check_id,
+            status=check_result.status,
+            verified=check_result.status == "PASS",
+            attempts=attempt,
+            latency_ms=round(latency_ms, 3),
+            fetched_keys=keys,
+            compliance_score=updated.compliance_score,
+            result=check_result,
+        )
+
+    def _publish_audit_events(self, result: NodeAuditResult, previous: NodeAuditResult | None) -> None:
+        """Publish completion, score change and critical-threshold crossing events for a node result."""
+        if self._events is None:
+            return
+        score = result.compliance_score
+        self._events.publish(EVENT_NODE_AUDIT_COMPLETED, {
+            "node_id": result.node_id,
+            "compliance_score": score,
+            "passed_checks": result.passed_checks,
+            "failed_checks": result.failed_checks,
+            "fleet_version": self._changes.version,
+        })
+        if previous is None or previous.compliance_score == score:
+            return
+        self._events.publish(EVENT_SCORE_CHANGED, {
+            "node_id": result.node_id,
+            "previous_score": previous.compliance_score,
+            "compliance_score": score,
+        })
+        was_critical = previous.compliance_score < self.CRITICAL_THRESHOLD
+        is_critical = score < self.CRITICAL_THRESHOLD
+        if was_critical != is_critical:
+            self._events.publish(EVENT_CRITICAL_THRESHOLD_CROSSED, {
+                "node_id": result.node_id,
+                "direction": "entered" if is_critical else "recovered",
+                "compliance_score": score,
+                "threshold": self.CRITICAL_THRESHOLD,
+            })
+
+    def get_fleet_changes(self, since: int) -> FleetChanges:
+        """
+        Re-audit the fleet and return only nodes whose results changed after fleet version `since`.
+
+        Args:
+            since: Fleet version the client last saw (FleetSummary.version or FleetChanges.version).
+
+        Returns:
+            FleetChanges with the current version and one entry per added/updated/removed node.
+        """
+        self.get_fleet_summary()
+        return self._changes.changes_since(since)
+
+    def get_customer_rollups(self) -> CustomerRollupList:
+        """
+        Return per-customer aggregates from the incrementally maintained rollups.
+        Only runs a fleet audit if no node has been audited yet.
+        """
+        if self._changes.version == 0:
+            self.get_fleet_summary()
+        return self._customers.all()
+
+    def get_customer_rollup(self, customer_id: str) -> CustomerRollup:
+        """
+        Return the aggregates of one customer.
+
+        Raises:
+            ValueError: If no audited node belongs to customer_id (caller should map to 404).
+        """
+        if self._changes.version == 0:
+            self.get_fleet_summary()
+        rollup = self._customers.get(customer_id)
+        if rollup is None:
+            raise ValueError(f"Customer not found: {customer_id}")
+        return rollup
+
+    def _check_control_scope(self, framework: Optional[str], customer_id: Optional[str]) -> None:
+        if framework is not None and framework not in FRAMEWORKS:
+            raise ValueError(f"Framework not found: {framework}")
+        if customer_id is not None:
+            self.get_customer_rollup(customer_id)
+        elif self._changes.version == 0:
+            self.get_fleet_summary()
+
+    def get_control_coverage(
+        self, framework: Optional[str] = None, customer_id: Optional[str] = None, include_nodes: bool = False
+    ) -> ControlCoverageList:
+        """
+        Per-control pass rates (ISO 27001, BSI, NIS2) from the incrementally maintained control matrix,
+        fleet-wide or for one customer. Only runs a fleet audit if no node has been audited yet.
+
+        Raises:
+            ValueError: If the framework or customer is not found (caller should map to 404).
+        """
+        self._check_control_scope(framework, customer_id)
+        return self._controls.controls(framework, customer_id, include_nodes)
+
+    def get_control_status(
+        self, framework: str, control_id: str, customer_id: Optional[str] = None
+    ) -> ControlStatus:
+        """
+        Status of one control with its failing nodes.
+
+        Raises:
+            ValueError: If the framework, control or customer is not found (caller should map to 404).
+        """
+        self._check_control_scope(framework, customer_id)
+        status = self._controls.control(framework, control_id, customer_id)
+        if status is None:
+            raise ValueError(f"Control not found: {framework}:{control_id}")
+        return status
+
+    def get_control_matrix(self, framework: Optional[str] = None, customer_id: Optional[str] = None) -> ControlMatrix:
+        """
+        Node x control status matrix (optionally one framework / one customer).
+
+        Raises:
+            ValueError: If the framework or customer is not found (caller should map to 404).
+        """
+        self._check_control_scope(framework, customer_id)
+        return self._controls.matrix(framework, customer_id)
+
+    def simulate(self, request: SimulationRequest) -> SimulationResult:
+        """
+        Project scores if `overrides` were applied to the config of a node set (node_ids, customer_id
+        or the whole fleet) and `fix_checks` passed. Works on the cached results and the config
+        snapshot of each node's last audit; only checks reading an overridden key are re-evaluated.
+        Nothing is stored.
+
+        Raises:
+            ValueError: If a node, customer or fix check is not found (caller should map to 404).
+        """
+        for check_id in request.fix_checks:
+            if self._engine.get_check(check_id) is None:
+                raise ValueError(f"Check not found: {check_id}")
+        if self._changes.version == 0:
+            self.get_fleet_summary()
+        fleet = {n: r for n in self._changes.members() if (r := self._changes.latest(n)) is not None}
+        if request.node_ids:
+            for node_id in request.node_ids:
+                if node_id not in fleet:
+                    fleet[node_id] = self._audit_node(node_id)
+            selected = [fleet[n] for n in dict.fromkeys(request.node_ids)]
+        elif request.customer_id:
+            self.get_customer_rollup(request.customer_id)
+            selected = [r for n, r in fleet.items() if self._resolve_customer(n) == request.customer_id]
+        else:
+            selected = list(fleet.values())
+
+        recheck = {}
+        if request.overrides:
+            for check_id in self._engine.checks_reading(request.overrides):
+                recheck[check_id] = tuple(self._engine.get_check(check_id).config_keys)
+        fetched = 0
+
+        def with_configs() -> Iterator[tuple[NodeAuditResult, dict]]:
+            nonlocal fetched
+            for result in selected:
+                config = self._configs.get(result.node_id)
+                if config is None and recheck:
+                    config = self._proxmox.get_node_config(result.node_id)  # audited by another worker
+                    self._configs.put(result.node_id, config)
+                    fetched += 1
+                yield result, config or {}
+
+        with timed_phase("simulate"):
+            projection = simulate(
+                with_configs(),
+                self._engine.evaluate_check,
+                recheck,
+                request.overrides,
+                set(request.fix_checks),
+                self.CRITICAL_THRESHOLD,
+                fleet_score_sum=sum(r.compliance_score for r in fleet.values()),
+                fleet_count=len(fleet),
+                include_nodes=request.include_nodes,
+            )
+        projection.fetched_nodes = fetched
+        return projection
+
+    def _customer_node_ids(self, customer_id: str) -> list[str]:
+        return sorted(n for n in self._changes.members() if self._resolve_customer(n) == customer_id)
+
+    def customer_fingerprint(self, customer_id: str) -> str:
+        """
+        Digest of the recorded results of customer_id's nodes (node_ids plus each node's result
+        fingerprint): changes exactly when the customer's report content changes, and, unlike the
+        fleet version, means the same thing across restarts.
+        """
+        digest = hashlib.sha1()
+        for node_id in self._customer_node_ids(customer_id):
+            digest.update(f"{node_id}:{self._changes.fingerprint(node_id)}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def iter_customer_nodes(self, customer_id: str) -> Iterator[NodeAuditResult]:
+        """
+        Lazily yield the recorded audit result of each node of customer_id, by node_id, so a report
+        over many nodes holds one at a time. These are the snapshots the customer rollup and control
+        matrix are built from (no re-audit, no history entries); only nodes without a recorded
+        result are audited.
+        """
+        for node_id in self._customer_node_ids(customer_id):
+            result = self._changes.latest(node_id)
+            if result is None:
+                try:
+                    result = self._audit_node(node_id)
+                except ValueError:
+                    continue  # node left the fleet since the rollup was built
+            yield result
+
+    def get_check_catalog(self) -> CheckCatalog:
+        """Return the versioned catalog of checks run by this service's engine."""
+        return self._engine.get_catalog()
+
+    def export_history(
+        self,
+        fmt: str = "csv",
+        level: str = "node",
+        node_ids: Optional[list[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> tuple[Iterator[bytes], str]:
+        """
+        Stream audit history for a node set and time range as CSV, NDJSON, Parquet or Arrow IPC.
+
+        Rows are generated lazily from the audit history log (and, for level=node, the provider's
+        daily trend) and encoded in bounded batches, so memory stays constant for any row count.
+
+        Args:
+            fmt: csv | ndjson | parquet | arrow (columnar formats need pyarrow).
+            level: node (one row per audit / history point) or check (one row per check outcome).
+            node_ids: Nodes to include; None exports every node.
+            start: Earliest timestamp (inclusive); naive datetimes are UTC.
+            end: Latest timestamp (inclusive).
+
+        Returns:
+            (iterator of encoded chunks, media type).
+
+        Raises:
+            ValueError: For an unknown level/format, or parquet/arrow without pyarrow.
+        """
+        if level not in LEVELS:
+            raise ValueError(f"Unsupported export level: {level} (choose from {', '.join(LEVELS)})")
+        check_export_format(fmt)
+        wanted = set(node_ids) if node_ids else None
+        start_ts = _epoch_or_none(start)
+        end_ts = _epoch_or_none(end)
+        if level == "check":
+            meta = {c.check_id: (c.category, c.severity) for c in self._engine.get_catalog().checks}
+            rows = iter_check_rows(self._history, meta, self._resolve_customer, wanted, start_ts, end_ts)
+        else:
+            rows = iter_node_rows(
+                self._history, self._provider_history(node_ids), self._resolve_customer, wanted, start_ts, end_ts
+            )
+        return encode_rows(rows, level, fmt), MEDIA_TYPES[fmt]
+
+    def _provider_history(self, node_ids: Optional[list[str]]) -> Iterator[tuple[str, list[dict]]]:
+        """Lazily yield (node_id, provider trend points); nodes without history are skipped."""
+        if not node_ids:
+            try:
+                node_ids = self._get_node_ids()
+            except Exception as e:
+                logger.warning("Node list unavailable for export; using last known fleet: %s", e)
+                node_ids = self._changes.members()
+        for node_id in node_ids:
+            try:
+                yield node_id, self._proxmox.get_node_history(node_id)
+            except Exception as e:
+                logger.warning("History of %s unavailable for export: %s", node_id, e)
+
     def get_node_history(self, node_id: str) -> list[HistoricalDataPoint]:
         """
         Return historical trend data for a node (e.g. 30-day compliance trajectory).
@@ -116,3 +686,9 @@ class AuditService:
             HistoricalDataPoint(date=item["date"], compliance_score=item["compliance_score"])
             for item in raw
         ]
+
+
+def _epoch_or_none(value: Optional[datetime]) -> Optional[float]:
+    if value is None:
+        return None
+    return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp()
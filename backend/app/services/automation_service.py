@@ -1,30 +1,125 @@
 """Remediation execution service: dry-run and execute via Proxmox service."""
 
+import inspect
+import json
 import logging
 import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
+from typing import Any, Callable, Iterable, Optional
 
-from app.models.automation import RemediationExecution, RemediationResponse
+from app.models.automation import (
+    RemediationExecution,
+    RemediationPlanResponse,
+    RemediationPlaybook,
+    RemediationResponse,
+)
+from app.core.timing import timed_phase
+from app.models.check import CheckVerification, NodeAuditResult
+from app.services.event_bus import EVENT_REMEDIATION_OUTPUT, EVENT_REMEDIATION_STATUS, EventBus
+from app.services.playbook_generator import dump_tasks, generate_playbook, handler_task, host_var_resolver
 from app.services.proxmox_base import ProxmoxServiceProtocol
+from app.services.remediation_output import OutputBuffer, OutputStore
+from app.services.remediation_plan import RemediationStep, plan_stages, run_dag
+from app.services.state_backend import MemoryStateBackend, StateBackend
 
 logger = logging.getLogger(__name__)
 
+KEY_HISTORY = "automation:history"
+
+
+def _log_background_failure(future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Background remediation run failed", exc_info=future.exception())
+
 
 class AutomationService:
     """
     Executes remediation (Ansible snippets) via ProxmoxServiceProtocol.
     Supports DRY_RUN (validate/log only) and EXECUTE modes.
+
+    Output lines of every run (single execution or plan) go to a bounded per-run ring buffer and
+    are published as remediation_output events while the run is in progress; start_* variants
+    return immediately and run in a background worker. The final output is persisted to the history.
     """
 
     def __init__(
         self,
         proxmox_service: ProxmoxServiceProtocol,
         automation_enabled: bool = False,
+        event_bus: EventBus | None = None,
+        state_backend: StateBackend | None = None,
+        history_max_entries: int = 10000,
+        host_vars: Callable[[str], dict[str, Any]] | None = None,
+        max_parallel: int = 4,
+        output_store: OutputStore | None = None,
+        background_workers: int = 4,
+        verifier: Callable[[str, str], CheckVerification] | None = None,
     ) -> None:
         self._proxmox = proxmox_service
         self._automation_enabled = automation_enabled
-        self._history: list[RemediationExecution] = []
+        # History lives in the state backend so every worker reports the same executions.
+        self._state = state_backend or MemoryStateBackend()
+        self._history_max = history_max_entries
+        self._events = event_bus
+        self._host_vars = host_vars or host_var_resolver()
+        self._max_parallel = max_parallel
+        self._outputs = output_store or OutputStore()
+        self._verifier = verifier  # (node_id, check_id) -> CheckVerification, e.g. AuditService.verify_check
+        self._background = ThreadPoolExecutor(max_workers=max(1, background_workers), thread_name_prefix="remediation-run")
+
+    def _publish_status(
+        self,
+        execution_id: str,
+        node_id: str,
+        check_id: str,
+        status: str,
+        dry_run: bool,
+        error: Optional[str] = None,
+    ) -> None:
+        """Publish a remediation status transition (running -> success | skipped | error)."""
+        if self._events is not None:
+            self._events.publish(EVENT_REMEDIATION_STATUS, {
+                "execution_id": execution_id,
+                "node_id": node_id,
+                "check_id": check_id,
+                "status": status,
+                "dry_run": dry_run,
+                "error": error,
+            })
+
+    def _publish_output(self, entry: dict) -> None:
+        if self._events is not None:
+            self._events.publish(EVENT_REMEDIATION_OUTPUT, entry)
+
+    def get_output(self, run_id: str) -> OutputBuffer:
+        """
+        Output buffer of a running or recent execution/plan.
+
+        Raises:
+            ValueError: If run_id is unknown (or expired from the buffer store).
+        """
+        buffer = self._outputs.get(run_id)
+        if buffer is None:
+            raise ValueError(f"Remediation run not found: {run_id}")
+        return buffer
+
+    def _provider_execute(self, node_id: str, ansible_snippet: str, emit: Callable[[str, str], None]) -> dict | None:
+        """Call the provider, streaming its output through emit when it supports on_output."""
+        execute = self._proxmox.execute_remediation
+        if "on_output" in inspect.signature(execute).parameters:
+            return execute(node_id, ansible_snippet, on_output=emit)
+        return execute(node_id, ansible_snippet)
+
+    def generate_playbook(
+        self, results: Iterable[NodeAuditResult], check_ids: Optional[list[str]] = None
+    ) -> RemediationPlaybook:
+        """
+        Build one consolidated playbook plus inventory for the failed checks of the given node results,
+        with template variables supplied per host from the configured host variables.
+        """
+        return generate_playbook(results, self._host_vars, set(check_ids) if check_ids else None)
 
     def execute_remediation(
         self,
@@ -32,6 +127,9 @@ class AutomationService:
         check_id: str,
         ansible_snippet: str,
         dry_run: bool = True,
+        execution_id: Optional[str] = None,
+        output_buffer: Optional[OutputBuffer] = None,
+        verify: bool = True,
     ) -> RemediationResponse:
         """
         Execute or dry-run remediation for a node.
@@ -41,12 +139,28 @@ class AutomationService:
             check_id: Check ID for audit trail.
             ansible_snippet: Ansible playbook/task snippet.
             dry_run: If True, validate and log only; do not execute.
+            execution_id: Pre-allocated execution ID (start_remediation).
+            output_buffer: Run buffer to stream into (a plan's); default: one for this execution.
+            verify: Re-check the remediated check after a successful execution (see verify()).
 
         Returns:
             RemediationResponse with execution_id, status, output/error.
         """
-        execution_id = f"rem-{uuid.uuid4().hex[:12]}"
+        execution_id = execution_id or f"rem-{uuid.uuid4().hex[:12]}"
+        buffer = output_buffer or self._outputs.get(execution_id) or self._outputs.create(execution_id)
+        lines: deque[str] = deque(maxlen=self._outputs.max_lines)  # persisted output (tail)
+        total = 0
+
+        def emit(stream: str, line: str, persist: bool = True) -> None:
+            nonlocal total
+            if persist and stream in ("stdout", "stderr"):
+                total += 1
+                lines.append(line if stream == "stdout" else f"[{stream}] {line}")
+            self._publish_output(buffer.append(execution_id, check_id, stream, line))
+
         timestamp = datetime.utcnow()
+        self._publish_status(execution_id, node_id, check_id, "running", dry_run)
+        emit("status", "running")
         try:
             if dry_run:
                 logger.info(
@@ -66,7 +180,7 @@ class AutomationService:
                     output = None
                     err = "Proxmox service does not support execute_remediation"
                 else:
-                    out = self._proxmox.execute_remediation(node_id, ansible_snippet or "")
+                    out = self._provider_execute(node_id, ansible_snippet or "", emit)
                     if out and out.get("status") == "error":
                         status = "error"
                         output = out.get("message") or out.get("output")
@@ -86,6 +200,22 @@ class AutomationService:
             err = str(e)
             logger.exception("Automation execute_remediation failed: %s", e)
 
+        if output:
+            emit("stdout", output)
+        if status == "error":
+            emit("stderr", err, persist=False)  # kept in `error`
+        verification = None
+        if verify and status == "success" and not dry_run:
+            emit("status", "verifying")
+            verification = self.verify(node_id, check_id)
+            if verification is not None:
+                emit("stdout", self._verification_line(verification))
+        emit("status", status)
+        if total > len(lines):
+            output = f"[{total - len(lines)} earlier lines dropped]\n" + "\n".join(lines)
+        elif lines:
+            output = "\n".join(lines)
+
         execution = RemediationExecution(
             execution_id=execution_id,
             node_id=node_id,
@@ -94,8 +224,12 @@ class AutomationService:
             timestamp=timestamp,
             output=output,
             error=err if status == "error" else None,
+            verification=verification,
         )
-        self._history.append(execution)
+        self._state.list_append(KEY_HISTORY, execution.model_dump_json().encode("utf-8"), self._history_max)
+        self._publish_status(execution_id, node_id, check_id, status, dry_run, execution.error)
+        if buffer.run_id == execution_id:
+            self._publish_output(buffer.finish(execution_id, check_id, status))
 
         return RemediationResponse(
             execution_id=execution_id,
@@ -106,17 +240,173 @@ class AutomationService:
             timestamp=timestamp,
             output=output,
             error=err if status == "error" else None,
+            verification=verification,
+        )
+
+    def verify(self, node_id: str, check_id: str) -> Optional[CheckVerification]:
+        """Re-check check_id on the node via the configured verifier; None if disabled or not applicable."""
+        if self._verifier is None or check_id.startswith("handler:"):
+            return None
+        try:
+            with timed_phase("verify"):
+                return self._verifier(node_id, check_id)
+        except Exception as e:
+            logger.warning("Verification of %s on %s failed: %s", check_id, node_id, e)
+            return None
+
+    @staticmethod
+    def _verification_line(v: CheckVerification) -> str:
+        outcome = "verified" if v.verified else f"not verified ({v.status})"
+        return f"Verification: {v.check_id} {outcome} after {v.attempts} attempt(s), {v.latency_ms:.0f} ms"
+
+    def start_remediation(
+        self, node_id: str, check_id: str, ansible_snippet: str, dry_run: bool = True
+    ) -> RemediationResponse:
+        """
+        Start execute_remediation in a background worker and return at once (status "running").
+        Follow the output by execution_id (get_output / remediation_output events).
+        """
+        execution_id = f"rem-{uuid.uuid4().hex[:12]}"
+        self._outputs.create(execution_id)
+        future = self._background.submit(
+            self.execute_remediation, node_id, check_id, ansible_snippet, dry_run, execution_id
+        )
+        future.add_done_callback(_log_background_failure)
+        return RemediationResponse(
+            execution_id=execution_id, node_id=node_id, check_id=check_id, status="running", dry_run=dry_run
+        )
+
+    def start_plan(self, node_id: str, steps: list[RemediationStep], dry_run: bool = True) -> RemediationPlanResponse:
+        """
+        Start execute_plan in a background worker and return at once (status "running", no step results).
+        Follow the output of all steps by plan_id.
+
+        Raises:
+            ValueError: If the run_after hints form a cycle.
+        """
+        stages = plan_stages(steps)
+        plan_id = f"plan-{uuid.uuid4().hex[:12]}"
+        self._outputs.create(plan_id)
+        future = self._background.submit(self.execute_plan, node_id, steps, dry_run, plan_id)
+        future.add_done_callback(_log_background_failure)
+        return RemediationPlanResponse(
+            plan_id=plan_id, node_id=node_id, dry_run=dry_run, status="running", stages=stages, steps=[]
+        )
+
+    def execute_plan(
+        self, node_id: str, steps: list[RemediationStep], dry_run: bool = True, plan_id: Optional[str] = None
+    ) -> RemediationPlanResponse:
+        """
+        Execute or dry-run all remediation steps of a node as a dependency DAG.
+
+        Steps run as soon as the steps they run after (CheckDefinition.run_after) have succeeded,
+        up to max_parallel at once; dependents of a failed step are skipped. Handlers notified by
+        successful steps (e.g. restart sshd) run once at the end, like Ansible handler flushes.
+        Each step and handler is recorded in the history under its check_id ("handler:<name>");
+        their output is streamed into the plan's buffer.
+
+        Raises:
+            ValueError: If the run_after hints form a cycle.
+        """
+        plan_id = plan_id or f"plan-{uuid.uuid4().hex[:12]}"
+        stages = plan_stages(steps)
+        buffer = self._outputs.get(plan_id) or self._outputs.create(plan_id)
+        not_run: set[str] = set()
+
+        def blocked(step: RemediationStep, dependency: str) -> RemediationResponse:
+            not_run.add(step.check_id)
+            execution_id = f"rem-{uuid.uuid4().hex[:12]}"
+            self._publish_output(buffer.append(execution_id, step.check_id, "status", "skipped"))
+            return RemediationResponse(
+                execution_id=execution_id,
+                node_id=node_id,
+                check_id=step.check_id,
+                status="skipped",
+                dry_run=dry_run,
+                output=f"Not run: dependency {dependency} did not succeed",
+            )
+
+        done = run_dag(
+            steps,
+            lambda step: self.execute_remediation(
+                node_id, step.check_id, step.snippet, dry_run, output_buffer=buffer, verify=False
+            ),
+            ok=lambda r: r.status != "error",
+            blocked=blocked,
+            max_parallel=self._max_parallel,
+        )
+        succeeded = {step.check_id for step, r in done if r.status != "error"} - not_run
+        notified: list[str] = []
+        for step in steps:
+            if step.check_id in succeeded:
+                notified += [name for name in step.notify if name not in notified]
+        handlers = []
+        for name in notified:
+            task = handler_task(name)
+            if task is None:
+                handlers.append(RemediationResponse(
+                    execution_id=f"rem-{uuid.uuid4().hex[:12]}",
+                    node_id=node_id,
+                    check_id=f"handler:{name}",
+                    status="error",
+                    dry_run=dry_run,
+                    error=f"Unknown handler: {name}",
+                ))
+                continue
+            handlers.append(self.execute_remediation(
+                node_id, f"handler:{name}", dump_tasks([task]), dry_run, output_buffer=buffer
+            ))
+
+        # Verify after the handlers ran (e.g. sshd restarted), in parallel across steps
+        step_results = [r for _, r in done]
+        to_verify = [i for i, r in enumerate(step_results) if r.status == "success" and not dry_run]
+        if to_verify and self._verifier is not None:
+            with ThreadPoolExecutor(max_workers=max(1, self._max_parallel)) as pool:
+                verifications = list(pool.map(lambda i: self.verify(node_id, step_results[i].check_id), to_verify))
+            for i, verification in zip(to_verify, verifications):
+                if verification is not None:
+                    r = step_results[i]
+                    self._publish_output(buffer.append(
+                        r.execution_id, r.check_id, "stdout", self._verification_line(verification)
+                    ))
+                    step_results[i] = r.model_copy(update={"verification": verification})
+
+        results = step_results + handlers
+        if any(r.status == "error" for r in results) or len(succeeded) < len(steps):
+            status = "error"
+        elif all(r.status == "skipped" for r in results):
+            status = "skipped"
+        else:
+            status = "success"
+        self._publish_output(buffer.finish(plan_id, "", status))
+        return RemediationPlanResponse(
+            plan_id=plan_id,
+            node_id=node_id,
+            dry_run=dry_run,
+            status=status,
+            stages=stages,
+            steps=step_results,
+            handlers=handlers,
         )
 
     def get_history(self, node_id: Optional[str] = None) -> list[RemediationExecution]:
         """Return execution history, optionally filtered by node_id."""
         if node_id is None:
-            return list(self._history)
-        return [h for h in self._history if h.node_id == node_id]
+            return [RemediationExecution.model_validate_json(raw) for raw in self._state.list_iter(KEY_HISTORY)]
+        # Skip other nodes' entries on the raw bytes; only candidates are deserialized
+        needle = b'"node_id":' + json.dumps(node_id, ensure_ascii=False).encode("utf-8")
+        history = []
+        for raw in self._state.list_iter(KEY_HISTORY):
+            if needle not in raw:
+                continue
+            execution = RemediationExecution.model_validate_json(raw)
+            if execution.node_id == node_id:
+                history.append(execution)
+        return history
 
     def get_status(self) -> dict:
         """Return automation service status and config summary (enabled from settings)."""
         return {
             "enabled": self._automation_enabled,
-            "history_count": len(self._history),
+            "history_count": self._state.list_len(KEY_HISTORY),
         }
@@ -0,0 +1,162 @@
+"""Incremental index of vzdump backup volumes per storage, for real backup retention/recency checks."""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BackupVolume:
+    """One vzdump archive (GET /nodes/{node}/storage/{storage}/content?content=backup)."""
+
+    volid: str
+    storage: str
+    vmid: Optional[int]
+    ctime: int
+    size: int = 0
+
+
+@dataclass
+class _StorageIndex:
+    marker: tuple
+    listed_at: float
+    volumes: dict[str, BackupVolume]
+
+
+class BackupIndex:
+    """
+    Index of backup volumes per storage. Each cycle lists the node's backup-capable storages
+    (one cheap call) and re-lists a storage's content only if its usage marker (used/total bytes)
+    changed or the listing is older than max_listing_age_seconds; otherwise the indexed volumes
+    are reused. Re-lists are diffed against the index so added/removed archives are counted.
+    Shared storages are indexed once for the whole cluster.
+    """
+
+    def __init__(self, api: Callable[[], Any], max_listing_age_seconds: float = 3600.0) -> None:
+        """
+        Args:
+            api: Returns a connected proxmoxer ProxmoxAPI.
+            max_listing_age_seconds: Re-list unchanged storages after this long (catches prunes
+                that happen to leave usage unchanged).
+        """
+        self._api = api
+        self._max_listing_age = max_listing_age_seconds
+        self._lock = threading.Lock()
+        self._storages: dict[str, _StorageIndex] = {}
+        self.listings = 0
+        self.added = 0
+        self.removed = 0
+
+    @staticmethod
+    def _storage_key(node_id: str, storage: dict) -> str:
+        return storage["storage"] if storage.get("shared") else f"{node_id}/{storage['storage']}"
+
+    def node_backups(self, node_id: str) -> list[BackupVolume]:
+        """All indexed backup volumes on storages visible to node_id (refreshing changed storages)."""
+        px = self._api()
+        storages = px.nodes(node_id).storage.get(content="backup")
+        volumes: list[BackupVolume] = []
+        with self._lock:
+            for storage in storages if isinstance(storages, list) else []:
+                if not storage.get("active", 1):
+                    continue
+                key = self._storage_key(node_id, storage)
+                index = self._refresh_storage(px, node_id, key, storage)
+                volumes.extend(index.volumes.values())
+        return volumes
+
+    def _refresh_storage(self, px: Any, node_id: str, key: str, storage: dict) -> _StorageIndex:
+        marker = (storage.get("used"), storage.get("total"))
+        now = time.monotonic()
+        index = self._storages.get(key)
+        if index is not None and index.marker == marker and now - index.listed_at < self._max_listing_age:
+            return index
+
+        content = px.nodes(node_id).storage(storage["storage"]).content.get(content="backup")
+        self.listings += 1
+        listed: dict[str, BackupVolume] = {}
+        previous = index.volumes if index is not None else {}
+        for item in content if isinstance(content, list) else []:
+            volid = item.get("volid")
+            if not volid:
+                continue
+            known = previous.get(volid)
+            if known is not None:
+                listed[volid] = known
+                continue
+            vmid = item.get("vmid")
+            listed[volid] = BackupVolume(
+                volid=volid,
+                storage=storage["storage"],
+                vmid=int(vmid) if vmid is not None else None,
+                ctime=int(item.get("ctime") or 0),
+                size=int(item.get("size") or 0),
+            )
+        added = len(listed.keys() - previous.keys())
+        removed = len(previous.keys() - listed.keys())
+        self.added += added
+        self.removed += removed
+        if added or removed:
+            logger.debug("Backup index %s: +%d/-%d volumes (%d total)", key, added, removed, len(listed))
+        index = _StorageIndex(marker, now, listed)
+        self._storages[key] = index
+        return index
+
+
+def summarize_node_backups(
+    volumes: Iterable[BackupVolume],
+    vmids: Iterable[int],
+    now: Optional[float] = None,
+    max_backup_age_hours: float = 48.0,
+) -> dict[str, Any]:
+    """
+    Map backup volumes to node config keys for the backup checks.
+
+    backup_retention_days is the weakest guest's retention: days between its oldest kept archive
+    and now (0 for guests without any backup). Nodes without guests use the span of all archives
+    on their storages. backup_last_age_hours is the worst guest's time since its newest archive;
+    guests without an archive newer than max_backup_age_hours are listed (the retention check fails
+    on them).
+    """
+    now = time.time() if now is None else now
+    by_vmid: dict[int, list[int]] = {}
+    all_ctimes: list[int] = []
+    for vol in volumes:
+        all_ctimes.append(vol.ctime)
+        if vol.vmid is not None:
+            by_vmid.setdefault(vol.vmid, []).append(vol.ctime)
+
+    guests = sorted(set(vmids))
+    if not guests:
+        retention = int((now - min(all_ctimes)) // 86400) if all_ctimes else 0
+        return {
+            "backup_retention_days": retention,
+            "backup_last_age_hours": None,
+            "backup_guests_without_recent_backup": [],
+            "backup_max_age_hours": max_backup_age_hours,
+        }
+
+    retention_days: list[int] = []
+    last_age_hours: list[float] = []
+    stale: list[int] = []
+    for vmid in guests:
+        ctimes = by_vmid.get(vmid)
+        if not ctimes:
+            retention_days.append(0)
+            stale.append(vmid)
+            continue
+        retention_days.append(int((now - min(ctimes)) // 86400))
+        age_hours = (now - max(ctimes)) / 3600
+        last_age_hours.append(age_hours)
+        if age_hours > max_backup_age_hours:
+            stale.append(vmid)
+    return {
+        "backup_retention_days": min(retention_days),
+        "backup_last_age_hours": round(max(last_age_hours), 1) if last_age_hours else None,
+        "backup_guests_without_recent_backup": stale,
+        "backup_max_age_hours": max_backup_age_hours,
+    }
@@ -0,0 +1,243 @@
+"""Fleet version counter and bounded change log of per-node audit results (delta sync)."""
+
+import hashlib
+import json
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Iterable, Optional
+
+from app.models.check import FleetChanges, NodeAuditResult, NodeChange
+from app.services.state_backend import MemoryStateBackend, StateBackend
+
+CHANGE_ADDED = "added"
+CHANGE_UPDATED = "updated"
+CHANGE_REMOVED = "removed"
+
+
+def result_fingerprint(result: NodeAuditResult) -> tuple:
+    """Fields whose change is visible to clients: score plus every check's status and details."""
+    return (
+        result.compliance_score,
+        tuple((r.check_id, r.status, r.details) for r in result.check_results),
+    )
+
+
+@dataclass
+class _LogEntry:
+    version: int
+    node_id: str
+    change_type: str
+    previous_score: Optional[int] = None
+    changed_checks: list[str] = field(default_factory=list)
+
+
+KEY_VERSION = "fleet:version"
+KEY_LOG = "fleet:changes"
+KEY_MEMBERS = "fleet:nodes"  # backend set of tracked node_ids
+
+
+def _latest_key(node_id: str) -> str:
+    return f"fleet:latest:{node_id}"
+
+
+def _fingerprint_key(node_id: str) -> str:
+    return f"fleet:fp:{node_id}"
+
+
+class FleetChangeLog:
+    """
+    Tracks the latest audit result per node and a monotonically increasing fleet version.
+
+    Every node result that differs from the previous one (added, score/check change, removed)
+    bumps the version and appends a log entry. The log is bounded; clients whose `since`
+    predates the retained window get a full resync instead of a delta.
+
+    All state lives in a StateBackend, so with a shared backend (SQLite/Redis) every worker
+    sees the same latest results, fleet version and change log. Each change is claimed with a
+    backend-level atomic operation (fingerprint swap, set add/remove), so when several workers
+    record the same change only one of them bumps the version. The version bump and its log
+    entry are written together, so a poll never sees a version whose entry is still missing. Decoded results are memoized per
+    process and reused while the stored bytes are unchanged.
+    """
+
+    def __init__(self, backend: StateBackend | None = None, max_entries: int = 10000) -> None:
+        self._backend = backend or MemoryStateBackend()
+        self._max_entries = max_entries
+        self._decoded: dict[str, tuple[bytes, NodeAuditResult]] = {}
+
+    @property
+    def version(self) -> int:
+        return self._backend.get_counter(KEY_VERSION)
+
+    def latest(self, node_id: str) -> Optional[NodeAuditResult]:
+        """Return the node's most recently recorded result (from any worker), or None."""
+        raw = self._backend.get(_latest_key(node_id))
+        if raw is None:
+            return None
+        memo = self._decoded.get(node_id)
+        if memo is not None and (memo[0] is raw or memo[0] == raw):
+            return memo[1]
+        result = NodeAuditResult.model_validate_json(raw)
+        self._decoded[node_id] = (raw, result)
+        return result
+
+    def fingerprint(self, node_id: str) -> Optional[str]:
+        """Digest of result_fingerprint() of the node's latest result, or None if none is recorded."""
+        raw = self._backend.get(_fingerprint_key(node_id))
+        return raw.decode("utf-8") if raw is not None else None
+
+    def members(self) -> list[str]:
+        return self._backend.set_members(KEY_MEMBERS)
+
+    def record(self, result: NodeAuditResult) -> Optional[int]:
+        """Store result as the node's latest; return the new fleet version if it changed, else None."""
+        node_id = result.node_id
+        raw = result.model_dump_json().encode("utf-8")
+        fingerprint = hashlib.sha1(repr(result_fingerprint(result)).encode("utf-8")).hexdigest().encode()
+        previous = self.latest(node_id)
+        self._backend.set(_latest_key(node_id), raw)
+        self._decoded[node_id] = (raw, result)
+        if not self._backend.set_if_changed(_fingerprint_key(node_id), fingerprint):
+            return None
+        added = self._backend.set_add(KEY_MEMBERS, node_id)
+        if added or previous is None:
+            return self._append(node_id, CHANGE_ADDED)
+        old_status = {r.check_id: (r.status, r.details) for r in previous.check_results}
+        return self._append(
+            node_id,
+            CHANGE_UPDATED,
+            previous_score=previous.compliance_score,
+            changed_checks=[
+                r.check_id for r in result.check_results
+                if old_status.get(r.check_id) != (r.status, r.details)
+            ],
+        )
+
+    def _append(self, node_id: str, change_type: str, **fields) -> int:
+        """Bump the fleet version and log the change in one atomic backend operation; return the version."""
+        return self._backend.incr_and_append(
+            KEY_VERSION,
+            KEY_LOG,
+            lambda version: json.dumps(asdict(_LogEntry(version, node_id, change_type, **fields))).encode("utf-8"),
+            self._max_entries,
+        )
+
+    def sync_membership(self, node_ids: Iterable[str]) -> None:
+        """Record removal of tracked nodes that are no longer part of the fleet."""
+        present = set(node_ids)
+        for node_id in self.members():
+            # Only the worker whose remove succeeds records the removal
+            if node_id in present or not self._backend.set_remove(KEY_MEMBERS, node_id):
+                continue
+            previous = self.latest(node_id)
+            self._backend.delete(_latest_key(node_id))
+            self._backend.delete(_fingerprint_key(node_id))
+            self._decoded.pop(node_id, None)
+            self._append(node_id, CHANGE_REMOVED, previous_score=previous.compliance_score if previous else None)
+
+    def changes_since(self, since: int) -> FleetChanges:
+        """
+        Return one NodeChange per node changed after version `since` (latest result attached).
+        Falls back to full_resync (every tracked node as "added") if `since` is outside the log window.
+        """
+        version = self.version
+        # Entries appended after the version was read are left for the next poll
+        entries = [
+            entry for entry in (_LogEntry(**json.loads(raw)) for raw in self._backend.list_items(KEY_LOG))
+            if entry.version <= version
+        ]
+        oldest = entries[0].version if entries else version + 1
+        if since > version or since < oldest - 1:
+            changes = []
+            for node_id in self.members():
+                result = self.latest(node_id)
+                if result is not None:
+                    changes.append(NodeChange(node_id=node_id, change_type=CHANGE_ADDED, version=version, node=result))
+            return FleetChanges(since=since, version=version, full_resync=True, changes=changes)
+
+        merged: dict[str, NodeChange] = {}
+        for entry in entries:
+            if entry.version <= since:
+                continue
+            prior = merged.get(entry.node_id)
+            if prior is None:
+                merged[entry.node_id] = NodeChange(
+                    node_id=entry.node_id,
+                    change_type=entry.change_type,
+                    version=entry.version,
+                    previous_score=entry.previous_score,
+                    changed_checks=list(entry.changed_checks),
+                )
+                continue
+            # Collapse consecutive changes: added stays added unless removed again, etc.
+            if entry.change_type == CHANGE_REMOVED:
+                prior.change_type = CHANGE_REMOVED
+            elif prior.change_type == CHANGE_REMOVED:
+                prior.change_type = CHANGE_UPDATED if prior.previous_score is not None else CHANGE_ADDED
+            prior.version = entry.version
+            prior.changed_checks = sorted(set(prior.changed_checks) | set(entry.changed_checks))
+
+        for change in merged.values():
+            if change.change_type != CHANGE_REMOVED:
+                change.node = self.latest(change.node_id)
+        return FleetChanges(
+            since=since,
+            version=version,
+            full_resync=False,
+            changes=sorted(merged.values(), key=lambda c: c.version),
+        )
+
+
+class ChangeLogFollower:
+    """
+    Base for in-memory views kept current from a FleetChangeLog (customer rollups, control
+    coverage). Subclasses implement _apply / _remove / _reset and call _catch_up() under _lock
+    before every read.
+
+    Results recorded by this process are applied directly when they are the next fleet version;
+    anything else (results written by other workers to a shared state backend, out-of-order
+    applies) is caught up from changes_since() on the next read.
+    """
+
+    def __init__(self, change_log: FleetChangeLog) -> None:
+        self._changes = change_log
+        self._lock = threading.Lock()
+        self._version = 0
+
+    def _apply(self, result: NodeAuditResult) -> None:
+        """Replace the node's previous contribution with result."""
+        raise NotImplementedError
+
+    def _remove(self, node_id: str) -> None:
+        """Drop the node's contribution (no-op if it has none)."""
+        raise NotImplementedError
+
+    def _reset(self) -> None:
+        """Drop every contribution before a full resync."""
+        raise NotImplementedError
+
+    def on_recorded(self, result: NodeAuditResult, version: Optional[int]) -> None:
+        """Apply a result just recorded at fleet version `version` (None: result unchanged)."""
+        if version is None:
+            return
+        with self._lock:
+            if version == self._version + 1:
+                self._apply(result)
+                self._version = version
+
+    def _catch_up(self) -> None:
+        if self._changes.version == self._version:
+            return
+        delta = self._changes.changes_since(self._version)
+        if delta.full_resync:
+            self._reset()
+        for change in delta.changes:
+            if change.node is None:
+                self._remove(change.node_id)
+            else:
+                self._apply(change.node)
+        # Only advance to versions actually applied; a result recorded concurrently stays next
+        if delta.full_resync:
+            self._version = delta.version
+        else:
+            self._version = max((c.version for c in delta.changes), default=self._version)
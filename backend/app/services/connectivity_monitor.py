@@ -0,0 +1,140 @@
+"""Background Proxmox connectivity monitor: per-cluster reachability and API latency."""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from app.services.proxmox_base import ProxmoxServiceProtocol
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ClusterStatus:
+    """Last probe outcome for one Proxmox cluster (or the mock provider)."""
+
+    name: str
+    reachable: bool = False
+    latency_ms: Optional[float] = None
+    nodes: dict[str, str] = field(default_factory=dict)  # node_id -> online | offline | unknown
+    last_checked: Optional[datetime] = None
+    last_success: Optional[datetime] = None
+    last_error: Optional[str] = None
+    consecutive_failures: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "reachable": self.reachable,
+            "latency_ms": self.latency_ms,
+            "nodes": dict(self.nodes),
+            "last_checked": self.last_checked.isoformat() if self.last_checked else None,
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+            "last_error": self.last_error,
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+
+class ConnectivityMonitor:
+    """
+    Probes each cluster's node list on its own schedule and keeps the result in memory.
+    Health endpoints read snapshot() (a prebuilt dict) and never call Proxmox themselves.
+    """
+
+    def __init__(
+        self,
+        clusters: dict[str, ProxmoxServiceProtocol],
+        interval_seconds: float = 15.0,
+    ) -> None:
+        """
+        Args:
+            clusters: Cluster name -> service to probe (e.g. {"pve.example.com": real}).
+            interval_seconds: Delay between probe rounds.
+        """
+        self._clusters = dict(clusters)
+        self._interval = interval_seconds
+        self._status: dict[str, ClusterStatus] = {name: ClusterStatus(name=name) for name in self._clusters}
+        self._snapshot: dict = self._build_snapshot()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def probe_once(self) -> dict:
+        """Probe every cluster now, publish a new snapshot and return it."""
+        for name, svc in self._clusters.items():
+            self._probe_cluster(name, svc)
+        snapshot = self._build_snapshot()
+        with self._lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    def _probe_cluster(self, name: str, svc: ProxmoxServiceProtocol) -> None:
+        status = self._status[name]
+        start = time.perf_counter()
+        try:
+            get_statuses = getattr(svc, "get_node_statuses", None)
+            if callable(get_statuses):
+                nodes = dict(get_statuses())
+            else:
+                nodes = {node_id: "online" for node_id in svc.get_all_nodes()}
+        except Exception as e:
+            logger.warning("Connectivity probe failed for %s: %s", name, e)
+            status.reachable = False
+            status.latency_ms = None
+            # Last known nodes stay listed, but nothing unreachable counts as online
+            status.nodes = {node_id: "unknown" for node_id in status.nodes}
+            status.last_error = str(e)
+            status.consecutive_failures += 1
+        else:
+            status.reachable = True
+            status.latency_ms = round((time.perf_counter() - start) * 1000, 2)
+            status.nodes = nodes
+            status.last_success = datetime.utcnow()
+            status.last_error = None
+            status.consecutive_failures = 0
+        status.last_checked = datetime.utcnow()
+
+    def _build_snapshot(self) -> dict:
+        clusters = [s.to_dict() for s in self._status.values()]
+        node_status: dict[str, str] = {}
+        for s in self._status.values():
+            node_status.update(s.nodes)
+        errors = [s.last_error for s in self._status.values() if s.last_error]
+        checked = [s.last_checked for s in self._status.values() if s.last_checked]
+        return {
+            "connected": any(s.reachable for s in self._status.values()),
+            "nodes": sorted(node_status),
+            "nodes_online": sum(1 for v in node_status.values() if v == "online"),
+            "error": errors[0] if errors else None,
+            "last_checked": min(checked).isoformat() if checked else None,
+            "clusters": clusters,
+        }
+
+    def snapshot(self) -> dict:
+        """Return the latest published snapshot (constant time, no I/O)."""
+        with self._lock:
+            return self._snapshot
+
+    def start(self, initial_delay_seconds: float | None = None) -> None:
+        """Start periodic probing; first round after initial_delay_seconds (default: interval)."""
+        delay = self._interval if initial_delay_seconds is None else initial_delay_seconds
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(delay,), name="connectivity-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self, delay: float) -> None:
+        if self._stop.wait(delay):
+            return
+        while True:
+            try:
+                self.probe_once()
+            except Exception as e:  # never let the monitor thread die
+                logger.exception("Connectivity monitor round failed: %s", e)
+            if self._stop.wait(self._interval):
+                return
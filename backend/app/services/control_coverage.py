@@ -0,0 +1,202 @@
+"""Control-to-check index and node x control status matrix, updated incrementally as node audit results land."""
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+
+from app.models.check import (
+    ControlCoverageList,
+    ControlMatrix,
+    ControlMatrixRow,
+    ControlStatus,
+    NodeAuditResult,
+)
+from app.services.change_tracker import ChangeLogFollower
+
+# ComplianceMapping field -> display name
+FRAMEWORKS = {"iso_27001": "ISO 27001", "bsi_grundschutz": "BSI IT-Grundschutz", "nis2": "NIS2"}
+
+# Worst status wins when several mapped checks disagree on a node
+_RANK = {"PASS": 0, "ERROR": 1, "FAIL": 2}
+
+
+def _natural_key(control_id: str) -> list:
+    """Sort A.8.2 before A.8.13."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", control_id)]
+
+
+def control_index(checks: Iterable) -> list[tuple[str, str, tuple[str, ...]]]:
+    """
+    (framework, control_id, check_ids) for every control referenced by a check's compliance_mapping,
+    ordered by framework (FRAMEWORKS order) and natural control order.
+    """
+    index: dict[tuple[str, str], list[str]] = {}
+    for check in checks:
+        for framework in FRAMEWORKS:
+            for control_id in getattr(check.compliance_mapping, framework):
+                index.setdefault((framework, control_id), []).append(check.check_id)
+    order = list(FRAMEWORKS)
+    keys = sorted(index, key=lambda k: (order.index(k[0]), _natural_key(k[1])))
+    return [(framework, control_id, tuple(index[(framework, control_id)])) for framework, control_id in keys]
+
+
+@dataclass
+class _Coverage:
+    """Per-control counters of one customer (lists are indexed like the control index)."""
+
+    size: int
+    assessed: list[int] = field(init=False)
+    passed: list[int] = field(init=False)
+    errors: list[int] = field(init=False)
+    failing: list[set[str]] = field(init=False)
+    nodes: int = 0
+
+    def __post_init__(self) -> None:
+        self.assessed = [0] * self.size
+        self.passed = [0] * self.size
+        self.errors = [0] * self.size
+        self.failing = [set() for _ in range(self.size)]
+
+    def add(self, node_id: str, statuses: tuple[Optional[str], ...], sign: int = 1) -> None:
+        self.nodes += sign
+        for i, status in enumerate(statuses):
+            if status is None:
+                continue
+            self.assessed[i] += sign
+            if status == "PASS":
+                self.passed[i] += sign
+                continue
+            if status == "ERROR":
+                self.errors[i] += sign
+            if sign > 0:
+                self.failing[i].add(node_id)
+            else:
+                self.failing[i].discard(node_id)
+
+
+class ControlCoverage(ChangeLogFollower):
+    """
+    Status of every framework control (ISO 27001, BSI IT-Grundschutz, NIS2) per node and per
+    customer, kept as running counters: each landed node result replaces that node's previous row
+    of the matrix, so control-centric reads ("A.8.13 across the fleet") never scan all results.
+
+    A node passes a control when every mapped check it has a result for passed; a failed mapped
+    check makes it FAIL, otherwise an errored one makes it ERROR. Follows the fleet version of a
+    FleetChangeLog (see ChangeLogFollower).
+    """
+
+    def __init__(self, change_log, checks: Iterable, resolve_customer: Callable[[str], str]) -> None:
+        """
+        Args:
+            change_log: FleetChangeLog whose recorded results feed the matrix.
+            checks: Check definitions whose compliance_mapping defines the controls.
+            resolve_customer: Maps node_id to customer_id (see customer_resolver).
+        """
+        super().__init__(change_log)
+        self._resolve = resolve_customer
+        self._index = control_index(checks)
+        self._positions = {(framework, control_id): i for i, (framework, control_id, _) in enumerate(self._index)}
+        self._controls_of: dict[str, list[int]] = {}
+        for i, (_, _, check_ids) in enumerate(self._index):
+            for check_id in check_ids:
+                self._controls_of.setdefault(check_id, []).append(i)
+        self._rows: dict[str, tuple[str, tuple[Optional[str], ...]]] = {}  # node_id -> (customer, statuses)
+        self._customers: dict[str, _Coverage] = {}
+
+    def has_control(self, framework: str, control_id: str) -> bool:
+        return (framework, control_id) in self._positions
+
+    def _statuses(self, result: NodeAuditResult) -> tuple[Optional[str], ...]:
+        ranks: list[int] = [-1] * len(self._index)
+        for r in result.check_results:
+            rank = _RANK.get(r.status, _RANK["ERROR"])
+            for i in self._controls_of.get(r.check_id, ()):
+                if rank > ranks[i]:
+                    ranks[i] = rank
+        names = list(_RANK)
+        return tuple(names[rank] if rank >= 0 else None for rank in ranks)
+
+    def _remove(self, node_id: str) -> None:
+        row = self._rows.pop(node_id, None)
+        if row is None:
+            return
+        customer, statuses = row
+        coverage = self._customers[customer]
+        coverage.add(node_id, statuses, sign=-1)
+        if not coverage.nodes:
+            del self._customers[customer]
+
+    def _apply(self, result: NodeAuditResult) -> None:
+        self._remove(result.node_id)
+        customer = self._resolve(result.node_id)
+        statuses = self._statuses(result)
+        self._rows[result.node_id] = (customer, statuses)
+        self._customers.setdefault(customer, _Coverage(len(self._index))).add(result.node_id, statuses)
+
+    def _reset(self) -> None:
+        self._rows.clear()
+        self._customers.clear()
+
+    def _status(self, i: int, customers: list[_Coverage], include_nodes: bool) -> ControlStatus:
+        framework, control_id, check_ids = self._index[i]
+        assessed = sum(c.assessed[i] for c in customers)
+        passed = sum(c.passed[i] for c in customers)
+        failing = sorted(n for c in customers for n in c.failing[i]) if include_nodes else []
+        return ControlStatus(
+            framework=framework,
+            control_id=control_id,
+            check_ids=list(check_ids),
+            assessed_nodes=assessed,
+            passed_nodes=passed,
+            failed_nodes=assessed - passed,
+            error_nodes=sum(c.errors[i] for c in customers),
+            pass_rate=round(passed / assessed * 100, 2) if assessed else 0.0,
+            failing_nodes=failing,
+        )
+
+    def _selected(self, customer_id: Optional[str]) -> list[_Coverage]:
+        if customer_id is None:
+            return list(self._customers.values())
+        coverage = self._customers.get(customer_id)
+        return [coverage] if coverage is not None else []
+
+    def _columns(self, framework: Optional[str]) -> list[int]:
+        return [i for i, (fw, _, _) in enumerate(self._index) if framework is None or fw == framework]
+
+    def controls(
+        self, framework: Optional[str] = None, customer_id: Optional[str] = None, include_nodes: bool = False
+    ) -> ControlCoverageList:
+        """Status of every control (optionally of one framework), fleet-wide or for one customer."""
+        with self._lock:
+            self._catch_up()
+            customers = self._selected(customer_id)
+            return ControlCoverageList(
+                version=self._version,
+                customer_id=customer_id,
+                controls=[self._status(i, customers, include_nodes) for i in self._columns(framework)],
+            )
+
+    def control(self, framework: str, control_id: str, customer_id: Optional[str] = None) -> Optional[ControlStatus]:
+        """Status of one control including its failing nodes, or None if no check maps to it."""
+        i = self._positions.get((framework, control_id))
+        if i is None:
+            return None
+        with self._lock:
+            self._catch_up()
+            return self._status(i, self._selected(customer_id), include_nodes=True)
+
+    def matrix(self, framework: Optional[str] = None, customer_id: Optional[str] = None) -> ControlMatrix:
+        """Node x control statuses (optionally one framework / one customer's nodes), rows by node_id."""
+        columns = self._columns(framework)
+        with self._lock:
+            self._catch_up()
+            rows = [
+                ControlMatrixRow(node_id=node_id, customer_id=customer, statuses=[statuses[i] for i in columns])
+                for node_id, (customer, statuses) in sorted(self._rows.items())
+                if customer_id is None or customer == customer_id
+            ]
+            return ControlMatrix(
+                version=self._version,
+                controls=[f"{self._index[i][0]}:{self._index[i][1]}" for i in columns],
+                nodes=rows,
+            )
@@ -0,0 +1,162 @@
+"""Per-customer compliance rollups, updated incrementally as node audit results land."""
+
+import bisect
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from app.models.check import CustomerNodeScore, CustomerRollup, CustomerRollupList, NodeAuditResult
+from app.services.change_tracker import ChangeLogFollower
+
+UNASSIGNED = "unassigned"
+SEVERITIES = ("CRITICAL", "HIGH", "MEDIUM", "LOW")
+
+
+def customer_resolver(customer_map: Optional[dict[str, str]] = None) -> Callable[[str], str]:
+    """
+    Map node_id -> customer_id: explicit NODE_CUSTOMER_MAP entries first, then the MSP naming
+    convention "<customer>-node" (e.g. customer-a-node -> customer-a), else "unassigned".
+    """
+    mapping = dict(customer_map or {})
+
+    def resolve(node_id: str) -> str:
+        if node_id in mapping:
+            return mapping[node_id]
+        if node_id.endswith("-node") and len(node_id) > len("-node"):
+            return node_id[: -len("-node")]
+        return UNASSIGNED
+
+    return resolve
+
+
+@dataclass(frozen=True)
+class _Contribution:
+    """What one node adds to its customer's aggregates."""
+
+    score: int
+    failing: tuple[int, ...]  # failing check count per SEVERITIES entry
+    errors: int
+    critical: bool
+
+
+@dataclass
+class _Rollup:
+    score_sum: int = 0
+    failing: list[int] = field(default_factory=lambda: [0] * len(SEVERITIES))
+    errors: int = 0
+    critical: set[str] = field(default_factory=set)
+    nodes: dict[str, _Contribution] = field(default_factory=dict)
+    ranked: list[tuple[int, str]] = field(default_factory=list)  # (score, node_id), worst first
+
+    def add(self, node_id: str, c: _Contribution) -> None:
+        self.nodes[node_id] = c
+        self.score_sum += c.score
+        self.failing = [a + b for a, b in zip(self.failing, c.failing)]
+        self.errors += c.errors
+        if c.critical:
+            self.critical.add(node_id)
+        bisect.insort(self.ranked, (c.score, node_id))
+
+    def remove(self, node_id: str) -> None:
+        c = self.nodes.pop(node_id)
+        self.score_sum -= c.score
+        self.failing = [a - b for a, b in zip(self.failing, c.failing)]
+        self.errors -= c.errors
+        self.critical.discard(node_id)
+        del self.ranked[bisect.bisect_left(self.ranked, (c.score, node_id))]
+
+
+class CustomerRollups(ChangeLogFollower):
+    """
+    Aggregates per customer (average score, failing checks by severity, critical and worst nodes)
+    kept as running sums: each landed node result replaces that node's previous contribution, so
+    reads never re-aggregate the fleet.
+
+    The rollups follow the fleet version of a FleetChangeLog (see ChangeLogFollower).
+    """
+
+    def __init__(
+        self,
+        change_log,
+        resolve_customer: Callable[[str], str],
+        critical_threshold: int = 60,
+        worst_nodes: int = 5,
+    ) -> None:
+        """
+        Args:
+            change_log: FleetChangeLog whose recorded results feed the rollups.
+            resolve_customer: Maps node_id to customer_id (see customer_resolver).
+            critical_threshold: Nodes scoring below this count as critical.
+            worst_nodes: Number of lowest-scoring nodes listed per customer.
+        """
+        super().__init__(change_log)
+        self._resolve = resolve_customer
+        self._threshold = critical_threshold
+        self._worst = worst_nodes
+        self._rollups: dict[str, _Rollup] = {}
+        self._node_customer: dict[str, str] = {}
+
+    def _contribution(self, result: NodeAuditResult) -> _Contribution:
+        failing = [0] * len(SEVERITIES)
+        errors = 0
+        for r in result.check_results:
+            if r.status == "FAIL" and r.severity in SEVERITIES:
+                failing[SEVERITIES.index(r.severity)] += 1
+            elif r.status == "ERROR":
+                errors += 1
+        return _Contribution(
+            score=result.compliance_score,
+            failing=tuple(failing),
+            errors=errors,
+            critical=result.compliance_score < self._threshold,
+        )
+
+    def _remove(self, node_id: str) -> None:
+        customer = self._node_customer.pop(node_id, None)
+        if customer is None:
+            return
+        rollup = self._rollups[customer]
+        rollup.remove(node_id)
+        if not rollup.nodes:
+            del self._rollups[customer]
+
+    def _apply(self, result: NodeAuditResult) -> None:
+        self._remove(result.node_id)
+        customer = self._resolve(result.node_id)
+        self._node_customer[result.node_id] = customer
+        self._rollups.setdefault(customer, _Rollup()).add(result.node_id, self._contribution(result))
+
+    def _reset(self) -> None:
+        self._rollups.clear()
+        self._node_customer.clear()
+
+    def _snapshot(self, customer_id: str, rollup: _Rollup) -> CustomerRollup:
+        total = len(rollup.nodes)
+        return CustomerRollup(
+            customer_id=customer_id,
+            total_nodes=total,
+            average_compliance=round(rollup.score_sum / total, 2) if total else 0.0,
+            critical_nodes=sorted(rollup.critical),
+            failing_checks_by_severity=dict(zip(SEVERITIES, rollup.failing)),
+            error_checks=rollup.errors,
+            worst_nodes=[
+                CustomerNodeScore(node_id=node_id, compliance_score=score)
+                for score, node_id in rollup.ranked[: self._worst]
+            ],
+            version=self._version,
+        )
+
+    def all(self) -> CustomerRollupList:
+        """Current rollup of every customer with at least one audited node, by customer_id."""
+        with self._lock:
+            self._catch_up()
+            return CustomerRollupList(
+                version=self._version,
+                customers=[self._snapshot(c, self._rollups[c]) for c in sorted(self._rollups)],
+            )
+
+    def get(self, customer_id: str) -> Optional[CustomerRollup]:
+        """Current rollup of customer_id, or None if it has no audited nodes."""
+        with self._lock:
+            self._catch_up()
+            rollup = self._rollups.get(customer_id)
+            return self._snapshot(customer_id, rollup) if rollup is not None else None
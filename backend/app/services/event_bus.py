@@ -0,0 +1,131 @@
+"""In-process event bus fanning out audit and remediation events to WebSocket/SSE subscribers."""
+
+import asyncio
+import itertools
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+EVENT_NODE_AUDIT_COMPLETED = "node_audit_completed"
+EVENT_SCORE_CHANGED = "score_changed"
+EVENT_CRITICAL_THRESHOLD_CROSSED = "critical_threshold_crossed"
+EVENT_REMEDIATION_STATUS = "remediation_status"
+EVENT_REMEDIATION_OUTPUT = "remediation_output"
+EVENT_OVERFLOW = "overflow"
+
+EVENT_TYPES = (
+    EVENT_NODE_AUDIT_COMPLETED,
+    EVENT_SCORE_CHANGED,
+    EVENT_CRITICAL_THRESHOLD_CROSSED,
+    EVENT_REMEDIATION_STATUS,
+    EVENT_REMEDIATION_OUTPUT,
+)
+
+
+class Subscription:
+    """
+    One subscriber's bounded buffer. When the client falls behind, the oldest events are
+    dropped (never blocking publishers) and an "overflow" event with the drop count is
+    delivered next so the client knows to resync via REST.
+    """
+
+    def __init__(self, bus: "EventBus", topics: Optional[frozenset[str]], buffer_size: int) -> None:
+        self._bus = bus
+        self.topics = topics
+        self._buffer: deque[dict] = deque(maxlen=buffer_size)
+        self._ready = asyncio.Event()
+        self.dropped = 0
+        self._pending_overflow = 0
+        self.closed = False
+
+    def wants(self, event_type: str) -> bool:
+        return self.topics is None or event_type in self.topics
+
+    def _push(self, event: dict) -> None:
+        """Called on the event loop thread only."""
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+            self._pending_overflow += 1
+        self._buffer.append(event)
+        self._ready.set()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """Return the next event, or None on timeout (used for keep-alives)."""
+        while not self._buffer:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        if self._pending_overflow:
+            dropped, self._pending_overflow = self._pending_overflow, 0
+            return {"type": EVENT_OVERFLOW, "timestamp": datetime.utcnow().isoformat(), "data": {"dropped": dropped}}
+        return self._buffer.popleft()
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self._bus._unsubscribe(self)
+
+
+class EventBus:
+    """
+    Publish/subscribe bus. publish() is safe from any thread (sync endpoints run in the
+    threadpool); fan-out happens on the bound event loop, O(subscribers) per event.
+    """
+
+    def __init__(self, buffer_size: int = 256, max_subscribers: int = 1000) -> None:
+        self._buffer_size = buffer_size
+        self._max_subscribers = max_subscribers
+        self._subscribers: set[Subscription] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._ids = itertools.count(1)
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Bind the event loop that owns subscriber buffers (call once at startup)."""
+        self._loop = loop
+        self._loop_thread = threading.get_ident()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, topics: Optional[Iterable[str]] = None) -> Subscription:
+        """Register a subscriber (on the event loop); topics=None receives every event type."""
+        if len(self._subscribers) >= self._max_subscribers:
+            raise RuntimeError("Too many event subscribers")
+        sub = Subscription(self, frozenset(topics) if topics else None, self._buffer_size)
+        self._subscribers.add(sub)
+        return sub
+
+    def _unsubscribe(self, sub: Subscription) -> None:
+        self._subscribers.discard(sub)
+
+    def publish(self, event_type: str, data: dict[str, Any]) -> None:
+        """Publish an event to all interested subscribers; never blocks the caller."""
+        if not self._subscribers:
+            return
+        event = {
+            "id": next(self._ids),
+            "type": event_type,
+            "timestamp": datetime.utcnow().isoformat(),
+            "data": data,
+        }
+        loop = self._loop
+        if loop is None or threading.get_ident() == self._loop_thread:
+            self._deliver(event)
+            return
+        try:
+            loop.call_soon_threadsafe(self._deliver, event)
+        except RuntimeError:  # loop closed during shutdown
+            logger.debug("Event loop closed; dropping %s event", event_type)
+
+    def _deliver(self, event: dict) -> None:
+        for sub in list(self._subscribers):
+            if sub.wants(event["type"]):
+                sub._push(event)
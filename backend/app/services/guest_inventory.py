@@ -0,0 +1,274 @@
+"""Bulk guest (VM/LXC) inventory for VM-level checks: network segmentation and resource limits."""
+
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_NIC_KEY = re.compile(r"^net\d+$")
+
+# /cluster/resources fields that change whenever a guest is reconfigured in a way we can see
+# without fetching its config (resize, rename, template conversion, migration, lock).
+_MARKER_FIELDS = ("node", "name", "maxcpu", "maxmem", "maxdisk", "template", "lock", "tags")
+
+
+@dataclass(frozen=True)
+class GuestFindings:
+    """Evaluated security-relevant settings of one guest."""
+
+    vmid: int
+    node: str
+    guest_type: str
+    name: str
+    digest: str
+    vlan_tagged: bool
+    firewall: bool
+    resource_limits: bool
+    issues: tuple[str, ...] = ()
+
+    @property
+    def segmented(self) -> bool:
+        return self.vlan_tagged and self.firewall
+
+
+def _parse_nic(value: str) -> dict[str, str]:
+    """Parse "virtio=AA:BB..,bridge=vmbr0,firewall=1,tag=20" into a dict."""
+    parts: dict[str, str] = {}
+    for item in str(value).split(","):
+        key, _, val = item.partition("=")
+        parts[key.strip()] = val.strip()
+    return parts
+
+
+def evaluate_guest_config(vmid: int, node: str, guest_type: str, config: dict) -> GuestFindings:
+    """
+    Evaluate a guest config (GET /nodes/{node}/{qemu|lxc}/{vmid}/config).
+
+    Segmentation: every NIC has a VLAN tag and firewall=1 (guests without NICs pass).
+    Resource limits: CPU (cores or cpulimit) and memory are set explicitly.
+    """
+    issues: list[str] = []
+    nics = {k: _parse_nic(v) for k, v in config.items() if _NIC_KEY.match(k)}
+    untagged = sorted(k for k, nic in nics.items() if not nic.get("tag"))
+    unfirewalled = sorted(k for k, nic in nics.items() if nic.get("firewall") != "1")
+    if untagged:
+        issues.append(f"no VLAN tag on {', '.join(untagged)}")
+    if unfirewalled:
+        issues.append(f"firewall disabled on {', '.join(unfirewalled)}")
+
+    has_cpu_limit = bool(config.get("cores") or config.get("cpulimit"))
+    has_memory_limit = bool(config.get("memory"))
+    if not has_cpu_limit:
+        issues.append("no CPU limit (cores/cpulimit)")
+    if not has_memory_limit:
+        issues.append("no memory limit")
+
+    return GuestFindings(
+        vmid=vmid,
+        node=node,
+        guest_type=guest_type,
+        name=str(config.get("name") or config.get("hostname") or vmid),
+        digest=str(config.get("digest", "")),
+        vlan_tagged=not untagged,
+        firewall=not unfirewalled,
+        resource_limits=has_cpu_limit and has_memory_limit,
+        issues=tuple(issues),
+    )
+
+
+@dataclass
+class _Entry:
+    marker: tuple
+    fetched_at: float
+    findings: GuestFindings
+
+
+@dataclass
+class RefreshStats:
+    """Outcome of one inventory refresh (for logging and diagnostics)."""
+
+    guests: int = 0
+    fetched: int = 0
+    reused: int = 0
+    removed: int = 0
+    errors: list[str] = field(default_factory=list)
+    duration_ms: float = 0.0
+
+
+class GuestInventory:
+    """
+    Cluster-wide guest inventory built from one /cluster/resources call.
+
+    Guest configs are fetched in parallel (at most max_workers at once) only for guests that are
+    new, whose /cluster/resources marker changed, or whose config is older than max_config_age;
+    all other guests reuse their cached findings. /cluster/resources carries no config digest,
+    so the digest returned with each fetched config is kept to skip re-evaluation and report
+    real changes. refresh_interval bounds how often the cluster is listed: a fleet audit calling
+    node_findings() for every node triggers a single refresh.
+
+    Edits that leave the marker unchanged (NIC VLAN tag, NIC firewall flag, cpulimit) are only
+    picked up once the cached config is older than max_config_age, so VM findings may lag such
+    edits by up to max_config_age + refresh_interval. refresh(node_id) re-fetches every guest
+    config on one node immediately (used to verify a remediation).
+    """
+
+    def __init__(
+        self,
+        api: Callable[[], Any],
+        max_workers: int = 8,
+        refresh_interval_seconds: float = 60.0,
+        max_config_age_seconds: float = 3600.0,
+    ) -> None:
+        """
+        Args:
+            api: Returns a connected proxmoxer ProxmoxAPI (called on each refresh).
+            max_workers: Concurrency cap for per-guest config fetches.
+            refresh_interval_seconds: Minimum time between /cluster/resources listings.
+            max_config_age_seconds: Re-fetch unchanged guests' configs after this long.
+        """
+        self._api = api
+        self._max_workers = max(1, max_workers)
+        self._refresh_interval = refresh_interval_seconds
+        self._max_config_age = max_config_age_seconds
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, int], _Entry] = {}
+        self._failed: dict[tuple[str, int], tuple[str, str]] = {}  # (type, vmid) -> (node, error)
+        self._refreshed_at: Optional[float] = None
+        self.last_stats = RefreshStats()
+
+    def node_findings(self, node_id: str) -> list[GuestFindings]:
+        """Findings for the readable guests on node_id, refreshing the inventory if it is due."""
+        with self._lock:
+            self._refresh_if_due()
+            return [e.findings for e in self._entries.values() if e.findings.node == node_id]
+
+    def node_unreadable(self, node_id: str) -> dict[str, str]:
+        """"type/vmid" -> error for guests on node_id whose config could not be fetched in the last refresh."""
+        with self._lock:
+            self._refresh_if_due()
+            return {
+                f"{guest_type}/{vmid}": error
+                for (guest_type, vmid), (node, error) in sorted(self._failed.items())
+                if node == node_id
+            }
+
+    def node_vmids(self, node_id: str) -> list[int]:
+        """VMIDs of all guests on node_id, readable or not."""
+        with self._lock:
+            self._refresh_if_due()
+            vmids = {e.findings.vmid for e in self._entries.values() if e.findings.node == node_id}
+            vmids.update(vmid for (_, vmid), (node, _) in self._failed.items() if node == node_id)
+            return sorted(vmids)
+
+    def _refresh_if_due(self) -> None:
+        if self._refreshed_at is None or time.monotonic() - self._refreshed_at >= self._refresh_interval:
+            self._refresh_locked()
+
+    def refresh(self, node_id: Optional[str] = None) -> RefreshStats:
+        """Force a refresh now; with node_id, also re-fetch every guest config on that node."""
+        with self._lock:
+            return self._refresh_locked(force_node=node_id)
+
+    def _refresh_locked(self, force_node: Optional[str] = None) -> RefreshStats:
+        start = time.perf_counter()
+        px = self._api()
+        resources = px.cluster.resources.get(type="vm")
+        stats = RefreshStats()
+        now = time.monotonic()
+        current: dict[tuple[str, int], tuple] = {}
+        to_fetch: list[tuple[str, int, str, tuple]] = []
+        for res in resources if isinstance(resources, list) else []:
+            guest_type = res.get("type")
+            if guest_type not in ("qemu", "lxc") or res.get("template"):
+                continue
+            vmid = int(res["vmid"])
+            key = (guest_type, vmid)
+            marker = tuple(res.get(f) for f in _MARKER_FIELDS)
+            current[key] = marker
+            entry = self._entries.get(key)
+            if (
+                entry is None or entry.marker != marker or res.get("node") == force_node
+                or now - entry.fetched_at >= self._max_config_age
+            ):
+                to_fetch.append((res["node"], vmid, guest_type, marker))
+            else:
+                stats.reused += 1
+
+        def fetch(item: tuple[str, int, str, tuple]) -> tuple[tuple[str, int], Optional[_Entry], Optional[str]]:
+            node, vmid, guest_type, marker = item
+            try:
+                config = getattr(px.nodes(node), guest_type)(vmid).config.get()
+            except Exception as e:
+                return (guest_type, vmid), None, f"{node}:{e}"
+            previous = self._entries.get((guest_type, vmid))
+            if previous is not None and previous.findings.node == node and config.get("digest") and \
+                    config.get("digest") == previous.findings.digest:
+                findings = previous.findings
+            else:
+                findings = evaluate_guest_config(vmid, node, guest_type, config or {})
+            return (guest_type, vmid), _Entry(marker, now, findings), None
+
+        if to_fetch:
+            with ThreadPoolExecutor(max_workers=min(self._max_workers, len(to_fetch))) as pool:
+                for key, entry, error in pool.map(fetch, to_fetch):
+                    if entry is not None:
+                        self._entries[key] = entry
+                        self._failed.pop(key, None)
+                        stats.fetched += 1
+                    else:
+                        # Unreadable (e.g. missing VM.Audit): never evaluate it from stale or absent findings
+                        node, _, message = error.partition(":")
+                        self._entries.pop(key, None)
+                        self._failed[key] = (node, message)
+                        stats.errors.append(f"{key[0]}/{key[1]}: {message}")
+
+        for key in [k for k in self._entries if k not in current]:
+            del self._entries[key]
+            stats.removed += 1
+        for key in [k for k in self._failed if k not in current]:
+            del self._failed[key]
+        stats.guests = len(current)
+        stats.duration_ms = round((time.perf_counter() - start) * 1000, 2)
+        self._refreshed_at = now
+        self.last_stats = stats
+        if stats.errors:
+            logger.warning("Guest inventory: %d config fetches failed (e.g. %s)", len(stats.errors), stats.errors[0])
+        logger.debug(
+            "Guest inventory refreshed: %d guests, %d fetched, %d reused, %d removed in %.1f ms",
+            stats.guests, stats.fetched, stats.reused, stats.removed, stats.duration_ms,
+        )
+        return stats
+
+
+def summarize_node_guests(
+    findings: list[GuestFindings], unreadable: Optional[dict[str, str]] = None
+) -> dict[str, Any]:
+    """
+    Map per-guest findings to the node config keys used by the VM-level validators.
+
+    Guests whose config could not be read ("type/vmid" -> error) make the summary incomplete:
+    both VM-level keys are False and vm_inventory_error is set, so the checks cannot pass.
+    """
+    summary: dict[str, Any] = {
+        "vm_network_segmentation": all(f.segmented for f in findings),
+        "vm_resource_limits": all(f.resource_limits for f in findings),
+        "vm_guest_count": len(findings) + len(unreadable or {}),
+        "vm_guest_issues": {
+            f"{f.guest_type}/{f.vmid}": list(f.issues) for f in findings if f.issues
+        },
+        "vm_inventory_error": None,
+    }
+    if unreadable:
+        guest, error = next(iter(unreadable.items()))
+        summary.update({
+            "vm_network_segmentation": False,
+            "vm_resource_limits": False,
+            "vm_guest_unreadable": dict(unreadable),
+            "vm_inventory_error": f"{len(unreadable)} guest config(s) unreadable (e.g. {guest}: {error})",
+        })
+    return summary
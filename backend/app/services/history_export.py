@@ -0,0 +1,235 @@
+"""Audit history log and streaming bulk export (CSV, NDJSON, Parquet, Arrow IPC) for BI tools."""
+
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from app.core.serialization import dumps
+from app.models.check import NodeAuditResult
+from app.services.state_backend import MemoryStateBackend, StateBackend
+
+KEY_AUDIT_LOG = "audit:log"
+
+LEVELS = ("node", "check")
+FORMATS = ("csv", "ndjson", "parquet", "arrow")
+MEDIA_TYPES = {
+    "csv": "text/csv",  # Starlette appends "; charset=utf-8" to text/* media types
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+NODE_COLUMNS = (
+    "timestamp", "node_id", "customer_id", "compliance_score",
+    "passed_checks", "failed_checks", "error_checks", "source",
+)
+CHECK_COLUMNS = ("timestamp", "node_id", "customer_id", "check_id", "category", "severity", "status", "duration_ms")
+
+Row = tuple  # values in NODE_COLUMNS / CHECK_COLUMNS order; timestamp is epoch seconds (UTC)
+
+
+def _get_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401 - registers pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        return None
+
+
+def _epoch(dt: datetime) -> float:
+    """Epoch seconds of a datetime; naive values are UTC (NodeAuditResult.timestamp)."""
+    return (dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)).timestamp()
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _with_iso_timestamps(batch: list[Row]) -> Iterator[Row]:
+    """Rows with the epoch replaced by ISO 8601; consecutive rows of one audit share the formatted value."""
+    last_epoch, last_iso = None, ""
+    for row in batch:
+        if row[0] != last_epoch:
+            last_epoch, last_iso = row[0], _iso(row[0])
+        yield (last_iso,) + row[1:]
+
+
+class AuditHistoryLog:
+    """
+    Bounded append-only log of every completed node audit (score, counts and per-check status)
+    in the StateBackend, so history survives restarts with SQLite/Redis and is shared by workers.
+    Entries are compact JSON; check metadata is joined from the catalog at export time.
+    """
+
+    def __init__(self, backend: StateBackend | None = None, max_entries: int = 100000) -> None:
+        self._backend = backend or MemoryStateBackend()
+        self._max_entries = max_entries
+
+    def record(self, result: NodeAuditResult) -> None:
+        entry = {
+            "t": _epoch(result.timestamp),
+            "n": result.node_id,
+            "s": result.compliance_score,
+            "p": result.passed_checks,
+            "f": result.failed_checks,
+            "e": result.error_checks,
+            "c": [[r.check_id, r.status, r.duration_ms] for r in result.check_results],
+        }
+        self._backend.list_append(KEY_AUDIT_LOG, json.dumps(entry).encode("utf-8"), self._max_entries)
+
+    def entries(
+        self, node_ids: Optional[set[str]] = None, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Iterator[dict[str, Any]]:
+        """Yield log entries (oldest first) matching the node set and [start, end] epoch range."""
+        for raw in self._backend.list_iter(KEY_AUDIT_LOG):
+            entry = json.loads(raw)
+            if node_ids is not None and entry["n"] not in node_ids:
+                continue
+            if (start is not None and entry["t"] < start) or (end is not None and entry["t"] > end):
+                continue
+            yield entry
+
+
+def iter_node_rows(
+    log: AuditHistoryLog,
+    provider_history: Iterable[tuple[str, list[dict]]],
+    resolve_customer: Callable[[str], str],
+    node_ids: Optional[set[str]] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> Iterator[Row]:
+    """
+    One row per node data point: the provider's daily trend (source=history, no check counts)
+    followed by every recorded audit (source=audit).
+    """
+    for node_id, points in provider_history:
+        customer = resolve_customer(node_id)
+        for point in points:
+            ts = _epoch(datetime.strptime(point["date"], "%Y-%m-%d"))
+            if (start is None or ts >= start) and (end is None or ts <= end):
+                yield (ts, node_id, customer, point["compliance_score"], None, None, None, "history")
+    for entry in log.entries(node_ids, start, end):
+        node_id = entry["n"]
+        yield (entry["t"], node_id, resolve_customer(node_id), entry["s"], entry["p"], entry["f"], entry["e"], "audit")
+
+
+def iter_check_rows(
+    log: AuditHistoryLog,
+    check_meta: dict[str, tuple[str, str]],
+    resolve_customer: Callable[[str], str],
+    node_ids: Optional[set[str]] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> Iterator[Row]:
+    """One row per check outcome of every recorded audit; check_meta maps check_id -> (category, severity)."""
+    for entry in log.entries(node_ids, start, end):
+        node_id = entry["n"]
+        customer = resolve_customer(node_id)
+        for check_id, status, duration_ms in entry["c"]:
+            category, severity = check_meta.get(check_id, (None, None))
+            yield (entry["t"], node_id, customer, check_id, category, severity, status, duration_ms)
+
+
+def _batches(rows: Iterable[Row], size: int) -> Iterator[list[Row]]:
+    batch: list[Row] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def encode_csv(rows: Iterable[Row], columns: tuple[str, ...], batch_rows: int = 5000) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(columns)
+    for batch in _batches(rows, batch_rows):
+        writer.writerows(_with_iso_timestamps(batch))
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def encode_ndjson(rows: Iterable[Row], columns: tuple[str, ...], batch_rows: int = 5000) -> Iterator[bytes]:
+    for batch in _batches(rows, batch_rows):
+        yield b"".join(dumps(dict(zip(columns, r))) + b"\n" for r in _with_iso_timestamps(batch))
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file collecting bytes between flushes (pyarrow writers stream into it)."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def take(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def _arrow_schema(pa, columns: tuple[str, ...]):
+    types = {
+        "timestamp": pa.timestamp("ms", tz="UTC"),
+        "compliance_score": pa.int32(),
+        "passed_checks": pa.int32(),
+        "failed_checks": pa.int32(),
+        "error_checks": pa.int32(),
+        "duration_ms": pa.float64(),
+    }
+    return pa.schema([(c, types.get(c, pa.string())) for c in columns])
+
+
+def encode_arrow(
+    rows: Iterable[Row], columns: tuple[str, ...], batch_rows: int = 50000, parquet: bool = False
+) -> Iterator[bytes]:
+    """Parquet (one row group per batch) or Arrow IPC stream (one record batch per batch)."""
+    pa = _get_pyarrow()
+    schema = _arrow_schema(pa, columns)
+    sink = _ChunkSink()
+    writer = pa.parquet.ParquetWriter(sink, schema) if parquet else pa.ipc.new_stream(sink, schema)
+    for batch in _batches(rows, batch_rows):
+        arrays = [list(col) for col in zip(*batch)]
+        arrays[0] = [int(ts * 1000) for ts in arrays[0]]
+        table = pa.Table.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(arrays, schema)], schema=schema
+        )
+        writer.write_table(table)
+        yield sink.take()
+    writer.close()
+    yield sink.take()
+
+
+def check_export_format(fmt: str) -> None:
+    """Raise ValueError for unknown formats or columnar formats without pyarrow installed."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt} (choose from {', '.join(FORMATS)})")
+    if fmt in ("parquet", "arrow") and _get_pyarrow() is None:
+        raise ValueError(f"Export format {fmt} requires pyarrow; pip install pyarrow")
+
+
+def encode_rows(rows: Iterable[Row], level: str, fmt: str) -> Iterator[bytes]:
+    """Encode rows of the given level lazily, in bounded batches, as fmt."""
+    columns = NODE_COLUMNS if level == "node" else CHECK_COLUMNS
+    if fmt == "csv":
+        return encode_csv(rows, columns)
+    if fmt == "ndjson":
+        return encode_ndjson(rows, columns)
+    return encode_arrow(rows, columns, parquet=fmt == "parquet")
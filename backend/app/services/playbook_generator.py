@@ -0,0 +1,172 @@
+"""Consolidated fleet remediation playbook and inventory from per-check Ansible snippets."""
+
+import re
+from typing import Any, Callable, Iterable, Optional
+
+import yaml
+
+from app.models.automation import PlaybookGroup, RemediationPlaybook
+from app.models.check import NodeAuditResult
+
+PLAY_GROUP = "proxsecure_remediation"
+CHECKS_VAR = "remediation_checks"
+PRIORITY_ORDER = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
+
+# Defaults for variables used by the built-in remediation snippets (overridable per host).
+DEFAULT_HOST_VARS: dict[str, Any] = {
+    "proxmox_firewall_service": "pve-firewall",
+    "proxmox_user": "root",
+}
+
+_VARIABLE = re.compile(r"{{\s*([A-Za-z_][A-Za-z0-9_]*)\s*}}")
+_RESTART = re.compile(r"^restart (\S+)$")
+
+
+def extract_variables(snippet: str) -> set[str]:
+    """Template variables referenced by a snippet (Ansible facts excluded)."""
+    return {v for v in _VARIABLE.findall(snippet) if not v.startswith("ansible_")}
+
+
+def host_var_resolver(
+    host_vars: Optional[dict[str, dict[str, Any]]] = None,
+    host_map: Optional[dict[str, str]] = None,
+    proxmox_host: str = "",
+) -> Callable[[str], dict[str, Any]]:
+    """
+    Return node_id -> host variables: DEFAULT_HOST_VARS, then ansible_host (SSH_HOST_MAP) and
+    proxmox_host, then ANSIBLE_HOST_VARS["*"], then ANSIBLE_HOST_VARS[node_id].
+    """
+    host_vars = host_vars or {}
+    host_map = host_map or {}
+
+    def resolve(node_id: str) -> dict[str, Any]:
+        values = dict(DEFAULT_HOST_VARS)
+        if node_id in host_map:
+            values["ansible_host"] = host_map[node_id]
+        values["proxmox_host"] = proxmox_host or host_map.get(node_id, node_id)
+        values.update(host_vars.get("*", {}))
+        values.update(host_vars.get(node_id, {}))
+        return values
+
+    return resolve
+
+
+def _task_condition(check_id: str) -> str:
+    return f"'{check_id}' in {CHECKS_VAR}"
+
+
+def parse_tasks(snippet: str) -> list[dict[str, Any]]:
+    """Parse a remediation snippet (a task or list of tasks) into task dicts."""
+    tasks = yaml.safe_load(snippet) or []
+    return [dict(t) for t in ([tasks] if isinstance(tasks, dict) else tasks)]
+
+
+def dump_tasks(tasks: list[dict[str, Any]]) -> str:
+    return yaml.safe_dump(tasks, sort_keys=False, width=120)
+
+
+def notified_handlers(tasks: list[dict[str, Any]]) -> list[str]:
+    """Distinct handler names notified by the tasks, in first-notified order."""
+    names: list[str] = []
+    for task in tasks:
+        notify = task.get("notify") or []
+        for name in [notify] if isinstance(notify, str) else notify:
+            if name not in names:
+                names.append(name)
+    return names
+
+
+def handler_task(name: str) -> Optional[dict[str, Any]]:
+    """Task implementing a `restart <service>` handler (systemd restart), None for other names."""
+    match = _RESTART.match(name)
+    if match is None:
+        return None
+    return {"name": name, "ansible.builtin.systemd": {"name": match.group(1), "state": "restarted"}}
+
+
+def _guarded_tasks(check_id: str, snippet: str) -> list[dict[str, Any]]:
+    """Parse a snippet into tasks that only run on hosts whose group lists check_id as failing."""
+    guarded = []
+    for task in parse_tasks(snippet):
+        existing = task.pop("when", None)
+        conditions = [_task_condition(check_id)]
+        if isinstance(existing, list):
+            conditions += existing
+        elif existing:
+            conditions.append(existing)
+        task["when"] = conditions if len(conditions) > 1 else conditions[0]
+        task.setdefault("tags", [check_id])
+        guarded.append(task)
+    return guarded
+
+
+def generate_playbook(
+    results: Iterable[NodeAuditResult],
+    resolve_host_vars: Callable[[str], dict[str, Any]],
+    check_ids: Optional[set[str]] = None,
+) -> RemediationPlaybook:
+    """
+    Build one playbook plus inventory covering every failed check with a remediation.
+
+    Hosts with the same set of failing checks form one inventory group (group var
+    remediation_checks); each check's tasks appear once in the play, guarded by
+    `'<check_id>' in remediation_checks`. Template variables stay as Jinja expressions and are
+    supplied per host as inventory host vars; variables without a value are reported.
+
+    Args:
+        results: Node audit results (e.g. a customer's nodes or the whole fleet).
+        resolve_host_vars: node_id -> variables for that host (see host_var_resolver).
+        check_ids: Only remediate these checks (default: every failed check).
+    """
+    snippets: dict[str, tuple[str, str]] = {}  # check_id -> (priority, snippet)
+    groups: dict[frozenset[str], list[str]] = {}
+    for result in results:
+        failing = []
+        for r in result.check_results:
+            if r.status != "FAIL" or r.remediation is None or (check_ids and r.check_id not in check_ids):
+                continue
+            failing.append(r.check_id)
+            snippets.setdefault(r.check_id, (r.remediation.priority.upper(), r.remediation.ansible_snippet))
+        if failing:
+            groups.setdefault(frozenset(failing), []).append(result.node_id)
+
+    ordered_checks = sorted(snippets, key=lambda c: (PRIORITY_ORDER.get(snippets[c][0], 1), c))
+    tasks = [task for c in ordered_checks for task in _guarded_tasks(c, snippets[c][1])]
+    variables = {c: extract_variables(snippets[c][1]) for c in ordered_checks}
+
+    children: dict[str, Any] = {}
+    playbook_groups: list[PlaybookGroup] = []
+    unresolved: dict[str, list[str]] = {}
+    ranked = sorted(groups.items(), key=lambda item: (-len(item[1]), sorted(item[0])))
+    for index, (failing, hosts) in enumerate(ranked, start=1):
+        name = f"remediation_{index:03d}"
+        group_checks = [c for c in ordered_checks if c in failing]
+        needed = set().union(*(variables[c] for c in group_checks))
+        host_entries: dict[str, Any] = {}
+        for node_id in sorted(hosts):
+            values = resolve_host_vars(node_id)
+            missing = sorted(v for v in needed if v not in values)
+            if missing:
+                unresolved[node_id] = missing
+            host_entries[node_id] = {k: v for k, v in values.items() if k in needed or k == "ansible_host"} or None
+        children[name] = {"hosts": host_entries, "vars": {CHECKS_VAR: group_checks}}
+        playbook_groups.append(PlaybookGroup(name=name, check_ids=group_checks, hosts=sorted(hosts)))
+
+    play: dict[str, Any] = {
+        "name": "ProxSecure consolidated remediation",
+        "hosts": PLAY_GROUP,
+        "become": True,
+        "tasks": tasks,
+    }
+    handlers = [h for h in map(handler_task, notified_handlers(tasks)) if h is not None]
+    if handlers:
+        play["handlers"] = handlers
+    inventory = {"all": {"children": {PLAY_GROUP: {"children": children}}}}
+    return RemediationPlaybook(
+        playbook=yaml.safe_dump([play], sort_keys=False, width=120) if tasks else "",
+        inventory=yaml.safe_dump(inventory, sort_keys=False, width=120) if children else "",
+        groups=playbook_groups,
+        host_count=sum(len(g.hosts) for g in playbook_groups),
+        task_count=len(tasks),
+        unresolved_variables=unresolved,
+    )
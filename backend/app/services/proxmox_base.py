@@ -1,6 +1,6 @@
 """Proxmox service abstraction: protocol for mock, real, and hybrid implementations."""
 
-from typing import Protocol, runtime_checkable
+from typing import Callable, Protocol, runtime_checkable
 
 
 @runtime_checkable
@@ -50,13 +50,16 @@ class ProxmoxServiceProtocol(Protocol):
         """
         ...
 
-    def execute_remediation(self, node_id: str, ansible_snippet: str) -> dict | None:
+    def execute_remediation(
+        self, node_id: str, ansible_snippet: str, on_output: Callable[[str, str], None] | None = None
+    ) -> dict | None:
         """
         Optional: Execute remediation (e.g. apply Ansible snippet) on the node.
 
         Args:
             node_id: Target node identifier.
             ansible_snippet: Ansible playbook/task snippet to execute.
+            on_output: Optional callback(stream, line) receiving stdout/stderr lines as they are produced.
 
         Returns:
             Result dict (e.g. status, output, error) or None if not supported.
@@ -1,7 +1,7 @@
 """Hybrid Proxmox service: routes requests to mock or real by node_id."""
 
 import logging
-from typing import Any
+from typing import Any, Callable
 
 from app.services.proxmox_base import ProxmoxServiceProtocol
 from app.services.proxmox_mock import ProxmoxMockService
@@ -27,6 +27,13 @@ class ProxmoxHybridService:
             return self._real
         return self._mock
 
+    def clusters(self) -> dict[str, ProxmoxServiceProtocol]:
+        """Return underlying providers by cluster name ("mock" and the real host) for monitoring."""
+        clusters: dict[str, ProxmoxServiceProtocol] = {"mock": self._mock}
+        if self._real:
+            clusters[self._real.host] = self._real
+        return clusters
+
     def get_all_nodes(self) -> list[str]:
         """Merge node lists from mock and real (deduplicated)."""
         nodes: set[str] = set()
@@ -43,14 +50,31 @@ class ProxmoxHybridService:
         svc = self._service_for(node_id)
         return svc.get_node_config(node_id)
 
+    def prefetch_node_configs(self, node_ids: list[str]) -> None:
+        """Prefetch host facts for nodes served by the real service."""
+        if self._real:
+            self._real.prefetch_node_configs([n for n in node_ids if self._service_for(n) is self._real])
+
+    def get_node_config_keys(self, node_id: str, keys: list[str], force: bool = False) -> dict:
+        """Route to mock or real based on hybrid config."""
+        svc = self._service_for(node_id)
+        fetch = getattr(svc, "get_node_config_keys", None)
+        return fetch(node_id, keys, force=force) if fetch is not None else svc.get_node_config(node_id)
+
+    def close(self) -> None:
+        if self._real:
+            self._real.close()
+
     def get_node_history(self, node_id: str) -> list[dict]:
         """Route to mock or real based on hybrid config."""
         svc = self._service_for(node_id)
         return svc.get_node_history(node_id)
 
-    def execute_remediation(self, node_id: str, ansible_snippet: str) -> dict | None:
+    def execute_remediation(
+        self, node_id: str, ansible_snippet: str, on_output: Callable[[str, str], None] | None = None
+    ) -> dict | None:
         """Route to mock or real based on hybrid config."""
         svc = self._service_for(node_id)
         if hasattr(svc, "execute_remediation"):
-            return svc.execute_remediation(node_id, ansible_snippet)
+            return svc.execute_remediation(node_id, ansible_snippet, on_output=on_output)
         return None
@@ -1,6 +1,8 @@
 """Mock Proxmox data provider for PoC testing without real Proxmox API."""
 
 import logging
+import re
+from typing import Callable
 
 from app.data.mock_data import MOCK_HISTORY, MOCK_NODES
 from app.services.proxmox_base import ProxmoxServiceProtocol
@@ -42,6 +44,11 @@ class ProxmoxMockService:
             raise ValueError(f"Node not found: {node_id}")
         return MOCK_NODES[node_id].copy()
 
+    def get_node_config_keys(self, node_id: str, keys: list[str], force: bool = False) -> dict:
+        """Return only the given keys of the node configuration (targeted re-fetch; nothing is cached)."""
+        config = self.get_node_config(node_id)
+        return {k: config[k] for k in keys if k in config}
+
     def get_node_history(self, node_id: str) -> list[dict]:
         """
         Return historical trend data for a node (e.g. 30-day compliance trajectory).
@@ -59,10 +66,16 @@ class ProxmoxMockService:
             raise ValueError(f"Node not found: {node_id}")
         return list(MOCK_HISTORY[node_id])
 
-    def execute_remediation(self, node_id: str, ansible_snippet: str) -> dict | None:
-        """Stub: log but do not execute. Returns None for mock (no real execution)."""
+    def execute_remediation(
+        self, node_id: str, ansible_snippet: str, on_output: Callable[[str, str], None] | None = None
+    ) -> dict | None:
+        """Stub: log but do not execute; reports each task as skipped through on_output."""
         if node_id not in MOCK_NODES:
             raise ValueError(f"Node not found: {node_id}")
+        if on_output is not None:
+            for name in re.findall(r"^\s*- name:\s*(.+)$", ansible_snippet or "", re.MULTILINE):
+                on_output("stdout", f"TASK [{name.strip()}]")
+                on_output("stdout", f"skipping: [{node_id}] (mock mode)")
         logger.info(
             "Mock execute_remediation: node_id=%s, snippet_len=%d (not executed)",
             node_id,
@@ -1,9 +1,13 @@
 """Real Proxmox API service using proxmoxer."""
 
 import logging
-from typing import Any
+from typing import Any, Callable
 
+from app.services.backup_index import BackupIndex, summarize_node_backups
+from app.services.guest_inventory import GuestInventory, summarize_node_guests
+from app.services.log_scanner import LogScanner
 from app.services.proxmox_base import ProxmoxServiceProtocol
+from app.services.ssh_collector import SSHCollector
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +34,13 @@ class ProxmoxRealService:
         token_name: str | None = None,
         token_value: str | None = None,
         verify_ssl: bool = True,
+        guest_fetch_concurrency: int = 8,
+        guest_inventory_refresh_seconds: float = 60.0,
+        guest_config_max_age_seconds: float = 3600.0,
+        ssh_collector: SSHCollector | None = None,
+        backup_listing_max_age_seconds: float = 3600.0,
+        backup_max_age_hours: float = 48.0,
+        log_scanner: LogScanner | None = None,
     ) -> None:
         self._host = host
         self._user = user
@@ -39,6 +50,16 @@ class ProxmoxRealService:
         self._verify_ssl = verify_ssl
         self._proxmox: Any = None
         self._connected = False
+        self._guests = GuestInventory(
+            self._connect,
+            max_workers=guest_fetch_concurrency,
+            refresh_interval_seconds=guest_inventory_refresh_seconds,
+            max_config_age_seconds=guest_config_max_age_seconds,
+        )
+        self._ssh = ssh_collector
+        self._backups = BackupIndex(self._connect, max_listing_age_seconds=backup_listing_max_age_seconds)
+        self._backup_max_age_hours = backup_max_age_hours
+        self._logs = log_scanner
 
     def _connect(self) -> Any:
         if self._proxmox is not None:
@@ -76,11 +97,57 @@ class ProxmoxRealService:
             logger.exception("get_all_nodes failed: %s", e)
             raise
 
+    def get_node_statuses(self) -> dict[str, str]:
+        """Return node ID -> status (online/offline/unknown) from /nodes (used by connectivity monitor)."""
+        px = self._connect()
+        nodes = px.nodes.get()
+        if not isinstance(nodes, list):
+            return {}
+        return {n["node"]: n.get("status", "unknown") for n in nodes}
+
+    @property
+    def host(self) -> str:
+        return self._host
+
+    # Config keys -> source that produces them (targeted re-fetch in get_node_config_keys)
+    _KEY_SOURCES = {
+        "ssh_permit_root_login": "host",
+        "syslog_forwarding": "host",
+        "snmp_configured": "host",
+        "privileged_access_logging": "host",
+        "firewall_enabled": "firewall",
+        "backup_schedule": "backup_jobs",
+        "backup_retention_days": "backup_index",
+        "backup_guests_without_recent_backup": "backup_index",
+        "backup_max_age_hours": "backup_index",
+        "two_factor_enabled": "users",
+        "vm_network_segmentation": "guests",
+        "vm_resource_limits": "guests",
+        "vm_inventory_error": "guests",
+    }
+    _SOURCES = ("host", "firewall", "backup_jobs", "backup_index", "users", "guests")
+    # Sources served from caches (SSH facts, guest inventory) that a forced fetch bypasses
+    _CACHED_SOURCES = ("host", "guests")
+
     def get_node_config(self, node_id: str) -> dict:
         """
         Aggregate config from Proxmox API to match audit engine keys.
         Maps SSH, firewall, backup, 2FA, syslog, SNMP, VM settings where available.
         """
+        return self._fetch_config(node_id, self._SOURCES)
+
+    def get_node_config_keys(self, node_id: str, keys: list[str], force: bool = False) -> dict:
+        """
+        Fetch only the sources that produce `keys` (e.g. firewall options for firewall_enabled)
+        instead of the full config; unknown keys fall back to the full fetch. With force, cached
+        host facts and guest configs are re-read from the node (verifying a remediation).
+        """
+        if any(k not in self._KEY_SOURCES for k in keys):
+            return self._fetch_config(node_id, self._SOURCES, force=force)
+        sources = {self._KEY_SOURCES[k] for k in keys}
+        return self._fetch_config(node_id, tuple(s for s in self._SOURCES if s in sources), force=force)
+
+    def _fetch_config(self, node_id: str, sources: tuple[str, ...], force: bool = False) -> dict:
         try:
             px = self._connect()
         except Exception as e:
@@ -93,52 +160,9 @@ class ProxmoxRealService:
             node_names = [n["node"] for n in nodes] if isinstance(nodes, list) else []
             if node_id not in node_names:
                 raise ValueError(f"Node not found: {node_id}")
-
-            # SSH: try nodes/{node}/config or default
-            try:
-                cfg = px.nodes(node_id).config.get()
-                ssh_val = (cfg or {}).get("sshd", {}).get("PermitRootLogin", "yes")
-                config["ssh_permit_root_login"] = "no" if ssh_val == "0" or ssh_val == "false" else str(ssh_val) if ssh_val else "yes"
-            except Exception:
-                config["ssh_permit_root_login"] = "yes"
-
-            # Firewall: nodes/{node}/firewall/options
-            try:
-                fw = px.nodes(node_id).firewall.options.get()
-                config["firewall_enabled"] = (fw or {}).get("enable", 0) == 1
-            except Exception:
-                config["firewall_enabled"] = False
-
-            # Backup: cluster backup or vzdump
-            try:
-                backups = getattr(px.cluster, "backup", None)
-                if backups:
-                    info = backups.get()
-                    config["backup_schedule"] = (info or {}).get("schedule") or "0 2 * * *"
-                    config["backup_retention_days"] = 7
-                else:
-                    config["backup_schedule"] = "0 2 * * *"
-                    config["backup_retention_days"] = 7
-            except Exception:
-                config["backup_schedule"] = None
-                config["backup_retention_days"] = 0
-
-            # 2FA / users (simplified)
-            try:
-                users = px.access.users.get()
-                config["two_factor_enabled"] = any(
-                    (u.get("realm", "").endswith("pam") and u.get("enable", 1) == 1)
-                    for u in (users if isinstance(users, list) else [])
-                )
-            except Exception:
-                config["two_factor_enabled"] = False
-
-            # Syslog / SNMP: not directly in standard API; use defaults
-            config["syslog_forwarding"] = config.get("syslog_forwarding", False)
-            config["snmp_configured"] = config.get("snmp_configured", False)
-            config["vm_network_segmentation"] = True
-            config["vm_resource_limits"] = True
-            config["privileged_access_logging"] = True
+            for source in sources:
+                kwargs = {"force": True} if force and source in self._CACHED_SOURCES else {}
+                getattr(self, f"_fetch_{source}")(px, node_id, config, **kwargs)
         except ValueError:
             raise
         except Exception as e:
@@ -146,6 +170,112 @@ class ProxmoxRealService:
             raise
         return config
 
+    def _fetch_firewall(self, px: Any, node_id: str, config: dict[str, Any]) -> None:
+        # Firewall: nodes/{node}/firewall/options
+        try:
+            fw = px.nodes(node_id).firewall.options.get()
+            config["firewall_enabled"] = (fw or {}).get("enable", 0) == 1
+        except Exception:
+            config["firewall_enabled"] = False
+
+    def _fetch_backup_jobs(self, px: Any, node_id: str, config: dict[str, Any]) -> None:
+        # Backup: schedule from cluster backup jobs
+        try:
+            jobs = px.cluster.backup.get()
+            jobs = jobs if isinstance(jobs, list) else [jobs] if jobs else []
+            enabled = [j for j in jobs if j.get("enabled", 1)]
+            config["backup_schedule"] = (
+                (enabled[0].get("schedule") or enabled[0].get("starttime")) if enabled else None
+            )
+        except Exception:
+            config["backup_schedule"] = None
+
+    def _fetch_backup_index(self, px: Any, node_id: str, config: dict[str, Any]) -> None:
+        # Backup retention/recency from the vzdump archive index
+        try:
+            vmids = self._guests.node_vmids(node_id)
+            config.update(summarize_node_backups(
+                self._backups.node_backups(node_id),
+                vmids,
+                max_backup_age_hours=self._backup_max_age_hours,
+            ))
+        except Exception as e:
+            logger.warning("Backup index unavailable for %s: %s", node_id, e)
+            config["backup_retention_days"] = 0
+            config["backup_index_error"] = str(e)
+
+    def _fetch_users(self, px: Any, node_id: str, config: dict[str, Any]) -> None:
+        # 2FA / users (simplified)
+        try:
+            users = px.access.users.get()
+            config["two_factor_enabled"] = any(
+                (u.get("realm", "").endswith("pam") and u.get("enable", 1) == 1)
+                for u in (users if isinstance(users, list) else [])
+            )
+        except Exception:
+            config["two_factor_enabled"] = False
+
+    def _fetch_host(self, px: Any, node_id: str, config: dict[str, Any], force: bool = False) -> None:
+        # SSH: try nodes/{node}/config or default
+        try:
+            cfg = px.nodes(node_id).config.get()
+            ssh_val = (cfg or {}).get("sshd", {}).get("PermitRootLogin", "yes")
+            config["ssh_permit_root_login"] = "no" if ssh_val == "0" or ssh_val == "false" else str(ssh_val) if ssh_val else "yes"
+        except Exception:
+            config["ssh_permit_root_login"] = "yes"
+
+        # Syslog / SNMP / auditd / effective sshd config: not in the API; probed over SSH if enabled
+        config["syslog_forwarding"] = config.get("syslog_forwarding", False)
+        config["snmp_configured"] = config.get("snmp_configured", False)
+        config["privileged_access_logging"] = True
+        if self._ssh is not None:
+            try:
+                config.update(self._ssh.collect(node_id, force=force))
+            except Exception as e:
+                logger.warning("SSH probe of %s failed; using API-derived defaults: %s", node_id, e)
+                # auditd state is unknown: fail closed unless log evidence below proves logging
+                config["privileged_access_logging"] = False
+                config["ssh_probe_error"] = str(e)
+        # Log evidence: privileged sessions are actually recorded; configured forwarding is not suspended
+        if self._logs is not None:
+            auditd_verified = (
+                self._ssh is not None and "ssh_probe_error" not in config
+                and config["privileged_access_logging"] is True
+            )
+            forwarding_configured = config["syslog_forwarding"] is True
+            try:
+                logs = self._logs.node_config(node_id)
+                config.update(logs)
+                config["privileged_access_logging"] = logs["privileged_access_logging"] or auditd_verified
+                config["syslog_forwarding"] = forwarding_configured and logs["syslog_forwarding_healthy"]
+            except Exception as e:
+                logger.warning("Log scan of %s failed: %s", node_id, e)
+                config["log_scan_error"] = str(e)
+
+    def _fetch_guests(self, px: Any, node_id: str, config: dict[str, Any], force: bool = False) -> None:
+        # VM-level: VLAN tags, NIC firewall flags and CPU/memory limits of every guest on the node
+        try:
+            if force:
+                self._guests.refresh(node_id)
+            config.update(summarize_node_guests(
+                self._guests.node_findings(node_id), self._guests.node_unreadable(node_id)
+            ))
+        except Exception as e:
+            logger.warning("Guest inventory unavailable for %s: %s", node_id, e)
+            config["vm_network_segmentation"] = False
+            config["vm_resource_limits"] = False
+            config["vm_inventory_error"] = str(e)
+
+    def prefetch_node_configs(self, node_ids: list[str]) -> None:
+        """Probe host facts for node_ids in parallel ahead of a fleet audit (no-op without SSH)."""
+        if self._ssh is not None and node_ids:
+            self._ssh.collect_many(node_ids)
+
+    def close(self) -> None:
+        """Close pooled SSH connections."""
+        if self._ssh is not None:
+            self._ssh.close()
+
     def get_node_history(self, node_id: str) -> list[dict]:
         """No DB: return empty list. Real history would require stored audit results."""
         try:
@@ -158,12 +288,15 @@ class ProxmoxRealService:
             raise
         return []
 
-    def execute_remediation(self, node_id: str, ansible_snippet: str) -> dict | None:
+    def execute_remediation(
+        self, node_id: str, ansible_snippet: str, on_output: Callable[[str, str], None] | None = None
+    ) -> dict | None:
         """Execute via Proxmox API (e.g. run command in node context) if supported."""
         try:
             px = self._connect()
             # Proxmox allows executing commands; exact API depends on target (VM vs host)
             # Stub: log and return success for PoC; real impl would call nodes(node).task or similar
+            # and forward the task log lines to on_output as they arrive
             logger.info(
                 "Real execute_remediation: node_id=%s, snippet_len=%d (API execution not fully implemented)",
                 node_id,
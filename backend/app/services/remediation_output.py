@@ -0,0 +1,79 @@
+"""Bounded in-memory output buffers of running and recent remediation runs (live streaming)."""
+
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Optional
+
+STREAM_EXIT = "exit"  # last entry of a run; line holds the final status
+
+
+class OutputBuffer:
+    """
+    Ring buffer of one run's (execution or plan) output lines, numbered by seq. When full the
+    oldest lines are dropped; subscribers replay what is left and follow newer lines by seq.
+    """
+
+    def __init__(self, run_id: str, max_lines: int = 1000) -> None:
+        self.run_id = run_id
+        self._lines: deque[dict[str, Any]] = deque(maxlen=max(1, max_lines))
+        self._lock = threading.Lock()
+        self._seq = 0
+        self.dropped = 0
+        self.status: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status is not None
+
+    def append(self, execution_id: str, check_id: str, stream: str, line: str) -> dict[str, Any]:
+        """Add a line (stream: stdout | stderr | status | exit) and return its event data."""
+        with self._lock:
+            self._seq += 1
+            entry = {
+                "run_id": self.run_id,
+                "execution_id": execution_id,
+                "check_id": check_id,
+                "seq": self._seq,
+                "stream": stream,
+                "line": line,
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+            if len(self._lines) == self._lines.maxlen:
+                self.dropped += 1
+            self._lines.append(entry)
+            return entry
+
+    def finish(self, execution_id: str, check_id: str, status: str) -> dict[str, Any]:
+        """Mark the run complete; appends the exit entry."""
+        entry = self.append(execution_id, check_id, STREAM_EXIT, status)
+        self.status = status
+        return entry
+
+    def snapshot(self, after_seq: int = 0) -> list[dict[str, Any]]:
+        """Buffered entries with seq > after_seq, oldest first."""
+        with self._lock:
+            return [e for e in self._lines if e["seq"] > after_seq]
+
+
+class OutputStore:
+    """Output buffers by run_id; beyond max_runs the oldest finished runs are forgotten."""
+
+    def __init__(self, max_runs: int = 256, max_lines: int = 1000) -> None:
+        self._max_runs = max(1, max_runs)
+        self.max_lines = max_lines
+        self._runs: OrderedDict[str, OutputBuffer] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, run_id: str) -> OutputBuffer:
+        buffer = OutputBuffer(run_id, self.max_lines)
+        with self._lock:
+            self._runs[run_id] = buffer
+            excess = len(self._runs) - self._max_runs
+            for old_id in [r for r, b in self._runs.items() if b.finished][: max(0, excess)]:
+                del self._runs[old_id]
+        return buffer
+
+    def get(self, run_id: str) -> Optional[OutputBuffer]:
+        with self._lock:
+            return self._runs.get(run_id)
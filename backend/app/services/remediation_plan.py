@@ -0,0 +1,134 @@
+"""Dependency-ordered remediation of a node: a DAG of per-check steps with handlers run once."""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional, TypeVar
+
+from app.models.check import NodeAuditResult
+from app.services.playbook_generator import dump_tasks, notified_handlers, parse_tasks
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class RemediationStep:
+    """One check's remediation; snippet has its notify entries moved to `notify` (run once per node)."""
+
+    check_id: str
+    snippet: str
+    run_after: tuple[str, ...] = ()
+    notify: tuple[str, ...] = ()
+
+
+def plan_step(check_id: str, snippet: str, run_after: Iterable[str] = ()) -> RemediationStep:
+    """Build a step, lifting `notify:` out of the snippet's tasks."""
+    tasks = parse_tasks(snippet)
+    notify = notified_handlers(tasks)
+    if notify:
+        for task in tasks:
+            task.pop("notify", None)
+        snippet = dump_tasks(tasks)
+    return RemediationStep(check_id=check_id, snippet=snippet, run_after=tuple(run_after), notify=tuple(notify))
+
+
+def node_steps(
+    result: NodeAuditResult, run_after: dict[str, list[str]], check_ids: Optional[list[str]] = None
+) -> list[RemediationStep]:
+    """
+    Steps for the failed checks (with a remediation) of a node audit, in check order.
+
+    Raises:
+        ValueError: If a requested check is not failing or has no remediation on the node.
+    """
+    failing = {r.check_id: r for r in result.check_results if r.status == "FAIL" and r.remediation}
+    for check_id in check_ids or []:
+        if check_id not in failing:
+            raise ValueError(f"Check {check_id} not found or has no remediation for node {result.node_id}")
+    selected = [c for c in failing if not check_ids or c in check_ids]
+    return [plan_step(c, failing[c].remediation.ansible_snippet, run_after.get(c, ())) for c in selected]
+
+
+def _dependencies(steps: list[RemediationStep]) -> dict[str, list[str]]:
+    """check_id -> run_after hints restricted to checks in the plan."""
+    ids = {s.check_id for s in steps}
+    return {s.check_id: [d for d in s.run_after if d in ids and d != s.check_id] for s in steps}
+
+
+def plan_stages(steps: list[RemediationStep]) -> list[list[str]]:
+    """
+    Group check IDs by dependency depth (Kahn's algorithm); steps within a stage are independent.
+
+    Raises:
+        ValueError: If the run_after hints form a cycle.
+    """
+    deps = _dependencies(steps)
+    remaining = {c: set(d) for c, d in deps.items()}
+    stages: list[list[str]] = []
+    while remaining:
+        stage = [c for c in deps if c in remaining and not remaining[c]]
+        if not stage:
+            raise ValueError(f"Remediation dependency cycle between: {', '.join(sorted(remaining))}")
+        stages.append(stage)
+        for c in stage:
+            del remaining[c]
+        for pending in remaining.values():
+            pending.difference_update(stage)
+    return stages
+
+
+def run_dag(
+    steps: list[RemediationStep],
+    run: Callable[[RemediationStep], T],
+    ok: Callable[[T], bool],
+    blocked: Callable[[RemediationStep, str], T],
+    max_parallel: int = 4,
+) -> list[tuple[RemediationStep, T]]:
+    """
+    Run each step as soon as all steps it runs after have completed, up to max_parallel at once
+    (not level by level, so one slow step does not hold back unrelated ones). Steps depending on
+    a step that did not succeed (ok() false) are not run; blocked(step, check_id) supplies their result.
+
+    Returns:
+        (step, result) pairs in completion order.
+
+    Raises:
+        ValueError: If the run_after hints form a cycle.
+    """
+    plan_stages(steps)
+    by_id = {s.check_id: s for s in steps}
+    deps = _dependencies(steps)
+    waiting = {c: len(d) for c, d in deps.items()}
+    dependents: dict[str, list[str]] = {c: [] for c in deps}
+    for c, ds in deps.items():
+        for d in ds:
+            dependents[d].append(c)
+
+    ready = [c for c in deps if not waiting[c]]
+    failed: set[str] = set()
+    done: list[tuple[RemediationStep, T]] = []
+
+    def finish(check_id: str, result: T, success: bool) -> None:
+        done.append((by_id[check_id], result))
+        if not success:
+            failed.add(check_id)
+        for c in dependents[check_id]:
+            waiting[c] -= 1
+            if not waiting[c]:
+                ready.append(c)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel), thread_name_prefix="remediation") as pool:
+        running = {}
+        while ready or running:
+            while ready:
+                check_id = ready.pop(0)
+                blocker = next((d for d in deps[check_id] if d in failed), None)
+                if blocker is not None:
+                    finish(check_id, blocked(by_id[check_id], blocker), False)
+                else:
+                    running[pool.submit(run, by_id[check_id])] = check_id
+            if running:
+                completed, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    result = future.result()
+                    finish(running.pop(future), result, ok(result))
+    return done
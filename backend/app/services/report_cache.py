@@ -0,0 +1,139 @@
+"""On-disk cache of rendered PDF reports with coalesced renders and byte-range reads."""
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from typing import IO, Callable, Iterator, Optional
+
+from app.core.singleflight import SingleFlight
+
+CHUNK_SIZE = 64 * 1024
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a single-range Range header into inclusive (start, end) for a body of `size` bytes.
+    Returns None for a missing, malformed or multi-range header (serve the full body);
+    raises ValueError if the range cannot be satisfied (416).
+    """
+    if not header:
+        return None
+    match = _RANGE.match(header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        length = int(last)
+        if length == 0:
+            raise ValueError(f"Range not satisfiable: {header}")
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(f"Range not satisfiable: {header}")
+    return start, end
+
+
+def iter_file_range(file: IO[bytes], start: int, length: int, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield `length` bytes of file from offset start in chunks, closing the file afterwards."""
+    try:
+        file.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = file.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+class ReportCache:
+    """
+    Rendered reports keyed by content identity (e.g. node + audit timestamp + catalog version).
+
+    Each report is rendered once into a temp file in `directory` and atomically renamed into
+    place; concurrent requests for the same key wait for that single render (single-flight).
+    Downloads stream from the file, so N concurrent downloads cost N chunk buffers, not N PDFs.
+    The least recently used files beyond max_files are removed.
+    """
+
+    def __init__(self, directory: str = "", max_files: int = 64) -> None:
+        """
+        Args:
+            directory: Cache directory (created if missing); default <tmp>/proxsecure-reports.
+            max_files: Number of rendered reports kept on disk.
+        """
+        self._dir = directory or os.path.join(tempfile.gettempdir(), "proxsecure-reports")
+        os.makedirs(self._dir, exist_ok=True)
+        self._max_files = max(1, max_files)
+        self._flights = SingleFlight()
+        self._prune_lock = threading.Lock()
+        self.renders = 0
+
+    @staticmethod
+    def etag(key: str) -> str:
+        """Strong ETag for the report identified by key."""
+        return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest() + '"'
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._dir, self.etag(key).strip('"') + ".pdf")
+
+    def _render(self, key: str, path: str, render: Callable[[IO[bytes]], None]) -> str:
+        if os.path.exists(path):
+            return path
+        fd, tmp_path = tempfile.mkstemp(dir=self._dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                render(out)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        self.renders += 1
+        self._prune()
+        return path
+
+    def _prune(self) -> None:
+        with self._prune_lock:
+            entries = []
+            for name in os.listdir(self._dir):
+                if name.endswith(".pdf"):
+                    full = os.path.join(self._dir, name)
+                    try:
+                        entries.append((os.stat(full).st_mtime, full))
+                    except FileNotFoundError:
+                        continue
+            entries.sort()
+            for _, full in entries[: max(0, len(entries) - self._max_files)]:
+                try:
+                    os.unlink(full)  # open readers keep their handle (POSIX)
+                except FileNotFoundError:
+                    pass
+
+    def open(self, key: str, render: Callable[[IO[bytes]], None]) -> tuple[IO[bytes], int]:
+        """
+        Return (open file, size) of the report for key, rendering it first if not cached.
+        render(out) must write the complete report to the binary file `out`.
+        """
+        path = self._path(key)
+        for _ in range(2):
+            self._flights.do(key, lambda: self._render(key, path, render))
+            try:
+                file = open(path, "rb")
+            except FileNotFoundError:
+                continue  # pruned between render and open: render again
+            try:
+                os.utime(path)  # LRU touch
+            except FileNotFoundError:
+                pass
+            return file, os.fstat(file.fileno()).st_size
+        raise RuntimeError(f"Report {key} was evicted while opening")
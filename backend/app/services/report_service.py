@@ -1,13 +1,18 @@
 """PDF compliance audit report generation using ReportLab."""
 
+import tempfile
 from datetime import datetime
+from functools import lru_cache
 from io import BytesIO
+from types import SimpleNamespace
+from typing import IO, Iterable, Iterator
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm
 from reportlab.platypus import (
+    CondPageBreak,
     Paragraph,
     Spacer,
     Table,
@@ -16,7 +21,8 @@ from reportlab.platypus import (
     SimpleDocTemplate,
 )
 
-from app.models.check import HistoricalDataPoint, NodeAuditResult
+from app.models.check import ControlCoverageList, CustomerRollup, HistoricalDataPoint, NodeAuditResult
+from app.services.control_coverage import FRAMEWORKS
 
 # ProxSecure theme: blue accents, neutral grays
 COLOR_PRIMARY = colors.HexColor("#3b82f6")
@@ -29,68 +35,161 @@ COLOR_FAIL = colors.HexColor("#ef4444")
 # A4 usable width with 1.5cm margins each side
 PAGE_WIDTH = A4[0] - 3 * cm
 
+FINDINGS_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), COLOR_GRAY_800),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+    ("BACKGROUND", (0, 1), (-1, -1), colors.white),
+    ("TEXTCOLOR", (0, 1), (-1, -1), COLOR_GRAY_600),
+    ("GRID", (0, 0), (-1, -1), 0.5, COLOR_GRAY_200),
+    ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ("LEFTPADDING", (0, 0), (-1, -1), 4),
+    ("RIGHTPADDING", (0, 0), (-1, -1), 4),
+    ("TOPPADDING", (0, 0), (-1, -1), 4),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+])
 
-class ReportService:
-    """
-    Generates PDF compliance audit reports from NodeAuditResult.
-    Returns PDF bytes; filename format: compliance-report-{node_id}-{YYYY-MM-DD}.pdf
-    """
 
-    def generate_pdf_report(
-        self,
-        node_id: str,
-        audit_result: NodeAuditResult,
-        history: list[HistoricalDataPoint] | None = None,
-    ) -> bytes:
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=1.5 * cm,
-            leftMargin=1.5 * cm,
-            topMargin=1 * cm,
-            bottomMargin=1 * cm,
-        )
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
+@lru_cache(maxsize=1)
+def report_styles() -> SimpleNamespace:
+    """Paragraph styles shared by every report (built once per process)."""
+    styles = getSampleStyleSheet()
+    return SimpleNamespace(
+        title=ParagraphStyle(
             name="ProxSecureTitle",
             parent=styles["Title"],
             fontSize=20,
             textColor=COLOR_PRIMARY,
             spaceAfter=6,
             spaceBefore=0,
-        )
-        heading_style = ParagraphStyle(
+        ),
+        heading=ParagraphStyle(
             name="ProxSecureHeading",
             parent=styles["Heading2"],
             fontSize=13,
             textColor=COLOR_GRAY_800,
             spaceBefore=10,
             spaceAfter=6,
-        )
-        body_style = ParagraphStyle(
+        ),
+        body=ParagraphStyle(
             name="ProxSecureBody",
             parent=styles["Normal"],
             fontSize=9,
             textColor=COLOR_GRAY_600,
             spaceAfter=4,
-        )
+        ),
         # Style for table cell paragraphs (enables word-wrap)
-        cell_style = ParagraphStyle(
+        cell=ParagraphStyle(
             name="CellStyle",
             parent=styles["Normal"],
             fontSize=8,
             textColor=COLOR_GRAY_600,
             leading=10,
-        )
-        cell_header_style = ParagraphStyle(
+        ),
+        cell_header=ParagraphStyle(
             name="CellHeaderStyle",
             parent=styles["Normal"],
             fontSize=8,
             textColor=colors.white,
             fontName="Helvetica-Bold",
             leading=10,
+        ),
+    )
+
+
+def findings_table(audit_result: NodeAuditResult) -> Table:
+    """Detailed findings table: one row per check with status, severity and ISO/BSI/NIS2 references."""
+    st = report_styles()
+    # Fixed column widths: Check(35%) Category(15%) Status(10%) Severity(10%) ISO/BSI/NIS2(30%)
+    col_check = PAGE_WIDTH * 0.35
+    col_cat = PAGE_WIDTH * 0.15
+    col_status = PAGE_WIDTH * 0.10
+    col_sev = PAGE_WIDTH * 0.10
+    col_compliance = PAGE_WIDTH * 0.30
+
+    table_data = [
+        [
+            Paragraph("Check Name", st.cell_header),
+            Paragraph("Category", st.cell_header),
+            Paragraph("Status", st.cell_header),
+            Paragraph("Severity", st.cell_header),
+            Paragraph("ISO 27001 / BSI / NIS2", st.cell_header),
+        ]
+    ]
+    for r in audit_result.check_results:
+        refs = [", ".join(getattr(r.compliance_mapping, f)) for f in FRAMEWORKS] if r.compliance_mapping else []
+        compliance_text = "<br/>".join(ref for ref in refs if ref) or "—"
+        table_data.append([
+            Paragraph(r.check_name or r.check_id, st.cell),
+            Paragraph((r.category.replace("_", " ") if r.category else "—"), st.cell),
+            Paragraph(r.status, st.cell),
+            Paragraph(r.severity or "—", st.cell),
+            Paragraph(compliance_text, st.cell),
+        ])
+
+    t = Table(
+        table_data,
+        colWidths=[col_check, col_cat, col_status, col_sev, col_compliance],
+        repeatRows=1,
+    )
+    t.setStyle(FINDINGS_TABLE_STYLE)
+    return t
+
+
+class _LazyStory(list):
+    """
+    Story list fed from an iterator of flowable groups. The doc template consumes flowables from
+    the front and checks len() before each one; the list is topped up to `lookahead` flowables
+    only then, so rendered flowables are released instead of the whole story living in RAM.
+    """
+
+    def __init__(self, groups: Iterator[list], lookahead: int = 64) -> None:
+        super().__init__()
+        self._groups = groups
+        self._lookahead = lookahead
+
+    def __len__(self) -> int:
+        while super().__len__() < self._lookahead:
+            group = next(self._groups, None)
+            if group is None:
+                break
+            self.extend(group)
+        return super().__len__()
+
+
+class ReportService:
+    """
+    Generates PDF compliance audit reports from NodeAuditResult.
+    Returns PDF bytes; filename format: compliance-report-{node_id}-{YYYY-MM-DD}.pdf
+    """
+
+    def generate_pdf_report(
+        self,
+        node_id: str,
+        audit_result: NodeAuditResult,
+        history: list[HistoricalDataPoint] | None = None,
+    ) -> bytes:
+        buffer = BytesIO()
+        self.render_pdf_report(node_id, audit_result, buffer, history=history)
+        return buffer.getvalue()
+
+    def render_pdf_report(
+        self,
+        node_id: str,
+        audit_result: NodeAuditResult,
+        out: IO[bytes],
+        history: list[HistoricalDataPoint] | None = None,
+    ) -> None:
+        """Render the node report into the binary file `out` (e.g. a ReportCache temp file)."""
+        doc = SimpleDocTemplate(
+            out,
+            pagesize=A4,
+            rightMargin=1.5 * cm,
+            leftMargin=1.5 * cm,
+            topMargin=1 * cm,
+            bottomMargin=1 * cm,
         )
+        st = report_styles()
+        title_style, heading_style, body_style = st.title, st.heading, st.body
         story = []
 
         # --- Title + Executive Summary on Page 1 (no separate cover page) ---
@@ -148,53 +247,7 @@ class ReportService:
         # --- Detailed Findings Table ---
         story.append(Paragraph("Detailed Findings", heading_style))
 
-        # Fixed column widths: Check(35%) Category(15%) Status(10%) Severity(10%) ISO/BSI(30%)
-        col_check = PAGE_WIDTH * 0.35
-        col_cat = PAGE_WIDTH * 0.15
-        col_status = PAGE_WIDTH * 0.10
-        col_sev = PAGE_WIDTH * 0.10
-        col_compliance = PAGE_WIDTH * 0.30
-
-        table_data = [
-            [
-                Paragraph("Check Name", cell_header_style),
-                Paragraph("Category", cell_header_style),
-                Paragraph("Status", cell_header_style),
-                Paragraph("Severity", cell_header_style),
-                Paragraph("ISO 27001 / BSI", cell_header_style),
-            ]
-        ]
-        for r in audit_result.check_results:
-            iso_refs = ", ".join(r.compliance_mapping.iso_27001) if r.compliance_mapping else "—"
-            bsi_refs = ", ".join(r.compliance_mapping.bsi_grundschutz) if r.compliance_mapping else "—"
-            compliance_text = f"{iso_refs}<br/>{bsi_refs}" if (iso_refs != "—" or bsi_refs != "—") else "—"
-            table_data.append([
-                Paragraph(r.check_name or r.check_id, cell_style),
-                Paragraph((r.category.replace("_", " ") if r.category else "—"), cell_style),
-                Paragraph(r.status, cell_style),
-                Paragraph(r.severity or "—", cell_style),
-                Paragraph(compliance_text, cell_style),
-            ])
-
-        t = Table(
-            table_data,
-            colWidths=[col_check, col_cat, col_status, col_sev, col_compliance],
-            repeatRows=1,
-        )
-        t.setStyle(
-            TableStyle([
-                ("BACKGROUND", (0, 0), (-1, 0), COLOR_GRAY_800),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-                ("BACKGROUND", (0, 1), (-1, -1), colors.white),
-                ("TEXTCOLOR", (0, 1), (-1, -1), COLOR_GRAY_600),
-                ("GRID", (0, 0), (-1, -1), 0.5, COLOR_GRAY_200),
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ("LEFTPADDING", (0, 0), (-1, -1), 4),
-                ("RIGHTPADDING", (0, 0), (-1, -1), 4),
-                ("TOPPADDING", (0, 0), (-1, -1), 4),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-            ])
-        )
+        t = findings_table(audit_result)
         story.append(t)
         story.append(PageBreak())
 
@@ -258,8 +311,112 @@ class ReportService:
             )
 
         doc.build(story)
-        buffer.seek(0)
-        return buffer.getvalue()
+
+    def render_customer_report(
+        self,
+        rollup: CustomerRollup,
+        nodes: Iterable[NodeAuditResult],
+        out: IO[bytes] | None = None,
+        controls: ControlCoverageList | None = None,
+    ) -> IO[bytes]:
+        """
+        Render a consolidated customer report (fleet summary, one section per node, control
+        coverage appendix from `controls`) into `out`, by default a temp file spooled to disk beyond 1 MB.
+
+        `nodes` is consumed lazily while the document is laid out, so only a bounded window of
+        flowables is alive at any time. Returns the file positioned at offset 0.
+        """
+        out = out if out is not None else tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+        doc = SimpleDocTemplate(
+            out,
+            pagesize=A4,
+            rightMargin=1.5 * cm,
+            leftMargin=1.5 * cm,
+            topMargin=1 * cm,
+            bottomMargin=1 * cm,
+            title=f"Compliance Report {rollup.customer_id}",
+        )
+        doc.build(_LazyStory(self._customer_story(rollup, nodes, controls)))
+        out.seek(0)
+        return out
+
+    def _customer_story(
+        self, rollup: CustomerRollup, nodes: Iterable[NodeAuditResult], controls: ControlCoverageList | None
+    ) -> Iterator[list]:
+        st = report_styles()
+        gen_date = datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
+        yield [
+            Paragraph("Customer Compliance Report", st.title),
+            Paragraph(f"<b>Customer:</b> {rollup.customer_id}", st.body),
+            Paragraph(f"<b>Report generated:</b> {gen_date}", st.body),
+            Paragraph("<i>ProxSecure Audit — Compliance automation for Proxmox infrastructure</i>", st.body),
+            Spacer(1, 0.3 * cm),
+            Paragraph("Fleet Summary", st.heading),
+            Paragraph(
+                f"Nodes: <b>{rollup.total_nodes}</b>. Average compliance: <b>{rollup.average_compliance}%</b>. "
+                f"Critical nodes (&lt; 60%): <b>{len(rollup.critical_nodes)}</b>.",
+                st.body,
+            ),
+            Paragraph(
+                "Failed checks by severity: "
+                + ", ".join(f"{sev} {n}" for sev, n in rollup.failing_checks_by_severity.items()),
+                st.body,
+            ),
+        ]
+        if rollup.worst_nodes:
+            rows = [[Paragraph("Lowest-scoring nodes", st.cell_header), Paragraph("Score", st.cell_header)]]
+            rows += [[Paragraph(n.node_id, st.cell), Paragraph(f"{n.compliance_score}%", st.cell)]
+                     for n in rollup.worst_nodes]
+            table = Table(rows, colWidths=[PAGE_WIDTH * 0.7, PAGE_WIDTH * 0.3])
+            table.setStyle(FINDINGS_TABLE_STYLE)
+            yield [table]
+        yield [PageBreak()]
+
+        for node in nodes:
+            yield self._node_section(node)
+        if controls is None:
+            return
+
+        yield [PageBreak(), Paragraph("Appendix: Control Coverage", st.heading), Paragraph(
+            "A node covers a control when every check mapped to it passed on that node.", st.body
+        )]
+        rows = [[Paragraph(h, st.cell_header) for h in ("Framework", "Control", "Checks", "Covered", "Gaps")]]
+        for c in controls.controls:
+            if not c.assessed_nodes:
+                continue
+            rows.append([
+                Paragraph(FRAMEWORKS.get(c.framework, c.framework), st.cell),
+                Paragraph(c.control_id, st.cell),
+                Paragraph(str(len(c.check_ids)), st.cell),
+                Paragraph(f"{c.passed_nodes}/{c.assessed_nodes} ({c.pass_rate}%)", st.cell),
+                Paragraph(str(c.failed_nodes), st.cell),
+            ])
+        table = Table(rows, colWidths=[PAGE_WIDTH * w for w in (0.2, 0.3, 0.1, 0.25, 0.15)], repeatRows=1)
+        table.setStyle(FINDINGS_TABLE_STYLE)
+        yield [table]
+
+    @staticmethod
+    def _node_section(node: NodeAuditResult) -> list:
+        st = report_styles()
+        failing = [r.check_name for r in node.check_results if r.status == "FAIL"]
+        section = [
+            CondPageBreak(6 * cm),
+            Paragraph(f"{node.node_name or node.node_id} — {node.compliance_score}%", st.heading),
+            Paragraph(
+                f"Node <b>{node.node_id}</b>: {node.total_checks} checks "
+                f"(Passed: {node.passed_checks}, Failed: {node.failed_checks}).",
+                st.body,
+            ),
+        ]
+        if failing:
+            section.append(Paragraph("Remediation needed: " + ", ".join(failing) + ".", st.body))
+        section += [findings_table(node), Spacer(1, 0.4 * cm)]
+        return section
+
+    def get_customer_report_filename(self, customer_id: str) -> str:
+        """Return suggested filename: compliance-report-customer-{customer_id}-{YYYY-MM-DD}.pdf"""
+        date_str = datetime.utcnow().strftime("%Y-%m-%d")
+        return f"compliance-report-customer-{customer_id}-{date_str}.pdf"
 
     def get_report_filename(self, node_id: str) -> str:
         """Return suggested filename: compliance-report-{node_id}-{YYYY-MM-DD}.pdf"""
@@ -0,0 +1,122 @@
+"""What-if re-scoring of cached node results under hypothetical config overrides."""
+
+import threading
+from typing import Any, Callable, Iterable, Optional
+
+from app.models.check import NodeAuditResult, SimulatedNode, SimulationResult
+
+
+class ConfigSnapshots:
+    """Config of each node as last fetched by an audit (process memory), for what-if simulation."""
+
+    def __init__(self) -> None:
+        self._configs: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def put(self, node_id: str, config: dict[str, Any]) -> None:
+        with self._lock:
+            self._configs[node_id] = dict(config)
+
+    def update(self, node_id: str, values: dict[str, Any]) -> None:
+        """Merge re-fetched keys (targeted verification) into an existing snapshot."""
+        with self._lock:
+            if node_id in self._configs:
+                self._configs[node_id] = {**self._configs[node_id], **values}
+
+    def get(self, node_id: str) -> Optional[dict[str, Any]]:
+        return self._configs.get(node_id)
+
+
+def _average(total: float, count: int) -> float:
+    return round(total / count, 2) if count else 0.0
+
+
+def simulate(
+    nodes: Iterable[tuple[NodeAuditResult, dict[str, Any]]],
+    evaluate: Callable[[str, dict[str, Any]], str],
+    recheck: dict[str, tuple[str, ...]],
+    overrides: dict[str, Any],
+    fix_checks: set[str],
+    threshold: int,
+    fleet_score_sum: int,
+    fleet_count: int,
+    include_nodes: bool = True,
+) -> SimulationResult:
+    """
+    Re-score nodes with config overrides applied and fix_checks assumed passing.
+
+    Only checks in `recheck` (check_id -> config keys; those that read an overridden key) are
+    re-evaluated; every other check keeps its cached status. Validators are pure functions of their
+    declared keys, so a check is evaluated once per distinct combination of those key values: with
+    the overridden keys shared by every node that is typically once per check for the whole set.
+
+    Args:
+        nodes: (cached audit result, config snapshot) per simulated node.
+        evaluate: (check_id, config) -> PASS/FAIL/ERROR.
+        recheck: check_id -> config_keys of the checks to re-evaluate (empty keys: never memoized).
+        fleet_score_sum, fleet_count: Current score sum and size of the whole audited fleet.
+    """
+    memo: dict[tuple, str] = {}
+    projected_nodes: list[SimulatedNode] = []
+    simulated = current_sum = projected_sum = improved = 0
+    leaving: list[str] = []
+    entering: list[str] = []
+    critical_before = critical_after = 0
+
+    for result, config in nodes:
+        merged = {**config, **overrides}
+        changed: list[str] = []
+        passed = 0
+        for r in result.check_results:
+            status = r.status
+            if r.check_id in fix_checks:
+                status = "PASS"
+            elif r.check_id in recheck:
+                keys = recheck[r.check_id]
+                try:
+                    memo_key = (r.check_id,) + tuple(merged.get(k) for k in keys) if keys else None
+                    hash(memo_key)
+                except TypeError:
+                    memo_key = None
+                if memo_key is None:
+                    status = evaluate(r.check_id, merged)
+                else:
+                    status = memo.get(memo_key)
+                    if status is None:
+                        status = memo[memo_key] = evaluate(r.check_id, merged)
+            if status != r.status:
+                changed.append(r.check_id)
+            passed += status == "PASS"
+        total = len(result.check_results)
+        projected = int(passed / total * 100) if total else 0
+        current = result.compliance_score
+        simulated += 1
+        current_sum += current
+        projected_sum += projected
+        improved += projected > current
+        was_critical, is_critical = current < threshold, projected < threshold
+        critical_before += was_critical
+        critical_after += is_critical
+        if was_critical and not is_critical:
+            leaving.append(result.node_id)
+        elif is_critical and not was_critical:
+            entering.append(result.node_id)
+        if include_nodes:
+            projected_nodes.append(SimulatedNode(
+                node_id=result.node_id, current_score=current, projected_score=projected, changed_checks=changed
+            ))
+
+    return SimulationResult(
+        total_nodes=simulated,
+        current_average=_average(current_sum, simulated),
+        projected_average=_average(projected_sum, simulated),
+        fleet_current_average=_average(fleet_score_sum, fleet_count),
+        fleet_projected_average=_average(fleet_score_sum - current_sum + projected_sum, fleet_count),
+        critical_before=critical_before,
+        critical_after=critical_after,
+        leaving_critical=sorted(leaving),
+        entering_critical=sorted(entering),
+        improved_nodes=improved,
+        rechecked_checks=sorted(recheck),
+        nodes=projected_nodes,
+    )
@@ -0,0 +1,236 @@
+"""SSH probe collector for host-level settings the Proxmox API does not expose."""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _get_paramiko():
+    try:
+        import paramiko
+        return paramiko
+    except ImportError:
+        return None
+
+
+# One script, one exec channel: every fact is printed as key=value so a single round trip
+# collects everything. Commands must not prompt and must tolerate missing tools.
+PROBE_SCRIPT = r"""
+export LC_ALL=C
+echo "permitrootlogin=$(sshd -T 2>/dev/null | awk '$1=="permitrootlogin"{print $2}')"
+if grep -rhsqE '^[^#]*(@@?[A-Za-z0-9.\[\]:-]+|omfwd)' /etc/rsyslog.conf /etc/rsyslog.d/ 2>/dev/null; then
+  echo "rsyslog_forwarding=yes"
+else
+  echo "rsyslog_forwarding=no"
+fi
+echo "rsyslog_active=$(systemctl is-active rsyslog 2>/dev/null || echo inactive)"
+echo "snmpd_active=$(systemctl is-active snmpd 2>/dev/null || echo inactive)"
+if grep -sqE '^[^#]*(rocommunity|rwcommunity|rouser|createUser)' /etc/snmp/snmpd.conf 2>/dev/null; then
+  echo "snmpd_configured=yes"
+else
+  echo "snmpd_configured=no"
+fi
+echo "auditd_active=$(systemctl is-active auditd 2>/dev/null || echo inactive)"
+echo "auditd_priv_rules=$(auditctl -l 2>/dev/null | grep -cE 'execve|sudo|sudoers|/usr/bin/su|priv' || true)"
+echo "probe_ok=1"
+"""
+
+
+def parse_probe_output(output: str) -> dict[str, str]:
+    """Parse key=value lines printed by PROBE_SCRIPT (unknown lines are ignored)."""
+    facts: dict[str, str] = {}
+    for line in output.splitlines():
+        key, sep, value = line.partition("=")
+        if sep and key.strip():
+            facts[key.strip()] = value.strip()
+    return facts
+
+
+def facts_to_config(facts: dict[str, str]) -> dict[str, Any]:
+    """Map probed host facts to the node config keys used by the audit validators."""
+    if facts.get("probe_ok") != "1":
+        raise RuntimeError("SSH probe script did not complete")
+    config: dict[str, Any] = {
+        "syslog_forwarding": facts.get("rsyslog_forwarding") == "yes" and facts.get("rsyslog_active") == "active",
+        "snmp_configured": facts.get("snmpd_configured") == "yes" and facts.get("snmpd_active") == "active",
+        "privileged_access_logging": (
+            facts.get("auditd_active") == "active" and int(facts.get("auditd_priv_rules") or 0) > 0
+        ),
+    }
+    permit_root = facts.get("permitrootlogin")
+    if permit_root:
+        config["ssh_permit_root_login"] = permit_root
+    return config
+
+
+class SSHCollector:
+    """
+    Collects host facts over SSH: one connection per node, kept open and reused across audit
+    cycles, and one exec channel per probe running PROBE_SCRIPT. collect_many() probes nodes
+    in parallel with at most max_parallel sessions; results are cached for cache_seconds so a
+    fleet prefetch followed by per-node get_node_config() probes every host once. Failures are
+    cached for the same window, so an unreachable host costs one connect timeout per window
+    instead of one per caller.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        key_filename: Optional[str] = None,
+        port: int = 22,
+        host_map: Optional[dict[str, str]] = None,
+        known_hosts: Optional[str] = None,
+        max_parallel: int = 16,
+        timeout_seconds: float = 10.0,
+        cache_seconds: float = 30.0,
+        client_factory: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        """
+        Args:
+            username: SSH login (read-only probes; `sshd -T` and `auditctl -l` need root or sudo-less equivalents).
+            key_filename: Private key path; None uses the SSH agent / default keys.
+            port: SSH port.
+            host_map: Optional node_id -> hostname/IP; defaults to the node name.
+            known_hosts: Extra known_hosts file; unknown host keys are always rejected.
+            max_parallel: Maximum concurrent SSH sessions in collect_many().
+            timeout_seconds: Connect and command timeout.
+            cache_seconds: Reuse a node's facts (or probe failure) for this long.
+            client_factory: Returns a new paramiko.SSHClient-like object (tests).
+        """
+        self._username = username
+        self._key_filename = key_filename or None
+        self._port = port
+        self._host_map = dict(host_map or {})
+        self._known_hosts = known_hosts or None
+        self._max_parallel = max(1, max_parallel)
+        self._timeout = timeout_seconds
+        self._cache_seconds = cache_seconds
+        self._client_factory = client_factory or self._paramiko_client
+        self._lock = threading.Lock()
+        self._node_locks: dict[str, threading.Lock] = {}
+        self._clients: dict[str, Any] = {}
+        self._sftp: dict[str, Any] = {}
+        self._facts: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._failed: dict[str, tuple[float, Exception]] = {}
+
+    def _paramiko_client(self) -> Any:
+        paramiko = _get_paramiko()
+        if not paramiko:
+            raise RuntimeError("paramiko not installed; pip install paramiko")
+        client = paramiko.SSHClient()
+        client.load_system_host_keys()
+        if self._known_hosts:
+            client.load_host_keys(self._known_hosts)
+        client.set_missing_host_key_policy(paramiko.RejectPolicy())
+        return client
+
+    def _node_lock(self, node_id: str) -> threading.Lock:
+        with self._lock:
+            return self._node_locks.setdefault(node_id, threading.Lock())
+
+    def _client_for(self, node_id: str) -> Any:
+        """Return the node's open connection, (re)connecting if needed. Caller holds the node lock."""
+        client = self._clients.get(node_id)
+        if client is not None:
+            transport = client.get_transport()
+            if transport is not None and transport.is_active():
+                return client
+            client.close()
+        client = self._client_factory()
+        client.connect(
+            self._host_map.get(node_id, node_id),
+            port=self._port,
+            username=self._username,
+            key_filename=self._key_filename,
+            timeout=self._timeout,
+            banner_timeout=self._timeout,
+            auth_timeout=self._timeout,
+        )
+        transport = client.get_transport()
+        if transport is not None:
+            transport.set_keepalive(30)
+        self._clients[node_id] = client
+        return client
+
+    def _probe(self, node_id: str) -> dict[str, Any]:
+        try:
+            with self._node_lock(node_id):
+                client = self._client_for(node_id)
+                try:
+                    _, stdout, _ = client.exec_command(PROBE_SCRIPT, timeout=self._timeout)
+                    output = stdout.read().decode("utf-8", errors="replace")
+                except Exception:
+                    client.close()
+                    self._clients.pop(node_id, None)
+                    raise
+            config = facts_to_config(parse_probe_output(output))
+        except Exception as e:
+            self._facts.pop(node_id, None)
+            self._failed[node_id] = (time.monotonic(), e)
+            raise
+        self._failed.pop(node_id, None)
+        self._facts[node_id] = (time.monotonic(), config)
+        return config
+
+    def collect(self, node_id: str, force: bool = False) -> dict[str, Any]:
+        """
+        Config keys for node_id from the cache or a fresh probe (always with force); raises on SSH
+        failure, including a failure cached from a probe within the last cache_seconds.
+        """
+        if not force:
+            now = time.monotonic()
+            cached = self._facts.get(node_id)
+            if cached is not None and now - cached[0] < self._cache_seconds:
+                return cached[1]
+            failed = self._failed.get(node_id)
+            if failed is not None and now - failed[0] < self._cache_seconds:
+                raise failed[1]
+        return self._probe(node_id)
+
+    def sftp(self, node_id: str) -> Any:
+        """Pooled SFTP session on the node's connection (log scanning reads files through it)."""
+        with self._node_lock(node_id):
+            client = self._client_for(node_id)
+            sftp = self._sftp.get(node_id)
+            if sftp is None or sftp.get_channel() is None or sftp.get_channel().closed:
+                sftp = client.open_sftp()
+                self._sftp[node_id] = sftp
+            return sftp
+
+    def run(self, node_id: str, command: str) -> Any:
+        """Run command on the node's pooled connection and return its stdout stream."""
+        with self._node_lock(node_id):
+            client = self._client_for(node_id)
+        _, stdout, _ = client.exec_command(command, timeout=self._timeout)
+        return stdout
+
+    def collect_many(self, node_ids: Iterable[str]) -> dict[str, dict[str, Any] | Exception]:
+        """Probe nodes in parallel (bounded by max_parallel); failures are returned, not raised."""
+        node_ids = list(node_ids)
+        if not node_ids:
+            return {}
+
+        def run(node_id: str) -> dict[str, Any] | Exception:
+            try:
+                return self.collect(node_id)
+            except Exception as e:
+                logger.warning("SSH probe of %s failed: %s", node_id, e)
+                return e
+
+        with ThreadPoolExecutor(max_workers=min(self._max_parallel, len(node_ids))) as pool:
+            return dict(zip(node_ids, pool.map(run, node_ids)))
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        with self._lock:
+            clients, self._clients = self._clients, {}
+            self._sftp = {}
+        for client in clients.values():
+            try:
+                client.close()
+            except Exception:
+                pass
@@ -0,0 +1,444 @@
+"""Shared state backends (in-memory, SQLite, Redis) for audit cache, change log and remediation history."""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Iterator, Optional, Protocol, runtime_checkable
+
+logger = logging.getLogger(__name__)
+
+
+def _get_redis():
+    try:
+        import redis
+        return redis
+    except ImportError:
+        return None
+
+
+@runtime_checkable
+class StateBackend(Protocol):
+    """
+    Minimal key/value + counter + bounded list store. Values are bytes so any backend can be
+    shared across uvicorn worker processes (SQLite file, Redis) or kept in-process (memory).
+    """
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return value for key, or None if missing/expired."""
+        ...
+
+    def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None) -> None:
+        """Store value; ttl_seconds=None keeps it until overwritten or deleted."""
+        ...
+
+    def delete(self, key: str) -> None:
+        ...
+
+    def set_if_changed(self, key: str, value: bytes) -> bool:
+        """Atomically store value and return True if it differs from the previous value (or none)."""
+        ...
+
+    def incr(self, key: str) -> int:
+        """Atomically increment an integer counter (missing = 0) and return the new value."""
+        ...
+
+    def get_counter(self, key: str) -> int:
+        """Return the current counter value (0 if never incremented)."""
+        ...
+
+    def set_add(self, key: str, member: str) -> bool:
+        """Atomically add member to a set; True if it was not a member yet."""
+        ...
+
+    def set_remove(self, key: str, member: str) -> bool:
+        """Atomically remove member from a set; True if it was a member."""
+        ...
+
+    def set_members(self, key: str) -> list[str]:
+        """Return the members of a set, sorted."""
+        ...
+
+    def list_append(self, key: str, value: bytes, max_len: int) -> None:
+        """Append to a list, trimming the oldest entries beyond max_len."""
+        ...
+
+    def incr_and_append(
+        self, counter_key: str, list_key: str, make_value: Callable[[int], bytes], max_len: int
+    ) -> int:
+        """
+        Atomically increment counter_key and append make_value(new_value) to list_key (trimmed
+        to max_len); return the new counter value. Readers never see the counter without its entry.
+        """
+        ...
+
+    def list_items(self, key: str) -> list[bytes]:
+        """Return all list entries, oldest first."""
+        ...
+
+    def list_len(self, key: str) -> int:
+        """Return the number of list entries without loading them."""
+        ...
+
+    def list_iter(self, key: str, batch_size: int = 1000) -> Iterator[bytes]:
+        """Yield list entries oldest first, fetching batch_size entries at a time."""
+        ...
+
+
+class MemoryStateBackend:
+    """Process-local backend (default). Not shared between workers."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: dict[str, tuple[bytes, Optional[float]]] = {}
+        self._counters: dict[str, int] = {}
+        self._lists: dict[str, deque[bytes]] = {}
+        self._sets: dict[str, set[str]] = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._values.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.time():
+                del self._values[key]
+                return None
+            return value
+
+    def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl_seconds if ttl_seconds else None
+        with self._lock:
+            self._values[key] = (value, expires_at)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._values.pop(key, None)
+
+    def set_if_changed(self, key: str, value: bytes) -> bool:
+        with self._lock:
+            item = self._values.get(key)
+            if item is not None and item[0] == value and (item[1] is None or item[1] > time.time()):
+                return False
+            self._values[key] = (value, None)
+            return True
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = self._counters.get(key, 0) + 1
+            self._counters[key] = value
+            return value
+
+    def get_counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def set_add(self, key: str, member: str) -> bool:
+        with self._lock:
+            members = self._sets.setdefault(key, set())
+            if member in members:
+                return False
+            members.add(member)
+            return True
+
+    def set_remove(self, key: str, member: str) -> bool:
+        with self._lock:
+            members = self._sets.get(key)
+            if not members or member not in members:
+                return False
+            members.discard(member)
+            return True
+
+    def set_members(self, key: str) -> list[str]:
+        with self._lock:
+            return sorted(self._sets.get(key, ()))
+
+    def list_append(self, key: str, value: bytes, max_len: int) -> None:
+        with self._lock:
+            items = self._lists.get(key)
+            if items is None or items.maxlen != max_len:
+                items = deque(items or (), maxlen=max_len)
+                self._lists[key] = items
+            items.append(value)
+
+    def incr_and_append(
+        self, counter_key: str, list_key: str, make_value: Callable[[int], bytes], max_len: int
+    ) -> int:
+        with self._lock:
+            version = self._counters.get(counter_key, 0) + 1
+            value = make_value(version)
+            items = self._lists.get(list_key)
+            if items is None or items.maxlen != max_len:
+                items = deque(items or (), maxlen=max_len)
+                self._lists[list_key] = items
+            items.append(value)
+            self._counters[counter_key] = version
+            return version
+
+    def list_items(self, key: str) -> list[bytes]:
+        with self._lock:
+            return list(self._lists.get(key, ()))
+
+    def list_len(self, key: str) -> int:
+        with self._lock:
+            return len(self._lists.get(key, ()))
+
+    def list_iter(self, key: str, batch_size: int = 1000) -> Iterator[bytes]:
+        # Entries are already in memory; iterate a snapshot so appends don't break the iteration.
+        yield from self.list_items(key)
+
+
+class SQLiteStateBackend:
+    """
+    SQLite file shared by all workers on one host (WAL mode, memory-mapped reads).
+    One connection per thread; multi-statement updates use BEGIN IMMEDIATE.
+    """
+
+    def __init__(self, path: str, mmap_size: int = 256 * 1024 * 1024) -> None:
+        self._path = path
+        self._mmap_size = mmap_size
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL);
+            CREATE TABLE IF NOT EXISTS counters (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS list_entries (
+                key TEXT NOT NULL, seq INTEGER NOT NULL, value BLOB NOT NULL, PRIMARY KEY (key, seq)
+            );
+            CREATE TABLE IF NOT EXISTS set_members (key TEXT NOT NULL, member TEXT NOT NULL, PRIMARY KEY (key, member));
+            """
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA mmap_size={int(self._mmap_size)}")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        row = self._conn().execute(
+            "SELECT value FROM kv WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time()),
+        ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl_seconds if ttl_seconds else None
+        self._conn().execute(
+            "INSERT INTO kv (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at",
+            (key, value, expires_at),
+        )
+
+    def delete(self, key: str) -> None:
+        self._conn().execute("DELETE FROM kv WHERE key = ?", (key,))
+
+    def set_if_changed(self, key: str, value: bytes) -> bool:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT value FROM kv WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)", (key, time.time())
+            ).fetchone()
+            changed = row is None or bytes(row[0]) != value
+            if changed:
+                conn.execute(
+                    "INSERT INTO kv (key, value, expires_at) VALUES (?, ?, NULL) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = NULL",
+                    (key, value),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return changed
+
+    def incr(self, key: str) -> int:
+        row = self._conn().execute(
+            "INSERT INTO counters (key, value) VALUES (?, 1) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + 1 RETURNING value",
+            (key,),
+        ).fetchone()
+        return int(row[0])
+
+    def get_counter(self, key: str) -> int:
+        row = self._conn().execute("SELECT value FROM counters WHERE key = ?", (key,)).fetchone()
+        return int(row[0]) if row else 0
+
+    def set_add(self, key: str, member: str) -> bool:
+        cur = self._conn().execute("INSERT OR IGNORE INTO set_members (key, member) VALUES (?, ?)", (key, member))
+        return cur.rowcount == 1
+
+    def set_remove(self, key: str, member: str) -> bool:
+        cur = self._conn().execute("DELETE FROM set_members WHERE key = ? AND member = ?", (key, member))
+        return cur.rowcount == 1
+
+    def set_members(self, key: str) -> list[str]:
+        rows = self._conn().execute("SELECT member FROM set_members WHERE key = ? ORDER BY member", (key,)).fetchall()
+        return [r[0] for r in rows]
+
+    def list_append(self, key: str, value: bytes, max_len: int) -> None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Per-key sequence numbers make trimming an index range delete instead of a scan.
+            seq = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM list_entries WHERE key = ?", (key,)
+            ).fetchone()[0]
+            conn.execute("INSERT INTO list_entries (key, seq, value) VALUES (?, ?, ?)", (key, seq, value))
+            conn.execute("DELETE FROM list_entries WHERE key = ? AND seq <= ?", (key, seq - max_len))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def incr_and_append(
+        self, counter_key: str, list_key: str, make_value: Callable[[int], bytes], max_len: int
+    ) -> int:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = int(conn.execute(
+                "INSERT INTO counters (key, value) VALUES (?, 1) "
+                "ON CONFLICT(key) DO UPDATE SET value = value + 1 RETURNING value",
+                (counter_key,),
+            ).fetchone()[0])
+            seq = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM list_entries WHERE key = ?", (list_key,)
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT INTO list_entries (key, seq, value) VALUES (?, ?, ?)", (list_key, seq, make_value(version))
+            )
+            conn.execute("DELETE FROM list_entries WHERE key = ? AND seq <= ?", (list_key, seq - max_len))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return version
+
+    def list_items(self, key: str) -> list[bytes]:
+        rows = self._conn().execute("SELECT value FROM list_entries WHERE key = ? ORDER BY seq", (key,)).fetchall()
+        return [bytes(r[0]) for r in rows]
+
+    def list_len(self, key: str) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM list_entries WHERE key = ?", (key,)).fetchone()[0]
+
+    def list_iter(self, key: str, batch_size: int = 1000) -> Iterator[bytes]:
+        last_seq = 0
+        while True:
+            rows = self._conn().execute(
+                "SELECT seq, value FROM list_entries WHERE key = ? AND seq > ? ORDER BY seq LIMIT ?",
+                (key, last_seq, batch_size),
+            ).fetchall()
+            for _, value in rows:
+                yield bytes(value)
+            if len(rows) < batch_size:
+                return
+            last_seq = rows[-1][0]
+
+
+class RedisStateBackend:
+    """Redis (or Redis-compatible, e.g. Valkey/KeyDB) backend shared across hosts. Requires `redis`."""
+
+    def __init__(self, url: str, prefix: str = "proxsecure:") -> None:
+        redis = _get_redis()
+        if not redis:
+            raise RuntimeError("redis not installed; pip install redis")
+        self._client: Any = redis.Redis.from_url(url)
+        self._watch_error = redis.WatchError
+        self._prefix = prefix
+
+    def _k(self, key: str) -> str:
+        return self._prefix + key
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(self._k(key))
+
+    def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None) -> None:
+        if ttl_seconds:
+            self._client.set(self._k(key), value, px=int(ttl_seconds * 1000))
+        else:
+            self._client.set(self._k(key), value)
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self._k(key))
+
+    def set_if_changed(self, key: str, value: bytes) -> bool:
+        # SET ... GET swaps atomically (Redis >= 6.2), so exactly one writer sees each change
+        return self._client.set(self._k(key), value, get=True) != value
+
+    def incr(self, key: str) -> int:
+        return int(self._client.incr(self._k(key)))
+
+    def get_counter(self, key: str) -> int:
+        value = self._client.get(self._k(key))
+        return int(value) if value else 0
+
+    def set_add(self, key: str, member: str) -> bool:
+        return bool(self._client.sadd(self._k(key), member))
+
+    def set_remove(self, key: str, member: str) -> bool:
+        return bool(self._client.srem(self._k(key), member))
+
+    def set_members(self, key: str) -> list[str]:
+        return sorted(m.decode("utf-8") if isinstance(m, bytes) else m for m in self._client.smembers(self._k(key)))
+
+    def list_append(self, key: str, value: bytes, max_len: int) -> None:
+        pipe = self._client.pipeline()
+        pipe.rpush(self._k(key), value)
+        pipe.ltrim(self._k(key), -max_len, -1)
+        pipe.execute()
+
+    def incr_and_append(
+        self, counter_key: str, list_key: str, make_value: Callable[[int], bytes], max_len: int
+    ) -> int:
+        counter, items = self._k(counter_key), self._k(list_key)
+        with self._client.pipeline() as pipe:
+            while True:
+                # Optimistic transaction: EXEC fails if another writer bumped the counter meanwhile
+                try:
+                    pipe.watch(counter)
+                    version = int(pipe.get(counter) or 0) + 1
+                    pipe.multi()
+                    pipe.set(counter, version)
+                    pipe.rpush(items, make_value(version))
+                    pipe.ltrim(items, -max_len, -1)
+                    pipe.execute()
+                    return version
+                except self._watch_error:
+                    continue
+
+    def list_items(self, key: str) -> list[bytes]:
+        return list(self._client.lrange(self._k(key), 0, -1))
+
+    def list_len(self, key: str) -> int:
+        return int(self._client.llen(self._k(key)))
+
+    def list_iter(self, key: str, batch_size: int = 1000) -> Iterator[bytes]:
+        # Indexes shift when concurrent appends trim the head; an export may then skip or repeat
+        # a few entries at the oldest end, which is acceptable for a rolling log.
+        start = 0
+        while True:
+            batch = self._client.lrange(self._k(key), start, start + batch_size - 1)
+            yield from batch
+            if len(batch) < batch_size:
+                return
+            start += batch_size
+
+
+def create_state_backend(kind: str, sqlite_path: str = "", redis_url: str = "") -> StateBackend:
+    """Factory: return memory, sqlite, or redis backend based on STATE_BACKEND."""
+    kind = (kind or "memory").lower()
+    if kind == "sqlite":
+        return SQLiteStateBackend(sqlite_path)
+    if kind == "redis":
+        return RedisStateBackend(redis_url)
+    if kind != "memory":
+        logger.warning("Unknown STATE_BACKEND=%s; falling back to memory", kind)
+    return MemoryStateBackend()
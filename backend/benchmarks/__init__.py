@@ -0,0 +1 @@
+"""Micro-benchmarks for backend hot paths (not part of the test suite)."""
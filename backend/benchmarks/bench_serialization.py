@@ -0,0 +1,79 @@
+"""
+Benchmark: default FastAPI response path vs. fast audit payload encoder for FleetSummary.
+
+Default path = response_model validation + jsonable serialization (fastapi.routing.serialize_response)
+followed by JSONResponse rendering, i.e. what /audit/nodes did before the fast path.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization --nodes 2000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.audit_engine import default_engine
+from app.core.serialization import AuditPayloadEncoder
+from app.data.mock_data import MOCK_NODES
+from app.models.check import FleetSummary
+from app.services.audit_service import AuditService
+
+
+class _SyntheticFleet:
+    """ProxmoxServiceProtocol stand-in with N nodes cloned from the mock configs."""
+
+    def __init__(self, count: int) -> None:
+        rng = random.Random(42)
+        templates = list(MOCK_NODES.values())
+        self._configs = {f"bench-node-{i:05d}": dict(rng.choice(templates)) for i in range(count)}
+
+    def get_all_nodes(self) -> list[str]:
+        return list(self._configs)
+
+    def get_node_config(self, node_id: str) -> dict:
+        return dict(self._configs[node_id])
+
+    def get_node_history(self, node_id: str) -> list[dict]:
+        return []
+
+
+def _default_path(summary: FleetSummary, field) -> bytes:
+    content = asyncio.run(serialize_response(field=field, response_content=summary))
+    return JSONResponse(content).body
+
+
+def _best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    svc = AuditService(proxmox_service=_SyntheticFleet(args.nodes), audit_engine=default_engine)
+    summary = svc.get_fleet_summary()
+    field = create_response_field(name="bench_response", type_=FleetSummary)
+    encoder = AuditPayloadEncoder()
+
+    default_ms = _best_of(lambda: _default_path(summary, field), args.repeat)
+    fast_ms = _best_of(lambda: encoder.encode_fleet_summary(summary), args.repeat)
+    size = len(encoder.encode_fleet_summary(summary))
+    print(f"nodes={args.nodes} payload={size / 1024:.0f} KiB")
+    print(f"default (validate + jsonable + json.dumps): {default_ms:8.1f} ms")
+    print(f"fast (fragments + orjson):                  {fast_ms:8.1f} ms  ({default_ms / fast_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
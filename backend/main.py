@@ -1,6 +1,8 @@
 """FastAPI application entry point for ProxSecure Audit API."""
 
+import asyncio
 import logging
+import os
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,12 +10,21 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import router
 from app.core.audit_engine import default_engine
 from app.core.config import get_settings
+from app.core.readiness import ReadinessState, WarmupRunner
 from app.services.audit_service import AuditService
 from app.services.automation_service import AutomationService
+from app.services.connectivity_monitor import ConnectivityMonitor
+from app.services.event_bus import EventBus
+from app.services.playbook_generator import host_var_resolver
 from app.services.proxmox_base import ProxmoxServiceProtocol
 from app.services.proxmox_hybrid import ProxmoxHybridService
 from app.services.proxmox_mock import ProxmoxMockService
 from app.services.proxmox_real import ProxmoxRealService
+from app.services.remediation_output import OutputStore
+from app.services.report_cache import ReportCache
+from app.services.log_scanner import LogScanner, fixture_sources, ssh_sources
+from app.services.ssh_collector import SSHCollector
+from app.services.state_backend import MemoryStateBackend, StateBackend, create_state_backend
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +44,62 @@ app.add_middleware(
 )
 
 
-def create_proxmox_service() -> ProxmoxServiceProtocol:
+def _create_ssh_collector() -> SSHCollector | None:
+    """SSH host-fact collector for real/hybrid mode when SSH_PROBE_ENABLED is set."""
+    settings = get_settings()
+    if not settings.SSH_PROBE_ENABLED:
+        return None
+    return SSHCollector(
+        username=settings.SSH_USER,
+        key_filename=settings.SSH_KEY_FILE or None,
+        port=settings.SSH_PORT,
+        host_map=settings.ssh_host_map_dict(),
+        known_hosts=settings.SSH_KNOWN_HOSTS or None,
+        max_parallel=settings.SSH_MAX_PARALLEL,
+        timeout_seconds=settings.SSH_TIMEOUT_SECONDS,
+        cache_seconds=settings.SSH_CACHE_SECONDS,
+    )
+
+
+def _create_log_scanner(
+    ssh_collector: SSHCollector | None, state_backend: StateBackend | None
+) -> LogScanner | None:
+    """Log scanner from fixture files (LOG_SCAN_FIXTURE_DIR) or over SSH, when LOG_SCAN_ENABLED is set."""
+    settings = get_settings()
+    if not settings.LOG_SCAN_ENABLED:
+        return None
+    paths = [p.strip() for p in settings.LOG_SCAN_PATHS.split(",") if p.strip()]
+    if settings.LOG_SCAN_FIXTURE_DIR:
+        sources = fixture_sources(settings.LOG_SCAN_FIXTURE_DIR, [os.path.basename(p) for p in paths])
+    elif ssh_collector is not None:
+        sources = ssh_sources(ssh_collector, paths, journal=settings.LOG_SCAN_JOURNAL)
+    else:
+        logger.warning("LOG_SCAN_ENABLED requires SSH_PROBE_ENABLED or LOG_SCAN_FIXTURE_DIR; log scanning disabled")
+        return None
+    return LogScanner(sources, state_backend=state_backend, recent_hours=settings.LOG_SCAN_RECENT_HOURS)
+
+
+def _create_real_service(state_backend: StateBackend | None = None) -> ProxmoxRealService:
+    settings = get_settings()
+    ssh_collector = _create_ssh_collector()
+    return ProxmoxRealService(
+        host=settings.PROXMOX_HOST,
+        user=settings.PROXMOX_USER,
+        password=settings.PROXMOX_PASSWORD or None,
+        token_name=settings.PROXMOX_TOKEN_NAME or None,
+        token_value=settings.PROXMOX_TOKEN_VALUE or None,
+        verify_ssl=settings.PROXMOX_VERIFY_SSL,
+        guest_fetch_concurrency=settings.GUEST_FETCH_CONCURRENCY,
+        guest_inventory_refresh_seconds=settings.GUEST_INVENTORY_REFRESH_SECONDS,
+        guest_config_max_age_seconds=settings.GUEST_CONFIG_MAX_AGE_SECONDS,
+        ssh_collector=ssh_collector,
+        backup_listing_max_age_seconds=settings.BACKUP_LISTING_MAX_AGE_SECONDS,
+        backup_max_age_hours=settings.BACKUP_MAX_AGE_HOURS,
+        log_scanner=_create_log_scanner(ssh_collector, state_backend),
+    )
+
+
+def create_proxmox_service(state_backend: StateBackend | None = None) -> ProxmoxServiceProtocol:
     """Factory: return mock, real, or hybrid service based on PROXMOX_MODE."""
     settings = get_settings()
     mode = (settings.PROXMOX_MODE or "mock").lower()
@@ -41,76 +107,146 @@ def create_proxmox_service() -> ProxmoxServiceProtocol:
         return ProxmoxMockService()
     if mode == "real":
         settings.validate_for_mode()
-        return ProxmoxRealService(
-            host=settings.PROXMOX_HOST,
-            user=settings.PROXMOX_USER,
-            password=settings.PROXMOX_PASSWORD or None,
-            token_name=settings.PROXMOX_TOKEN_NAME or None,
-            token_value=settings.PROXMOX_TOKEN_VALUE or None,
-            verify_ssl=settings.PROXMOX_VERIFY_SSL,
-        )
+        return _create_real_service(state_backend)
     if mode == "hybrid":
         settings.validate_for_mode()
-        real_svc = ProxmoxRealService(
-            host=settings.PROXMOX_HOST,
-            user=settings.PROXMOX_USER,
-            password=settings.PROXMOX_PASSWORD or None,
-            token_name=settings.PROXMOX_TOKEN_NAME or None,
-            token_value=settings.PROXMOX_TOKEN_VALUE or None,
-            verify_ssl=settings.PROXMOX_VERIFY_SSL,
-        )
         return ProxmoxHybridService(
             hybrid_config=settings.hybrid_config_dict(),
-            real_service=real_svc,
+            real_service=_create_real_service(state_backend),
         )
     logger.warning("Unknown PROXMOX_MODE=%s; falling back to mock", mode)
     return ProxmoxMockService()
 
 
-def _create_services():
-    """Create proxmox and audit services; fall back to mock on real/hybrid connection failure."""
+def _create_services(event_bus: EventBus):
+    """
+    Create proxmox, audit and automation services without touching the network.
+    Real/hybrid connectivity is established by the background warm-up after startup;
+    only a misconfigured real/hybrid mode falls back to mock (startup_error, reported via /readyz).
+    An unavailable state backend falls back to process memory and is only a warning: the
+    provider is unaffected and still warms up.
+    """
     settings = get_settings()
-    mode = (settings.PROXMOX_MODE or "mock").lower()
+    startup_error = None
+    startup_warnings: list[str] = []
+    try:
+        state_backend = create_state_backend(
+            settings.STATE_BACKEND,
+            sqlite_path=settings.STATE_SQLITE_PATH,
+            redis_url=settings.STATE_REDIS_URL,
+        )
+    except Exception as e:
+        logger.warning("create_state_backend failed; falling back to memory: %s", e)
+        startup_warnings.append(f"STATE_BACKEND={settings.STATE_BACKEND} unavailable; using process memory: {e}")
+        state_backend = MemoryStateBackend()
     try:
-        proxmox_service = create_proxmox_service()
-        if mode in ("real", "hybrid"):
-            try:
-                nodes = proxmox_service.get_all_nodes()
-                logger.info("Proxmox connection OK; nodes=%s", nodes[:10] if len(nodes) > 10 else nodes)
-            except Exception as e:
-                logger.warning("Proxmox connection failed; falling back to mock: %s", e)
-                proxmox_service = ProxmoxMockService()
+        proxmox_service = create_proxmox_service(state_backend)
     except Exception as e:
         logger.warning("create_proxmox_service failed; falling back to mock: %s", e)
+        startup_error = f"create_proxmox_service failed; serving mock data: {e}"
         proxmox_service = ProxmoxMockService()
     audit_engine = default_engine
-    audit_service = AuditService(proxmox_service=proxmox_service, audit_engine=audit_engine)
+    audit_service = AuditService(
+        proxmox_service=proxmox_service,
+        audit_engine=audit_engine,
+        event_bus=event_bus,
+        state_backend=state_backend,
+        cache_ttl_seconds=settings.AUDIT_CACHE_TTL_SECONDS,
+        stale_max_age_seconds=settings.AUDIT_STALE_MAX_AGE_SECONDS,
+        failure_backoff_seconds=settings.AUDIT_FAILURE_BACKOFF_SECONDS,
+        failure_backoff_max_seconds=settings.AUDIT_FAILURE_BACKOFF_MAX_SECONDS,
+        customer_map=settings.node_customer_map_dict(),
+        history_max_entries=settings.AUDIT_HISTORY_MAX_ENTRIES,
+        verify_attempts=settings.REMEDIATION_VERIFY_ATTEMPTS,
+        verify_backoff_seconds=settings.REMEDIATION_VERIFY_BACKOFF_SECONDS,
+        verify_backoff_max_seconds=settings.REMEDIATION_VERIFY_BACKOFF_MAX_SECONDS,
+    )
     automation_service = AutomationService(
         proxmox_service=proxmox_service,
         automation_enabled=settings.AUTOMATION_ENABLED,
+        event_bus=event_bus,
+        state_backend=state_backend,
+        host_vars=host_var_resolver(
+            settings.ansible_host_vars_dict(), settings.ssh_host_map_dict(), settings.PROXMOX_HOST
+        ),
+        max_parallel=settings.REMEDIATION_MAX_PARALLEL,
+        output_store=OutputStore(settings.REMEDIATION_OUTPUT_MAX_RUNS, settings.REMEDIATION_OUTPUT_MAX_LINES),
+        background_workers=settings.REMEDIATION_BACKGROUND_WORKERS,
+        verifier=audit_service.verify_check if settings.REMEDIATION_VERIFY else None,
     )
-    return proxmox_service, audit_service, automation_service
+    return proxmox_service, audit_service, automation_service, startup_error, startup_warnings
 
 
-proxmox_service, audit_service, automation_service = _create_services()
+def _monitor_clusters(service: ProxmoxServiceProtocol) -> dict[str, ProxmoxServiceProtocol]:
+    """Map cluster name -> provider for the connectivity monitor."""
+    if isinstance(service, ProxmoxHybridService):
+        return service.clusters()
+    if isinstance(service, ProxmoxRealService):
+        return {service.host: service}
+    return {"mock": service}
+
+
+event_bus = EventBus(buffer_size=get_settings().EVENT_BUFFER_SIZE)
+proxmox_service, audit_service, automation_service, _startup_error, _startup_warnings = _create_services(event_bus)
 app.state.audit_service = audit_service
 app.state.automation_service = automation_service
 app.state.proxmox_service = proxmox_service
+app.state.event_bus = event_bus
+app.state.report_cache = ReportCache(get_settings().REPORT_CACHE_DIR, get_settings().REPORT_CACHE_MAX_FILES)
+app.state.readiness = ReadinessState()
+for _warning in _startup_warnings:
+    app.state.readiness.add_warning(_warning)
+app.state.connectivity_monitor = ConnectivityMonitor(
+    _monitor_clusters(proxmox_service),
+    interval_seconds=get_settings().HEALTH_PROBE_INTERVAL_SECONDS,
+)
 
 app.include_router(router)
 
 
+def _warmup_proxmox() -> dict:
+    """First connectivity probe (runs on the warm-up thread); raises until a cluster is reachable."""
+    snapshot = app.state.connectivity_monitor.probe_once()
+    if not snapshot["connected"]:
+        raise ConnectionError(snapshot["error"] or "no Proxmox cluster reachable")
+    nodes = snapshot["nodes"]
+    logger.info("Proxmox connection OK; nodes=%s", nodes[:10] if len(nodes) > 10 else nodes)
+    return {"nodes": len(nodes)}
+
+
 @app.on_event("startup")
-async def startup_validate():
-    """Validate Proxmox connectivity in real/hybrid modes; log and degrade to mock on failure."""
+async def startup_warmup():
+    """Start background warm-up and connectivity monitoring; requests (and /livez) are served immediately."""
+    app.state.event_bus.bind_loop(asyncio.get_running_loop())
+    readiness: ReadinessState = app.state.readiness
+    monitor: ConnectivityMonitor = app.state.connectivity_monitor
     settings = get_settings()
     mode = (settings.PROXMOX_MODE or "mock").lower()
-    if mode not in ("real", "hybrid"):
+    if _startup_error or mode not in ("real", "hybrid"):
+        monitor.probe_once()  # provider is (or fell back to) mock: no network I/O
+        monitor.start()
+        if _startup_error:
+            readiness.mark_degraded(_startup_error, mode=mode)
+        else:
+            readiness.mark_ready(mode=mode)
         return
-    try:
-        settings.validate_for_mode()
-        svc = app.state.proxmox_service
-        nodes = svc.get_all_nodes()
-        logger.info("Startup: Proxmox OK, nodes=%s", len(nodes))
-    except Exception as e:
-        logger.warning("Startup: Proxmox validation failed (services already fallback to mock): %s", e)
+    runner = WarmupRunner(
+        readiness,
+        _warmup_proxmox,
+        max_backoff_seconds=settings.WARMUP_MAX_BACKOFF_SECONDS,
+        on_ready=monitor.start,
+    )
+    app.state.warmup_runner = runner
+    runner.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_warmup():
+    """Stop warm-up retries and connectivity monitoring and close pooled connections on shutdown."""
+    runner = getattr(app.state, "warmup_runner", None)
+    if runner is not None:
+        runner.stop()
+    app.state.connectivity_monitor.stop()
+    close = getattr(app.state.proxmox_service, "close", None)
+    if close is not None:
+        close()
@@ -0,0 +1,112 @@
+"""Unit tests for the registry-based audit engine."""
+
+import asyncio
+import time
+
+from app.core.audit_engine import ALL_CHECKS, AuditEngine, CheckDefinition, default_engine
+from app.models.check import ComplianceMapping
+
+
+class TestCheckCatalog:
+    """Versioned check catalog."""
+
+    def test_catalog_lists_all_checks(self):
+        catalog = default_engine.get_catalog()
+        assert [c.check_id for c in catalog.checks] == [c.check_id for c in ALL_CHECKS]
+        assert len(catalog.version) == 16
+
+    def test_catalog_version_is_stable_and_content_based(self):
+        engine = AuditEngine()
+        for check_def in ALL_CHECKS:
+            engine.register_check(check_def)
+        assert engine.get_catalog().version == default_engine.get_catalog().version
+        engine.register_check(
+            CheckDefinition(
+                check_id="custom_check",
+                check_name="Custom",
+                category="ACCESS_CONTROL",
+                severity="MEDIUM",
+                compliance_mapping=ComplianceMapping(iso_27001=["A.5.15"], bsi_grundschutz=[]),
+                validator_func=lambda config: True,
+                remediation_template=None,
+            )
+        )
+        assert engine.get_catalog().version != default_engine.get_catalog().version
+
+
+def _check(check_id: str, validator, **kwargs) -> CheckDefinition:
+    return CheckDefinition(
+        check_id=check_id,
+        check_name=check_id.title(),
+        category="ACCESS_CONTROL",
+        severity="MEDIUM",
+        compliance_mapping=ComplianceMapping(iso_27001=["A.5.15"], bsi_grundschutz=[]),
+        validator_func=validator,
+        remediation_template=None,
+        **kwargs,
+    )
+
+
+class TestCheckExecution:
+    """Async validators, per-check timeouts and error isolation."""
+
+    def test_sync_checks_report_duration(self):
+        results = default_engine.execute_checks({})
+        assert all(r.status in ("PASS", "FAIL") for r in results)
+        assert all(r.duration_ms is not None and r.duration_ms >= 0 for r in results)
+
+    def test_raising_validator_yields_error_without_aborting(self):
+        engine = AuditEngine()
+        engine.register_check(_check("boom", lambda config: config["missing"]))
+        engine.register_check(_check("ok", lambda config: True))
+        boom, ok = engine.execute_checks({})
+        assert boom.status == "ERROR" and "KeyError" in boom.details
+        assert boom.remediation is None
+        assert ok.status == "PASS"
+
+    def test_async_validators_run_concurrently(self):
+        async def slow(config: dict) -> bool:
+            await asyncio.sleep(0.2)
+            return True
+
+        engine = AuditEngine()
+        for i in range(5):
+            engine.register_check(_check(f"slow_{i}", slow))
+        engine.register_check(_check("plain", lambda config: False))
+        start = time.perf_counter()
+        results = engine.execute_checks({})
+        assert time.perf_counter() - start < 0.6
+        assert [r.status for r in results] == ["PASS"] * 5 + ["FAIL"]
+
+    def test_timeout_marks_only_the_slow_check(self):
+        async def hangs(config: dict) -> bool:
+            await asyncio.sleep(5)
+            return True
+
+        def blocks(config: dict) -> bool:
+            time.sleep(3)
+            return True
+
+        engine = AuditEngine(default_timeout_seconds=5)
+        engine.register_check(_check("hangs", hangs, timeout_seconds=0.05))
+        engine.register_check(_check("blocking", lambda config: True, blocking=True))
+        engine.register_check(_check("blocks", blocks, blocking=True, timeout_seconds=0.1))
+        start = time.perf_counter()
+        hung, blocking, blocked = engine.execute_checks({})
+        assert time.perf_counter() - start < 1.0  # the hung worker thread is not waited for
+        assert hung.status == "ERROR" and "timed out after 0.05s" in hung.details
+        assert blocked.status == "ERROR" and "timed out after 0.1s" in blocked.details
+        assert blocking.status == "PASS"
+        engine.close()
+
+    def test_runs_inside_a_running_event_loop(self):
+        async def ok(config: dict) -> bool:
+            return True
+
+        engine = AuditEngine()
+        engine.register_check(_check("ok", ok))
+
+        async def main():
+            return engine.execute_checks({})
+
+        assert asyncio.run(main())[0].status == "PASS"
@@ -0,0 +1,119 @@
+"""Unit tests for stale-while-revalidate serving in AuditService."""
+
+import time
+
+import pytest
+
+from app.core.audit_engine import default_engine
+from app.services.audit_service import AuditService
+from app.services.proxmox_mock import ProxmoxMockService
+
+
+class _FlakyMock(ProxmoxMockService):
+    """Mock provider that raises ConnectionError while `down` is set."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        super().__init__()
+        self.down = False
+        self.delay = delay  # seconds a failing fetch blocks before raising (e.g. connect timeout)
+        self.config_calls = 0
+
+    def get_all_nodes(self) -> list[str]:
+        if self.down:
+            raise ConnectionError("cluster unreachable")
+        return super().get_all_nodes()
+
+    def get_node_config(self, node_id: str) -> dict:
+        self.config_calls += 1
+        if self.down:
+            time.sleep(self.delay)
+            raise ConnectionError("cluster unreachable")
+        return super().get_node_config(node_id)
+
+
+def _wait_until(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestStaleServing:
+    """Last known good results and background refresh."""
+
+    def test_failure_serves_last_known_good_with_error(self):
+        prox = _FlakyMock()
+        service = AuditService(prox, default_engine)
+        fresh = service.get_node_audit("customer-a-node")
+        assert fresh.stale is False
+
+        prox.down = True
+        stale = service.get_node_audit("customer-a-node")
+        assert stale.stale is True
+        assert stale.last_error == "cluster unreachable"
+        assert stale.age_seconds is not None
+        assert stale.compliance_score == fresh.compliance_score
+
+    def test_failure_without_history_raises(self):
+        prox = _FlakyMock()
+        prox.down = True
+        with pytest.raises(ConnectionError):
+            AuditService(prox, default_engine).get_node_audit("customer-a-node")
+
+    def test_unknown_node_is_not_masked(self):
+        with pytest.raises(ValueError):
+            AuditService(_FlakyMock(), default_engine).get_node_audit("no-such-node")
+
+    def test_expired_result_is_served_stale_and_refreshed(self):
+        prox = _FlakyMock()
+        service = AuditService(prox, default_engine, cache_ttl_seconds=0.05, stale_max_age_seconds=60)
+        first = service.get_node_audit("customer-a-node")
+        assert service.get_node_audit("customer-a-node") is first
+        time.sleep(0.06)
+
+        served = service.get_node_audit("customer-a-node")
+        assert served.stale is True
+        assert served.last_error is None
+        _wait_until(lambda: prox.config_calls == 2 and not service._refreshing)
+        refreshed = service.get_node_audit("customer-a-node")
+        assert refreshed.stale is False
+        assert refreshed.timestamp > first.timestamp
+
+    def test_failing_node_is_served_immediately_and_retried_with_backoff(self):
+        prox = _FlakyMock(delay=0.3)
+        service = AuditService(prox, default_engine, failure_backoff_seconds=0.5)
+        fresh = service.get_node_audit("customer-a-node")
+        prox.down = True
+        assert service.get_node_audit("customer-a-node").stale is True  # blocks once on the fetch
+        calls = prox.config_calls
+
+        start = time.perf_counter()
+        stale = service.get_node_audit("customer-a-node")
+        assert time.perf_counter() - start < 0.1
+        assert stale.stale is True and stale.last_error == "cluster unreachable"
+        assert stale.compliance_score == fresh.compliance_score
+        assert prox.config_calls == calls  # within backoff: no foreground or background retry
+
+        time.sleep(0.5)
+        start = time.perf_counter()
+        assert service.get_node_audit("customer-a-node").stale is True
+        assert time.perf_counter() - start < 0.1
+        _wait_until(lambda: prox.config_calls == calls + 1 and not service._refreshing)
+        assert service._failures["customer-a-node"][0] == 2  # background retry failed: backoff doubled
+
+        prox.down = False
+        service._failures["customer-a-node"] = (2, 0.0)  # backoff elapsed
+        service.get_node_audit("customer-a-node")
+        _wait_until(lambda: "customer-a-node" not in service._failures)
+        assert service.get_node_audit("customer-a-node").stale is False
+
+    def test_fleet_summary_flags_stale_nodes(self):
+        prox = _FlakyMock()
+        service = AuditService(prox, default_engine)
+        total = service.get_fleet_summary().total_nodes
+
+        prox.down = True
+        summary = service.get_fleet_summary()
+        assert summary.total_nodes == total
+        assert summary.stale is True
+        assert sorted(summary.stale_nodes) == sorted(n.node_id for n in summary.nodes)
+        assert summary.last_error == "cluster unreachable"
@@ -0,0 +1,121 @@
+"""Unit tests for the incremental backup volume index and retention summary."""
+
+from app.core.audit_engine import default_engine
+from app.services.backup_index import BackupIndex, BackupVolume, summarize_node_backups
+
+DAY = 86400
+NOW = 1_700_000_000
+
+
+class _FakeStorageApi:
+    """Stand-in for px.nodes(node).storage[...]: storage status and backup content listings."""
+
+    def __init__(self) -> None:
+        self.storages: dict[str, dict] = {}  # name -> {"shared", "used", "total", "content": [...]}
+        self.content_calls: list[str] = []
+
+    def nodes(self, node: str) -> "_FakeStorageApi":
+        return self
+
+    @property
+    def storage(self) -> "_StorageEndpoint":
+        return _StorageEndpoint(self)
+
+
+class _StorageEndpoint:
+    def __init__(self, api: _FakeStorageApi, name: str | None = None) -> None:
+        self._api = api
+        self._name = name
+        self.content = self
+
+    def __call__(self, name: str) -> "_StorageEndpoint":
+        return _StorageEndpoint(self._api, name)
+
+    def get(self, content: str = "backup") -> list[dict]:
+        if self._name is None:
+            return [
+                {"storage": name, "shared": s.get("shared", 0), "used": s["used"], "total": 1000, "active": 1}
+                for name, s in self._api.storages.items()
+            ]
+        self._api.content_calls.append(self._name)
+        return list(self._api.storages[self._name]["content"])
+
+
+def _archive(vmid: int, days_ago: float) -> dict:
+    return {
+        "volid": f"pbs:backup/vm/{vmid}/{int(days_ago * 10)}",
+        "vmid": vmid,
+        "ctime": int(NOW - days_ago * DAY),
+        "size": 1,
+    }
+
+
+class TestBackupIndex:
+    """Storages are re-listed only when their usage changes."""
+
+    def test_unchanged_storage_is_not_relisted(self):
+        api = _FakeStorageApi()
+        api.storages["pbs"] = {"shared": 1, "used": 10, "content": [_archive(100, 1), _archive(100, 8)]}
+        index = BackupIndex(lambda: api)
+        assert len(index.node_backups("pve1")) == 2
+        assert len(index.node_backups("pve2")) == 2  # shared storage: indexed once
+        assert api.content_calls == ["pbs"]
+
+    def test_changed_usage_diffs_new_and_removed_volumes(self):
+        api = _FakeStorageApi()
+        first, second = _archive(100, 1), _archive(100, 8)
+        api.storages["local"] = {"used": 10, "content": [first, second]}
+        index = BackupIndex(lambda: api)
+        before = {v.volid: v for v in index.node_backups("pve1")}
+
+        api.storages["local"] = {"used": 11, "content": [first, _archive(100, 0.1)]}
+        after = {v.volid: v for v in index.node_backups("pve1")}
+
+        assert (index.listings, index.added, index.removed) == (2, 3, 1)
+        assert after[first["volid"]] is before[first["volid"]]
+        assert second["volid"] not in after
+
+    def test_listing_expires_after_max_age(self):
+        api = _FakeStorageApi()
+        api.storages["local"] = {"used": 10, "content": [_archive(100, 1)]}
+        index = BackupIndex(lambda: api, max_listing_age_seconds=0)
+        index.node_backups("pve1")
+        index.node_backups("pve1")
+        assert api.content_calls == ["local", "local"]
+
+
+class TestSummarizeNodeBackups:
+    """Retention and recency per node from indexed volumes."""
+
+    @staticmethod
+    def _vol(vmid: int, days_ago: float) -> BackupVolume:
+        return BackupVolume(volid=f"v{vmid}-{days_ago}", storage="pbs", vmid=vmid, ctime=int(NOW - days_ago * DAY))
+
+    def test_weakest_guest_determines_retention(self):
+        volumes = [self._vol(100, 0.5), self._vol(100, 14), self._vol(101, 1), self._vol(101, 3)]
+        summary = summarize_node_backups(volumes, [100, 101], now=NOW)
+        assert summary["backup_retention_days"] == 3
+        assert summary["backup_last_age_hours"] == 24.0
+        assert summary["backup_guests_without_recent_backup"] == []
+
+    def test_guest_without_backup_fails_retention(self):
+        summary = summarize_node_backups([self._vol(100, 1), self._vol(100, 10)], [100, 102], now=NOW)
+        assert summary["backup_retention_days"] == 0
+        assert summary["backup_guests_without_recent_backup"] == [102]
+
+    def test_stale_guest_is_reported(self):
+        summary = summarize_node_backups([self._vol(100, 3), self._vol(100, 9)], [100], now=NOW)
+        assert summary["backup_retention_days"] == 9
+        assert summary["backup_guests_without_recent_backup"] == [100]
+
+    def test_guest_whose_backups_stopped_fails_retention_check(self):
+        # Long retention (30 days) but guest 101's newest archive is 20 days old
+        volumes = [self._vol(100, 0.5), self._vol(100, 30), self._vol(101, 20), self._vol(101, 30)]
+        summary = summarize_node_backups(volumes, [100, 101], now=NOW, max_backup_age_hours=48)
+        assert summary["backup_retention_days"] == 30
+        result = default_engine.execute_check("backup_retention", summary)
+        assert result.status == "FAIL"
+        assert "no backup within 48h for guest(s) 101" in result.details
+
+        fresh = summarize_node_backups(volumes[:2], [100], now=NOW, max_backup_age_hours=48)
+        assert default_engine.execute_check("backup_retention", fresh).status == "PASS"
@@ -0,0 +1,239 @@
+"""Unit tests for the fleet change log (delta sync)."""
+
+import json
+import threading
+import time
+
+from app.core.audit_engine import default_engine
+from app.models.check import FleetChanges, NodeAuditResult
+from app.services.audit_service import AuditService
+from app.services.change_tracker import ChangeLogFollower, FleetChangeLog
+from app.services.proxmox_mock import ProxmoxMockService
+from app.services.state_backend import SQLiteStateBackend
+
+
+def _audit(node_id: str, **overrides):
+    prox = ProxmoxMockService()
+    config = prox.get_node_config(node_id)
+    config.update(overrides)
+    check_results = default_engine.execute_checks(config)
+    passed = sum(1 for r in check_results if r.status == "PASS")
+    return NodeAuditResult(
+        node_id=node_id,
+        node_name=node_id,
+        compliance_score=int(passed / len(check_results) * 100),
+        total_checks=len(check_results),
+        passed_checks=passed,
+        failed_checks=len(check_results) - passed,
+        check_results=check_results,
+    )
+
+
+class _SlowLogBackend(SQLiteStateBackend):
+    """Holds the version-bump + log-append transaction open for `delay` seconds."""
+
+    delay = 0.0
+
+    def incr_and_append(self, counter_key, list_key, make_value, max_len):
+        def slow(version):
+            time.sleep(self.delay)
+            return make_value(version)
+
+        return super().incr_and_append(counter_key, list_key, slow, max_len)
+
+
+class TestFleetChangeLog:
+    """Versioning and change collapsing."""
+
+    def test_unchanged_result_does_not_bump_version(self):
+        log = FleetChangeLog()
+        assert log.record(_audit("customer-a-node")) == 1
+        assert log.record(_audit("customer-a-node")) is None
+        assert log.version == 1
+
+    def test_updated_node_lists_changed_checks(self):
+        log = FleetChangeLog()
+        log.record(_audit("customer-a-node"))
+        log.record(_audit("customer-b-node"))
+        since = log.version
+        log.record(_audit("customer-a-node", firewall_enabled=True))
+        delta = log.changes_since(since)
+        assert delta.full_resync is False
+        assert [c.node_id for c in delta.changes] == ["customer-a-node"]
+        change = delta.changes[0]
+        assert change.change_type == "updated"
+        assert change.changed_checks == ["firewall_enabled"]
+        assert change.previous_score == 40
+        assert change.node.compliance_score == 50
+
+    def test_removed_node(self):
+        log = FleetChangeLog()
+        log.record(_audit("customer-a-node"))
+        log.record(_audit("customer-b-node"))
+        since = log.version
+        log.sync_membership(["customer-b-node"])
+        delta = log.changes_since(since)
+        assert [(c.node_id, c.change_type, c.node) for c in delta.changes] == [("customer-a-node", "removed", None)]
+
+    def test_expired_since_requires_full_resync(self):
+        log = FleetChangeLog(max_entries=2)
+        for node_id in ("customer-a-node", "customer-b-node", "customer-c-node"):
+            log.record(_audit(node_id))
+        assert log.changes_since(0).full_resync is True
+        assert log.changes_since(1).full_resync is False
+        assert log.changes_since(99).full_resync is True
+
+    def test_poll_during_record_never_skips_the_entry(self, tmp_path):
+        backend = _SlowLogBackend(str(tmp_path / "state.db"))
+        log = FleetChangeLog(backend)
+        log.record(_audit("customer-a-node"))
+        since = log.version
+        backend.delay = 0.3
+        writer = threading.Thread(target=log.record, args=(_audit("customer-a-node", firewall_enabled=True),))
+        writer.start()
+        time.sleep(0.1)
+        during = FleetChangeLog(SQLiteStateBackend(str(tmp_path / "state.db"))).changes_since(since)
+        writer.join()
+        assert during.version == since and during.changes == []
+        after = log.changes_since(during.version)
+        assert after.version == since + 1
+        assert [c.changed_checks for c in after.changes] == [["firewall_enabled"]]
+
+    def test_concurrent_writers_keep_log_in_version_order(self, tmp_path):
+        path = str(tmp_path / "state.db")
+        base = _audit("customer-a-node")
+        seen: set[str] = set()
+        done = threading.Event()
+
+        def write(worker: int) -> None:
+            log = FleetChangeLog(SQLiteStateBackend(path))
+            for i in range(10):
+                log.record(base.model_copy(update={"node_id": f"w{worker}-n{i}"}))
+
+        def poll() -> None:
+            log, since = FleetChangeLog(SQLiteStateBackend(path)), 0
+            while True:
+                finished = done.is_set()
+                delta = log.changes_since(since)
+                seen.update(c.node_id for c in delta.changes)
+                since = delta.version
+                if finished:
+                    return
+
+        poller = threading.Thread(target=poll)
+        poller.start()
+        writers = [threading.Thread(target=write, args=(w,)) for w in range(4)]
+        for t in writers:
+            t.start()
+        for t in writers:
+            t.join()
+        done.set()
+        poller.join()
+        versions = [json.loads(raw)["version"] for raw in SQLiteStateBackend(path).list_items("fleet:changes")]
+        assert versions == list(range(1, 41))
+        assert len(seen) == 40
+
+    def test_workers_sharing_a_backend_record_each_change_once(self, tmp_path):
+        path = str(tmp_path / "state.db")
+        worker_a, worker_b = FleetChangeLog(SQLiteStateBackend(path)), FleetChangeLog(SQLiteStateBackend(path))
+        assert worker_a.record(_audit("customer-a-node")) == 1
+        assert worker_b.record(_audit("customer-a-node")) is None
+        worker_b.record(_audit("customer-b-node"))
+        worker_a.record(_audit("customer-c-node"))
+        assert worker_b.members() == ["customer-a-node", "customer-b-node", "customer-c-node"]
+
+        since = worker_a.version
+        worker_a.sync_membership(["customer-b-node", "customer-c-node"])
+        worker_b.sync_membership(["customer-b-node", "customer-c-node"])
+        assert worker_b.version == since + 1
+        assert [c.change_type for c in worker_b.changes_since(since).changes] == ["removed"]
+
+
+class _Scores(ChangeLogFollower):
+    def __init__(self, change_log: FleetChangeLog) -> None:
+        super().__init__(change_log)
+        self.scores: dict[str, int] = {}
+
+    def _apply(self, result: NodeAuditResult) -> None:
+        self.scores[result.node_id] = result.compliance_score
+
+    def _remove(self, node_id: str) -> None:
+        self.scores.pop(node_id, None)
+
+    def _reset(self) -> None:
+        self.scores.clear()
+
+    def read(self) -> dict[str, int]:
+        with self._lock:
+            self._catch_up()
+            return dict(self.scores)
+
+
+class TestChangeLogFollower:
+    """Direct applies of the next version and catch-up of everything else."""
+
+    def test_applies_next_version_and_catches_up_on_read(self):
+        log = FleetChangeLog()
+        follower = _Scores(log)
+        follower.on_recorded(_audit("customer-a-node"), log.record(_audit("customer-a-node")))
+        assert follower.scores == {"customer-a-node": 40} and follower._version == 1
+        log.record(_audit("customer-b-node"))  # recorded elsewhere: not seen until the next read
+        log.record(_audit("customer-a-node", firewall_enabled=True))
+        follower.on_recorded(_audit("customer-a-node", firewall_enabled=True), log.version)  # out of order: skipped
+        assert follower._version == 1
+        log.sync_membership(["customer-a-node"])
+        assert follower.read() == {"customer-a-node": 50}
+        assert follower._version == log.version
+
+    def test_full_resync_resets_state(self):
+        log = FleetChangeLog(max_entries=1)
+        follower = _Scores(log)
+        follower.scores["stale-node"] = 0
+        log.record(_audit("customer-a-node"))
+        log.record(_audit("customer-b-node"))
+        assert set(follower.read()) == {"customer-a-node", "customer-b-node"}
+
+
+    def test_read_during_record_keeps_the_recorded_result(self, tmp_path):
+        backend = _SlowLogBackend(str(tmp_path / "state.db"))
+        log = FleetChangeLog(backend)
+        follower = _Scores(log)
+        follower.on_recorded(_audit("customer-a-node"), log.record(_audit("customer-a-node")))
+        backend.delay = 0.3
+        updated = _audit("customer-a-node", firewall_enabled=True)
+        versions = []
+        writer = threading.Thread(target=lambda: versions.append(log.record(updated)))
+        writer.start()
+        time.sleep(0.1)
+        assert follower.read() == {"customer-a-node": 40}
+        writer.join()
+        follower.on_recorded(updated, versions[0])
+        assert follower.scores == {"customer-a-node": 50} and follower._version == versions[0]
+
+    def test_does_not_advance_past_missing_entries(self):
+        class _Lagging(FleetChangeLog):
+            """Counter already bumped, entry not visible yet."""
+
+            version = 2
+
+            def changes_since(self, since):
+                return FleetChanges(since=since, version=2, full_resync=False, changes=[])
+
+        follower = _Scores(_Lagging())
+        follower._version = 1
+        assert follower.read() == {}
+        assert follower._version == 1
+        follower.on_recorded(_audit("customer-a-node"), 2)
+        assert follower.scores == {"customer-a-node": 40}
+
+
+class TestAuditServiceChanges:
+    """Delta sync through AuditService."""
+
+    def test_fleet_version_and_empty_delta(self):
+        svc = AuditService(proxmox_service=ProxmoxMockService(), audit_engine=default_engine)
+        summary = svc.get_fleet_summary()
+        assert summary.version == 3
+        delta = svc.get_fleet_changes(summary.version)
+        assert delta.changes == []
+        assert delta.version == summary.version
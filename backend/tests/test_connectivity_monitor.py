@@ -0,0 +1,53 @@
+"""Unit tests for the cached Proxmox connectivity monitor."""
+
+from unittest.mock import MagicMock
+
+from app.services.connectivity_monitor import ConnectivityMonitor
+from app.services.proxmox_mock import ProxmoxMockService
+
+
+class TestConnectivityMonitor:
+    """Probe rounds and cached snapshots."""
+
+    def test_snapshot_before_first_probe(self):
+        monitor = ConnectivityMonitor({"mock": ProxmoxMockService()})
+        snap = monitor.snapshot()
+        assert snap["connected"] is False
+        assert snap["nodes"] == []
+        assert snap["last_checked"] is None
+
+    def test_probe_uses_node_statuses_when_available(self):
+        real = MagicMock()
+        real.get_node_statuses.return_value = {"pve1": "online", "pve2": "offline"}
+        monitor = ConnectivityMonitor({"pve.example.com": real, "mock": ProxmoxMockService()})
+        snap = monitor.probe_once()
+        assert snap["connected"] is True
+        assert "pve2" in snap["nodes"]
+        assert snap["nodes_online"] == 4  # pve1 + three mock nodes
+        cluster = next(c for c in snap["clusters"] if c["name"] == "pve.example.com")
+        assert cluster["latency_ms"] is not None
+        real.get_all_nodes.assert_not_called()
+
+    def test_snapshot_is_cached_between_probes(self):
+        svc = MagicMock(spec=["get_all_nodes"])
+        svc.get_all_nodes.return_value = ["pve1"]
+        monitor = ConnectivityMonitor({"pve": svc})
+        monitor.probe_once()
+        for _ in range(10):
+            monitor.snapshot()
+        assert svc.get_all_nodes.call_count == 1
+
+    def test_failure_is_recorded_and_keeps_last_nodes(self):
+        svc = MagicMock(spec=["get_all_nodes"])
+        svc.get_all_nodes.return_value = ["pve1"]
+        monitor = ConnectivityMonitor({"pve": svc})
+        monitor.probe_once()
+        svc.get_all_nodes.side_effect = ConnectionError("timeout")
+        snap = monitor.probe_once()
+        assert snap["connected"] is False
+        assert snap["error"] == "timeout"
+        assert snap["clusters"][0]["consecutive_failures"] == 1
+        assert snap["clusters"][0]["last_success"] is not None
+        assert snap["nodes"] == ["pve1"]
+        assert snap["nodes_online"] == 0
+        assert snap["clusters"][0]["nodes"] == {"pve1": "unknown"}
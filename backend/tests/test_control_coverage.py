@@ -0,0 +1,113 @@
+"""Unit tests for the control-to-check index and node x control matrix."""
+
+import pytest
+
+from app.core.audit_engine import default_engine
+from app.services.audit_service import AuditService
+from app.services.control_coverage import control_index
+from app.services.proxmox_mock import ProxmoxMockService
+from app.services.state_backend import MemoryStateBackend
+
+
+class _FleetMock(ProxmoxMockService):
+    """Mock provider whose node list and configs can be changed between audits."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.nodes = super().get_all_nodes()
+        self.overrides: dict[str, dict] = {}
+
+    def get_all_nodes(self) -> list[str]:
+        return list(self.nodes)
+
+    def get_node_config(self, node_id: str) -> dict:
+        config = super().get_node_config(node_id)
+        config.update(self.overrides.get(node_id, {}))
+        return config
+
+
+def _expected(service: AuditService, framework: str, control_id: str, node_ids: list[str]) -> dict:
+    """Full scan of the cached results: nodes on which every mapped check passed."""
+    passed, failing = 0, []
+    for node_id in node_ids:
+        mapped = [
+            r for r in service.get_node_audit(node_id).check_results
+            if control_id in getattr(r.compliance_mapping, framework)
+        ]
+        if all(r.status == "PASS" for r in mapped):
+            passed += 1
+        else:
+            failing.append(node_id)
+    return {"assessed_nodes": len(node_ids), "passed_nodes": passed, "failing_nodes": failing}
+
+
+class TestControlIndex:
+    def test_all_frameworks_in_natural_order(self):
+        index = control_index(default_engine.get_all_checks())
+        assert {fw for fw, _, _ in index} == {"iso_27001", "bsi_grundschutz", "nis2"}
+        iso = [c for fw, c, _ in index if fw == "iso_27001"]
+        assert iso.index("A.8.2") < iso.index("A.8.13")
+        checks = {(fw, c): ids for fw, c, ids in index}
+        assert checks[("iso_27001", "A.8.13")] == ("backup_schedule", "backup_retention")
+        assert checks[("nis2", "Art.21(2)(j)")] == ("two_factor_enabled",)
+
+
+class TestControlCoverage:
+    """Coverage matches a full scan of the results after every landed audit."""
+
+    def test_control_status_matches_full_scan(self):
+        service = AuditService(_FleetMock(), default_engine)
+        nodes = ["customer-a-node", "customer-b-node", "customer-c-node"]
+        coverage = service.get_control_coverage()
+        for c in coverage.controls:
+            expected = _expected(service, c.framework, c.control_id, nodes)
+            assert c.assessed_nodes == expected["assessed_nodes"]
+            assert c.passed_nodes == expected["passed_nodes"]
+            assert c.failed_nodes == len(expected["failing_nodes"]) and c.failing_nodes == []
+        status = service.get_control_status("iso_27001", "A.8.13")
+        assert status.failing_nodes == _expected(service, "iso_27001", "A.8.13", nodes)["failing_nodes"]
+        assert status.pass_rate == round(status.passed_nodes / 3 * 100, 2)
+
+    def test_filters_by_framework_and_customer(self):
+        service = AuditService(_FleetMock(), default_engine)
+        nis2 = service.get_control_coverage(framework="nis2", customer_id="customer-c", include_nodes=True)
+        assert nis2.controls and all(c.framework == "nis2" for c in nis2.controls)
+        assert all(c.assessed_nodes == 1 for c in nis2.controls)
+        matrix = service.get_control_matrix(framework="nis2", customer_id="customer-a")
+        assert [row.node_id for row in matrix.nodes] == ["customer-a-node"]
+        assert len(matrix.nodes[0].statuses) == len(matrix.controls) == len(nis2.controls)
+        assert all(key.startswith("nis2:") for key in matrix.controls)
+
+    def test_node_audit_updates_matrix_incrementally(self):
+        prox = _FleetMock()
+        service = AuditService(prox, default_engine)
+        before = service.get_control_status("iso_27001", "A.8.2")
+        prox.overrides["customer-c-node"] = {"ssh_permit_root_login": "yes"}
+        service.get_node_audit("customer-c-node")
+        after = service.get_control_status("iso_27001", "A.8.2")
+        assert after.passed_nodes == before.passed_nodes - 1
+        assert "customer-c-node" in after.failing_nodes
+        row = service.get_control_matrix(customer_id="customer-c").nodes[0]
+        column = service.get_control_matrix().controls.index("iso_27001:A.8.2")
+        assert row.statuses[column] == "FAIL"
+
+    def test_removed_node_and_shared_backend(self):
+        backend = MemoryStateBackend()
+        prox = _FleetMock()
+        writer = AuditService(prox, default_engine, state_backend=backend)
+        reader = AuditService(prox, default_engine, state_backend=backend)
+        writer.get_fleet_summary()
+        prox.nodes.remove("customer-b-node")
+        writer.get_fleet_summary()
+        status = reader.get_control_status("bsi_grundschutz", "CON.3.1.A1")
+        assert status.assessed_nodes == 2 and "customer-b-node" not in status.failing_nodes
+        assert [row.node_id for row in reader.get_control_matrix().nodes] == ["customer-a-node", "customer-c-node"]
+
+    def test_unknown_framework_control_or_customer(self):
+        service = AuditService(_FleetMock(), default_engine)
+        with pytest.raises(ValueError, match="Framework not found"):
+            service.get_control_coverage(framework="pci")
+        with pytest.raises(ValueError, match="Control not found"):
+            service.get_control_status("iso_27001", "A.99")
+        with pytest.raises(ValueError, match="Customer not found"):
+            service.get_control_matrix(customer_id="nope")
@@ -0,0 +1,95 @@
+"""Unit tests for incrementally maintained per-customer rollups."""
+
+import pytest
+
+from app.core.audit_engine import default_engine
+from app.services.audit_service import AuditService
+from app.services.customer_rollups import customer_resolver
+from app.services.proxmox_mock import ProxmoxMockService
+from app.services.state_backend import MemoryStateBackend
+
+
+class _FleetMock(ProxmoxMockService):
+    """Mock provider whose node list and configs can be changed between audits."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.nodes = super().get_all_nodes()
+        self.overrides: dict[str, dict] = {}
+
+    def get_all_nodes(self) -> list[str]:
+        return list(self.nodes)
+
+    def get_node_config(self, node_id: str) -> dict:
+        config = super().get_node_config(node_id)
+        config.update(self.overrides.get(node_id, {}))
+        return config
+
+
+class TestCustomerResolver:
+    def test_explicit_map_then_naming_convention(self):
+        resolve = customer_resolver({"pve1": "acme"})
+        assert resolve("pve1") == "acme"
+        assert resolve("customer-a-node") == "customer-a"
+        assert resolve("pve2") == "unassigned"
+
+
+class TestCustomerRollups:
+    """Rollups match a full re-aggregation after every landed audit."""
+
+    @staticmethod
+    def _expected(service: AuditService, node_ids: list[str]) -> dict:
+        results = [service.get_node_audit(n) for n in node_ids]
+        return {
+            "total_nodes": len(results),
+            "average_compliance": round(sum(r.compliance_score for r in results) / len(results), 2),
+            "critical_nodes": sorted(r.node_id for r in results if r.compliance_score < 60),
+        }
+
+    def test_rollup_per_customer(self):
+        prox = _FleetMock()
+        service = AuditService(prox, default_engine, customer_map={"customer-b-node": "customer-a"})
+        rollups = service.get_customer_rollups()
+        assert [c.customer_id for c in rollups.customers] == ["customer-a", "customer-c"]
+        a = service.get_customer_rollup("customer-a")
+        assert a.model_dump(include={"total_nodes", "average_compliance", "critical_nodes"}) == self._expected(
+            service, ["customer-a-node", "customer-b-node"]
+        )
+        assert a.worst_nodes[0].compliance_score <= a.worst_nodes[-1].compliance_score
+        failing = sum(
+            1 for n in ("customer-a-node", "customer-b-node")
+            for r in service.get_node_audit(n).check_results if r.status == "FAIL"
+        )
+        assert sum(a.failing_checks_by_severity.values()) == failing
+
+    def test_node_audit_updates_rollup_incrementally(self):
+        prox = _FleetMock()
+        service = AuditService(prox, default_engine)
+        before = service.get_customer_rollup("customer-c")
+        prox.overrides["customer-c-node"] = {"ssh_permit_root_login": "yes", "firewall_enabled": False}
+        result = service.get_node_audit("customer-c-node")
+        after = service.get_customer_rollup("customer-c")
+        assert after.version > before.version
+        assert after.average_compliance == result.compliance_score
+        assert after.worst_nodes[0].compliance_score == result.compliance_score
+
+    def test_removed_node_leaves_its_customer(self):
+        prox = _FleetMock()
+        service = AuditService(prox, default_engine)
+        service.get_fleet_summary()
+        prox.nodes.remove("customer-b-node")
+        service.get_fleet_summary()
+        assert "customer-b" not in [c.customer_id for c in service.get_customer_rollups().customers]
+        with pytest.raises(ValueError, match="Customer not found"):
+            service.get_customer_rollup("customer-b")
+
+    def test_worker_catches_up_from_shared_backend(self):
+        backend = MemoryStateBackend()
+        prox = _FleetMock()
+        writer = AuditService(prox, default_engine, state_backend=backend)
+        reader = AuditService(prox, default_engine, state_backend=backend)
+        writer.get_fleet_summary()
+        prox.overrides["customer-a-node"] = {"ssh_permit_root_login": "yes"}
+        score = writer.get_node_audit("customer-a-node").compliance_score
+        rollup = reader.get_customer_rollup("customer-a")
+        assert rollup.average_compliance == score
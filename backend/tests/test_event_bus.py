@@ -0,0 +1,109 @@
+"""Unit tests for the event bus and audit/remediation event publishing."""
+
+import asyncio
+import threading
+
+from app.core.audit_engine import default_engine
+from app.services.audit_service import AuditService
+from app.services.automation_service import AutomationService
+from app.services.event_bus import EventBus
+from app.services.proxmox_mock import ProxmoxMockService
+
+
+class TestEventBus:
+    """Fan-out, filtering and bounded buffers."""
+
+    def test_fan_out_with_topic_filter(self):
+        async def scenario():
+            bus = EventBus()
+            bus.bind_loop(asyncio.get_running_loop())
+            all_events = bus.subscribe()
+            only_scores = bus.subscribe(["score_changed"])
+            bus.publish("node_audit_completed", {"node_id": "n1"})
+            bus.publish("score_changed", {"node_id": "n1"})
+            first = await all_events.get(timeout=1)
+            second = await all_events.get(timeout=1)
+            filtered = await only_scores.get(timeout=1)
+            nothing = await only_scores.get(timeout=0.01)
+            return first["type"], second["type"], filtered["type"], nothing
+
+        assert asyncio.run(scenario()) == ("node_audit_completed", "score_changed", "score_changed", None)
+
+    def test_slow_subscriber_drops_oldest_and_gets_overflow(self):
+        async def scenario():
+            bus = EventBus(buffer_size=2)
+            bus.bind_loop(asyncio.get_running_loop())
+            sub = bus.subscribe()
+            for i in range(5):
+                bus.publish("node_audit_completed", {"i": i})
+            overflow = await sub.get(timeout=1)
+            rest = [await sub.get(timeout=1) for _ in range(2)]
+            return overflow, [e["data"]["i"] for e in rest], sub.dropped
+
+        overflow, kept, dropped = asyncio.run(scenario())
+        assert overflow["type"] == "overflow"
+        assert overflow["data"]["dropped"] == 3
+        assert kept == [3, 4]
+        assert dropped == 3
+
+    def test_publish_from_worker_thread(self):
+        async def scenario():
+            bus = EventBus()
+            bus.bind_loop(asyncio.get_running_loop())
+            sub = bus.subscribe()
+            worker = threading.Thread(target=bus.publish, args=("remediation_status", {"status": "running"}))
+            worker.start()
+            event = await sub.get(timeout=1)
+            worker.join()
+            sub.close()
+            return event, bus.subscriber_count
+
+        event, remaining = asyncio.run(scenario())
+        assert event["data"]["status"] == "running"
+        assert remaining == 0
+
+
+class TestServiceEvents:
+    """Audit and automation services publish events."""
+
+    def test_audit_and_remediation_events(self):
+        async def scenario():
+            bus = EventBus()
+            bus.bind_loop(asyncio.get_running_loop())
+            sub = bus.subscribe()
+            prox = ProxmoxMockService()
+            AuditService(proxmox_service=prox, audit_engine=default_engine, event_bus=bus).get_node_audit(
+                "customer-a-node"
+            )
+            AutomationService(proxmox_service=prox, event_bus=bus).execute_remediation(
+                node_id="customer-a-node", check_id="ssh_root_login", ansible_snippet="x", dry_run=True
+            )
+            events = []
+            while (event := await sub.get(timeout=0.01)) is not None:
+                events.append(event)
+            return events
+
+        events = asyncio.run(scenario())
+        output = [e for e in events if e["type"] == "remediation_output"]
+        events = [e for e in events if e["type"] != "remediation_output"]
+        assert [e["type"] for e in events] == ["node_audit_completed", "remediation_status", "remediation_status"]
+        assert [e["data"]["status"] for e in events[1:]] == ["running", "skipped"]
+        assert [e["data"]["stream"] for e in output] == ["status", "stdout", "status", "exit"]
+
+    def test_critical_threshold_crossing(self):
+        async def scenario():
+            bus = EventBus()
+            bus.bind_loop(asyncio.get_running_loop())
+            sub = bus.subscribe(["score_changed", "critical_threshold_crossed"])
+            prox = ProxmoxMockService()
+            svc = AuditService(proxmox_service=prox, audit_engine=default_engine, event_bus=bus)
+            svc.get_node_audit("customer-a-node")
+            fixed = prox.get_node_config("customer-a-node")
+            fixed.update(firewall_enabled=True, two_factor_enabled=True, syslog_forwarding=True)
+            prox.get_node_config = lambda node_id: dict(fixed)
+            svc.get_node_audit("customer-a-node")
+            return [await sub.get(timeout=1) for _ in range(2)]
+
+        score, crossing = asyncio.run(scenario())
+        assert score["data"] == {"node_id": "customer-a-node", "previous_score": 40, "compliance_score": 70}
+        assert crossing["data"]["direction"] == "recovered"
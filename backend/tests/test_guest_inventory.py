@@ -0,0 +1,167 @@
+"""Unit tests for the bulk guest inventory behind VM-level checks."""
+
+import threading
+import time
+
+from app.core.audit_engine import default_engine
+from app.services.guest_inventory import GuestInventory, evaluate_guest_config, summarize_node_guests
+
+SEGMENTED = {"net0": "virtio=AA:BB:CC:DD:EE:01,bridge=vmbr0,firewall=1,tag=20", "cores": 2, "memory": 2048}
+UNTAGGED = {"net0": "virtio=AA:BB:CC:DD:EE:02,bridge=vmbr0,firewall=1", "cores": 2, "memory": 2048}
+NO_LIMITS = {"net0": "name=eth0,bridge=vmbr0,firewall=1,tag=30"}
+
+
+class _FakeProxmox:
+    """Minimal proxmoxer stand-in: /cluster/resources plus per-guest config, counting fetches."""
+
+    def __init__(self, guests: dict[int, tuple[str, str, dict]], delay: float = 0.0) -> None:
+        self.guests = guests  # vmid -> (node, type, config)
+        self.delay = delay
+        self.fetches: list[int] = []
+        self.denied: set[int] = set()  # vmids whose config fetch fails (e.g. missing VM.Audit)
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self.cluster = self
+        self.resources = self
+
+    def get(self, type: str = "vm") -> list[dict]:
+        return [
+            {"vmid": vmid, "node": node, "type": kind, "name": f"g{vmid}", "maxmem": cfg.get("memory", 0)}
+            for vmid, (node, kind, cfg) in self.guests.items()
+        ]
+
+    def nodes(self, node: str) -> "_FakeNode":
+        return _FakeNode(self, node)
+
+    def fetch(self, vmid: int) -> dict:
+        with self._lock:
+            self.fetches.append(vmid)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if vmid in self.denied:
+            raise PermissionError("403 Permission check failed (/vms/%d, VM.Audit)" % vmid)
+        cfg = dict(self.guests[vmid][2])
+        cfg.setdefault("digest", str(hash(repr(sorted(cfg.items())))))
+        return cfg
+
+
+class _FakeNode:
+    def __init__(self, api: _FakeProxmox, node: str) -> None:
+        self._api = api
+
+    def __getattr__(self, guest_type: str):
+        api = self._api
+
+        class _Guest:
+            def __init__(self, vmid: int) -> None:
+                self.config = self
+                self._vmid = vmid
+
+            def get(self) -> dict:
+                return api.fetch(self._vmid)
+
+        return _Guest
+
+
+class TestEvaluateGuestConfig:
+    """Per-guest rules."""
+
+    def test_tagged_firewalled_limited_guest_passes(self):
+        findings = evaluate_guest_config(100, "pve1", "qemu", SEGMENTED)
+        assert findings.segmented and findings.resource_limits
+        assert findings.issues == ()
+
+    def test_untagged_nic_and_missing_limits_are_reported(self):
+        assert not evaluate_guest_config(101, "pve1", "qemu", UNTAGGED).segmented
+        no_limits = evaluate_guest_config(102, "pve1", "lxc", NO_LIMITS)
+        assert no_limits.segmented
+        assert not no_limits.resource_limits
+
+    def test_node_summary(self):
+        findings = [
+            evaluate_guest_config(100, "pve1", "qemu", SEGMENTED),
+            evaluate_guest_config(101, "pve1", "qemu", UNTAGGED),
+        ]
+        summary = summarize_node_guests(findings)
+        assert summary["vm_network_segmentation"] is False
+        assert summary["vm_resource_limits"] is True
+        assert list(summary["vm_guest_issues"]) == ["qemu/101"]
+        assert summarize_node_guests([])["vm_network_segmentation"] is True
+
+
+class TestGuestInventory:
+    """Bulk listing, concurrency cap and incremental refresh."""
+
+    def test_findings_grouped_by_node(self):
+        api = _FakeProxmox({100: ("pve1", "qemu", SEGMENTED), 200: ("pve2", "lxc", NO_LIMITS)})
+        inventory = GuestInventory(lambda: api)
+        assert [f.vmid for f in inventory.node_findings("pve1")] == [100]
+        assert [f.vmid for f in inventory.node_findings("pve2")] == [200]
+        assert len(api.fetches) == 2  # one listing serves both nodes
+
+    def test_fetch_concurrency_is_capped(self):
+        api = _FakeProxmox({vmid: ("pve1", "qemu", SEGMENTED) for vmid in range(40)}, delay=0.01)
+        GuestInventory(lambda: api, max_workers=4).refresh()
+        assert len(api.fetches) == 40
+        assert api.max_active <= 4
+
+    def test_refresh_only_fetches_new_and_changed_guests(self):
+        api = _FakeProxmox({100: ("pve1", "qemu", SEGMENTED), 101: ("pve1", "qemu", UNTAGGED)})
+        inventory = GuestInventory(lambda: api)
+        inventory.refresh()
+        api.fetches.clear()
+
+        api.guests[101] = ("pve1", "qemu", {**UNTAGGED, "memory": 4096})  # resize changes maxmem
+        api.guests[102] = ("pve1", "lxc", NO_LIMITS)
+        del api.guests[100]
+        stats = inventory.refresh()
+
+        assert sorted(api.fetches) == [101, 102]
+        assert (stats.fetched, stats.reused, stats.removed) == (2, 0, 1)
+        assert sorted(f.vmid for f in inventory.node_findings("pve1")) == [101, 102]
+
+    def test_unchanged_guests_are_refetched_after_max_age(self):
+        api = _FakeProxmox({100: ("pve1", "qemu", SEGMENTED)})
+        inventory = GuestInventory(lambda: api, max_config_age_seconds=0)
+        inventory.refresh()
+        inventory.refresh()
+        assert api.fetches == [100, 100]
+
+    def test_node_refresh_picks_up_nic_edit_without_marker_change(self):
+        api = _FakeProxmox({100: ("pve1", "qemu", UNTAGGED), 200: ("pve2", "qemu", UNTAGGED)})
+        inventory = GuestInventory(lambda: api)
+        inventory.refresh()
+        api.fetches.clear()
+        api.guests[100] = ("pve1", "qemu", SEGMENTED)  # VLAN tag added: /cluster/resources unchanged
+        api.guests[200] = ("pve2", "qemu", SEGMENTED)
+        inventory.refresh()
+        assert api.fetches == [] and not inventory.node_findings("pve1")[0].segmented
+
+        inventory.refresh("pve1")
+        assert api.fetches == [100]
+        assert inventory.node_findings("pve1")[0].segmented
+        assert not inventory.node_findings("pve2")[0].segmented
+
+    def test_unreadable_guest_fails_closed(self):
+        api = _FakeProxmox({100: ("pve1", "qemu", SEGMENTED), 101: ("pve1", "qemu", SEGMENTED)})
+        api.denied.add(101)
+        inventory = GuestInventory(lambda: api)
+        assert [f.vmid for f in inventory.node_findings("pve1")] == [100]
+        assert list(inventory.node_unreadable("pve1")) == ["qemu/101"]
+        assert inventory.node_vmids("pve1") == [100, 101]
+
+        summary = summarize_node_guests(inventory.node_findings("pve1"), inventory.node_unreadable("pve1"))
+        assert summary["vm_network_segmentation"] is False and summary["vm_resource_limits"] is False
+        assert "qemu/101" in summary["vm_inventory_error"] and summary["vm_guest_count"] == 2
+        assert default_engine.evaluate_check("vm_network_segmentation", summary) == "ERROR"
+        assert default_engine.evaluate_check("vm_resource_limits", summary) == "ERROR"
+
+        api.denied.clear()
+        inventory.refresh()
+        assert inventory.node_unreadable("pve1") == {}
+        summary = summarize_node_guests(inventory.node_findings("pve1"), inventory.node_unreadable("pve1"))
+        assert default_engine.evaluate_check("vm_network_segmentation", summary) == "PASS"
@@ -0,0 +1,73 @@
+"""Unit tests for the audit history log and streaming bulk export."""
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from starlette.responses import StreamingResponse
+
+from app.core.audit_engine import default_engine
+from app.services.audit_service import AuditService
+from app.services.history_export import CHECK_COLUMNS, NODE_COLUMNS
+from app.services.proxmox_mock import ProxmoxMockService
+from app.services.state_backend import MemoryStateBackend, SQLiteStateBackend
+
+
+def _service(backend=None) -> AuditService:
+    service = AuditService(ProxmoxMockService(), default_engine, state_backend=backend or MemoryStateBackend())
+    for node_id in ("customer-a-node", "customer-b-node"):
+        service.get_node_audit(node_id)
+    return service
+
+
+class TestHistoryExport:
+    """Row content, filtering and formats."""
+
+    def test_check_level_csv_has_one_row_per_check_outcome(self):
+        service = _service()
+        chunks, media_type = service.export_history("csv", "check")
+        rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+        assert media_type.startswith("text/csv")
+        assert tuple(rows[0]) == CHECK_COLUMNS
+        assert len(rows) - 1 == 2 * len(default_engine.get_all_checks())
+        assert {r[2] for r in rows[1:]} == {"customer-a", "customer-b"}
+
+    def test_csv_response_declares_charset_once(self):
+        chunks, media_type = _service().export_history("csv", "node")
+        assert StreamingResponse(chunks, media_type=media_type).headers["content-type"] == "text/csv; charset=utf-8"
+
+    def test_node_level_ndjson_filters_nodes_and_range(self):
+        service = _service()
+        since = datetime.utcnow() - timedelta(minutes=5)
+        chunks, _ = service.export_history("ndjson", "node", ["customer-b-node"], start=since)
+        rows = [json.loads(line) for line in b"".join(chunks).splitlines()]
+        assert len(rows) == 1
+        assert set(rows[0]) == set(NODE_COLUMNS)
+        assert rows[0]["node_id"] == "customer-b-node" and rows[0]["source"] == "audit"
+
+    def test_node_level_includes_provider_trend(self):
+        chunks, _ = _service().export_history("csv", "node", ["customer-a-node"])
+        sources = [r[-1] for r in csv.reader(io.StringIO(b"".join(chunks).decode()))][1:]
+        assert sources.count("audit") == 1
+        assert sources.count("history") > 1
+
+    def test_output_is_chunked(self, tmp_path):
+        service = _service(SQLiteStateBackend(str(tmp_path / "state.db")))
+        for _ in range(1500):
+            service._get_node_audit_internal("customer-a-node")
+        chunks = list(service.export_history("ndjson", "check", ["customer-a-node"])[0])
+        assert len(chunks) > 1
+        assert sum(c.count(b"\n") for c in chunks) == 1501 * len(default_engine.get_all_checks())
+
+    def test_unknown_format_is_rejected_before_streaming(self):
+        with pytest.raises(ValueError, match="Unsupported export format"):
+            _service().export_history("xlsx", "node")
+
+    def test_parquet_round_trip(self):
+        pq = pytest.importorskip("pyarrow.parquet")
+        chunks, _ = _service().export_history("parquet", "check")
+        table = pq.read_table(io.BytesIO(b"".join(chunks)))
+        assert table.column_names == list(CHECK_COLUMNS)
+        assert table.num_rows == 2 * len(default_engine.get_all_checks())
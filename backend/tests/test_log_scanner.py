@@ -0,0 +1,116 @@
+"""Unit tests for the streaming log scanner (fixture mode)."""
+
+import io
+import os
+from datetime import datetime, timezone
+
+from app.services.log_scanner import (
+    FileLogSource,
+    JournalLogSource,
+    LogScanner,
+    fixture_sources,
+    iter_blocks,
+)
+
+
+def _now_prefix() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S+0000")
+
+
+def _sudo_line() -> str:
+    return f"{_now_prefix()} pve1 sudo:    admin : TTY=pts/0 ; PWD=/root ; USER=root ; COMMAND=/usr/bin/apt update\n"
+
+
+def _noise_line(i: int) -> str:
+    return f"{_now_prefix()} pve1 systemd[1]: Started session {i} of user admin.\n"
+
+
+def _write(path, text: str, mode: str = "a") -> None:
+    with open(path, mode) as f:
+        f.write(text)
+
+
+class TestIterBlocks:
+    """Chunked reading on line boundaries."""
+
+    def test_lines_span_chunks_and_partial_tail_is_held_back(self):
+        data = b"alpha\nbravo charlie\ndelta"
+        blocks = list(iter_blocks(io.BytesIO(data), 0, chunk_size=4))
+        assert blocks == [(b"alpha\n", 6), (b"bravo charlie\n", 20)]
+
+
+class TestLogScanner:
+    """Incremental scanning from stored offsets."""
+
+    def test_only_new_lines_are_processed(self, tmp_path):
+        (tmp_path / "pve1").mkdir()
+        log = tmp_path / "pve1" / "auth.log"
+        _write(log, "".join(_noise_line(i) for i in range(100)) + _sudo_line(), mode="w")
+        scanner = LogScanner(fixture_sources(str(tmp_path), ["auth.log"]))
+
+        first = scanner.node_config("pve1")
+        assert first["log_lines_scanned"] == 101
+        assert first["privileged_sessions_logged"] == 1
+        assert first["privileged_access_logging"] is True
+
+        _write(log, _noise_line(101) + _sudo_line())
+        second = scanner.node_config("pve1")
+        assert second["log_lines_scanned"] == 103
+        assert second["privileged_sessions_logged"] == 2
+
+    def test_rotated_file_is_read_from_start(self, tmp_path):
+        (tmp_path / "pve1").mkdir()
+        log = tmp_path / "pve1" / "auth.log"
+        _write(log, "".join(_noise_line(i) for i in range(50)), mode="w")
+        scanner = LogScanner(fixture_sources(str(tmp_path), ["auth.log"]))
+        scanner.scan("pve1")
+
+        os.replace(log, tmp_path / "pve1" / "auth.log.1")
+        _write(log, _sudo_line(), mode="w")
+        state = scanner.scan("pve1")
+        assert state["lines"] == 51
+        assert state["privileged_sessions"] == 1
+
+    def test_missing_log_means_no_evidence(self, tmp_path):
+        config = LogScanner(fixture_sources(str(tmp_path), ["auth.log"])).node_config("pve9")
+        assert config["privileged_access_logging"] is False
+        assert config["log_lines_scanned"] == 0
+
+    def test_forwarding_health_tracks_suspend_and_resume(self, tmp_path):
+        (tmp_path / "pve1").mkdir()
+        log = tmp_path / "pve1" / "syslog"
+        prefix = "2026-01-01T10:00:0{}+0000 pve1 rsyslogd[812]: action 'action-1-builtin:omfwd' {}"
+        _write(log, prefix.format(1, "suspended, next retry is ...\n"), mode="w")
+        scanner = LogScanner(fixture_sources(str(tmp_path), ["syslog"]))
+        assert scanner.node_config("pve1")["syslog_forwarding_healthy"] is False
+
+        _write(log, prefix.format(5, "resumed (module 'builtin:omfwd')\n"))
+        assert scanner.node_config("pve1")["syslog_forwarding_healthy"] is True
+
+
+class TestJournalLogSource:
+    """Cursor-based journal reads."""
+
+    def test_cursor_is_stored_and_reused(self):
+        commands = []
+
+        def run(command: str):
+            commands.append(command)
+            return io.BytesIO((_sudo_line() + "-- cursor: s=abc;i=42\n").encode())
+
+        scanner = LogScanner(lambda node_id: [JournalLogSource(run)])
+        assert scanner.scan("pve1")["positions"]["journal"] == "s=abc;i=42"
+        scanner.scan("pve1")
+        assert "--since=" in commands[0]
+        assert "--after-cursor='s=abc;i=42'" in commands[1]
+
+
+class TestFileLogSource:
+    """Offset-based file reads."""
+
+    def test_unchanged_file_yields_nothing(self, tmp_path):
+        log = tmp_path / "auth.log"
+        _write(log, _sudo_line(), mode="w")
+        source = FileLogSource(str(log))
+        position = list(source.read(None))[-1][1]
+        assert list(source.read(position)) == []
@@ -0,0 +1,85 @@
+"""Unit tests for consolidated fleet remediation playbook generation."""
+
+import yaml
+
+from app.core.audit_engine import default_engine
+from app.services.audit_service import AuditService
+from app.services.automation_service import AutomationService
+from app.services.playbook_generator import extract_variables, generate_playbook, host_var_resolver
+from app.services.proxmox_mock import ProxmoxMockService
+
+
+def _fleet_results():
+    return AuditService(ProxmoxMockService(), default_engine).get_fleet_summary().nodes
+
+
+class TestHostVars:
+    def test_precedence(self):
+        resolve = host_var_resolver(
+            {"*": {"syslog_server": "log.example.com"}, "pve1": {"proxmox_firewall_service": "fw"}},
+            {"pve1": "10.0.0.1"},
+        )
+        values = resolve("pve1")
+        assert values["proxmox_firewall_service"] == "fw"
+        assert values["syslog_server"] == "log.example.com"
+        assert values["ansible_host"] == "10.0.0.1"
+        assert values["proxmox_host"] == "10.0.0.1"
+        assert resolve("pve2")["proxmox_firewall_service"] == "pve-firewall"
+
+    def test_extract_variables_skips_facts(self):
+        snippet = "when: ansible_os_family == 'Debian'\nname: '{{ syslog_server }}' {{ansible_hostname}}"
+        assert extract_variables(snippet) == {"syslog_server"}
+
+
+class TestGeneratePlaybook:
+    def test_groups_hosts_by_failing_checks_and_dedups_tasks(self):
+        results = _fleet_results()
+        out = generate_playbook(results, host_var_resolver())
+
+        failing = {
+            r.node_id: {c.check_id for c in r.check_results if c.status == "FAIL" and c.remediation}
+            for r in results
+        }
+        assert out.host_count == sum(1 for checks in failing.values() if checks)
+        for group in out.groups:
+            assert all(failing[h] == set(group.check_ids) for h in group.hosts)
+        assert len({frozenset(g.check_ids) for g in out.groups}) == len(out.groups)
+
+        play = yaml.safe_load(out.playbook)[0]
+        guarded = [t["when"] if isinstance(t["when"], str) else t["when"][0] for t in play["tasks"]]
+        all_checks = set().union(*failing.values())
+        assert {w.split("'")[1] for w in guarded} == all_checks
+        assert out.task_count == len(play["tasks"])
+
+    def test_inventory_carries_group_checks_and_host_vars(self):
+        out = generate_playbook(_fleet_results(), host_var_resolver({"*": {"syslog_server": "log"}}))
+        inventory = yaml.safe_load(out.inventory)
+        children = inventory["all"]["children"]["proxsecure_remediation"]["children"]
+        for group in out.groups:
+            entry = children[group.name]
+            assert entry["vars"]["remediation_checks"] == group.check_ids
+            assert sorted(entry["hosts"]) == group.hosts
+            if "firewall_enabled" in group.check_ids:
+                for host_vars in entry["hosts"].values():
+                    assert host_vars["proxmox_firewall_service"] == "pve-firewall"
+
+    def test_existing_when_is_kept_and_handlers_derived(self):
+        out = generate_playbook(_fleet_results(), host_var_resolver())
+        play = yaml.safe_load(out.playbook)[0]
+        combined = [t["when"] for t in play["tasks"] if isinstance(t["when"], list)]
+        if any("privileged_access_logging" in g.check_ids for g in out.groups):
+            assert ["'privileged_access_logging' in remediation_checks", "ansible_os_family == 'Debian'"] in combined
+        notified = {n for t in play["tasks"] for n in ([t["notify"]] if isinstance(t.get("notify"), str) else t.get("notify", []))}
+        assert {h["name"] for h in play.get("handlers", [])} == notified
+
+    def test_unresolved_variables_reported_and_check_filter(self):
+        results = _fleet_results()
+        out = generate_playbook(results, lambda node_id: {}, check_ids={"firewall_enabled"})
+        assert all(g.check_ids == ["firewall_enabled"] for g in out.groups)
+        for group in out.groups:
+            for host in group.hosts:
+                assert out.unresolved_variables[host] == ["proxmox_firewall_service"]
+
+    def test_nothing_to_remediate(self):
+        out = AutomationService(ProxmoxMockService()).generate_playbook(_fleet_results(), ["no_such_check"])
+        assert out.playbook == "" and out.inventory == "" and out.groups == [] and out.task_count == 0
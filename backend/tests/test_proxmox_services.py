@@ -135,6 +135,39 @@ class TestProxmoxRealService:
         assert "backup_schedule" in config
         assert "vm_network_segmentation" in config
 
+    @patch("app.services.proxmox_real._get_proxmoxer")
+    def test_forced_key_fetch_bypasses_ssh_and_guest_caches(self, mock_get_proxmoxer):
+        mock_proxmoxer = MagicMock()
+        mock_proxmoxer.ProxmoxAPI.return_value = self._make_mock_proxmox()
+        mock_get_proxmoxer.return_value = mock_proxmoxer
+        ssh = MagicMock()
+        ssh.collect.return_value = {"ssh_permit_root_login": "no"}
+        svc = ProxmoxRealService(host="proxmox.example.com", user="root@pam", password="secret", ssh_collector=ssh)
+        svc._guests = MagicMock()
+        svc._guests.node_findings.return_value = []
+        svc._guests.node_unreadable.return_value = {}
+
+        svc.get_node_config_keys("pve1", ["ssh_permit_root_login", "vm_network_segmentation"])
+        ssh.collect.assert_called_with("pve1", force=False)
+        svc._guests.refresh.assert_not_called()
+
+        config = svc.get_node_config_keys("pve1", ["ssh_permit_root_login", "vm_network_segmentation"], force=True)
+        ssh.collect.assert_called_with("pve1", force=True)
+        svc._guests.refresh.assert_called_once_with("pve1")
+        assert config["ssh_permit_root_login"] == "no" and config["vm_network_segmentation"] is True
+
+    @patch("app.services.proxmox_real._get_proxmoxer")
+    def test_failed_ssh_probe_fails_privileged_logging_closed(self, mock_get_proxmoxer):
+        mock_proxmoxer = MagicMock()
+        mock_proxmoxer.ProxmoxAPI.return_value = self._make_mock_proxmox()
+        mock_get_proxmoxer.return_value = mock_proxmoxer
+        ssh = MagicMock()
+        ssh.collect.side_effect = TimeoutError("timed out")
+        svc = ProxmoxRealService(host="proxmox.example.com", user="root@pam", password="secret", ssh_collector=ssh)
+        config = svc.get_node_config_keys("pve1", ["privileged_access_logging"])
+        assert config["privileged_access_logging"] is False
+        assert config["ssh_probe_error"] == "timed out"
+
     @patch("app.services.proxmox_real._get_proxmoxer")
     def test_get_node_config_node_not_found(self, mock_get_proxmoxer):
         mock_px = self._make_mock_proxmox(nodes_list=[{"node": "pve1"}])
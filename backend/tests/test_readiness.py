@@ -0,0 +1,60 @@
+"""Unit tests for startup readiness state and background warm-up."""
+
+from app.core.readiness import ReadinessState, WarmupRunner
+
+
+class TestWarmupRunner:
+    """Background warm-up with retry."""
+
+    def test_ready_after_success(self):
+        state = ReadinessState()
+        runner = WarmupRunner(state, lambda: {"nodes": 3})
+        runner.start()
+        runner.join(timeout=5)
+        snap = state.snapshot()
+        assert state.is_ready
+        assert snap["state"] == "ready"
+        assert snap["nodes"] == 3
+        assert snap["attempts"] == 1
+
+    def test_retries_until_success(self):
+        state = ReadinessState()
+        calls = {"n": 0}
+
+        def flaky():
+            calls["n"] += 1
+            if calls["n"] < 3:
+                raise ConnectionError("proxmox down")
+            return {}
+
+        runner = WarmupRunner(state, flaky, initial_backoff_seconds=0.01, max_backoff_seconds=0.02)
+        runner.start()
+        runner.join(timeout=5)
+        assert state.is_ready
+        assert state.snapshot()["attempts"] == 3
+        assert state.snapshot()["last_error"] is None
+
+    def test_degraded_reports_last_error(self):
+        state = ReadinessState()
+
+        def down():
+            runner.stop()  # stop retrying after this first failure
+            raise ConnectionError("proxmox down")
+
+        runner = WarmupRunner(state, down, initial_backoff_seconds=5)
+        runner.start()
+        runner.join(timeout=5)
+        snap = state.snapshot()
+        assert snap["ready"] is False
+        assert snap["state"] == "degraded"
+        assert snap["last_error"] == "proxmox down"
+
+    def test_warnings_reported_alongside_state(self):
+        state = ReadinessState()
+        state.add_warning("STATE_BACKEND=redis unavailable; using process memory")
+        runner = WarmupRunner(state, lambda: {})
+        runner.start()
+        runner.join(timeout=5)
+        snap = state.snapshot()
+        assert snap["ready"] is True
+        assert snap["warnings"] == ["STATE_BACKEND=redis unavailable; using process memory"]
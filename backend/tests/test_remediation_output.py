@@ -0,0 +1,95 @@
+"""Unit tests for streamed remediation output (ring buffers, background runs, persisted output)."""
+
+import threading
+
+from app.services.automation_service import AutomationService
+from app.services.proxmox_mock import ProxmoxMockService
+from app.services.remediation_output import STREAM_EXIT, OutputBuffer, OutputStore
+from app.services.remediation_plan import plan_step
+
+
+class _StreamingMock(ProxmoxMockService):
+    """Mock provider writing `lines` stdout lines, optionally waiting for `release` first."""
+
+    def __init__(self, lines: int = 3, release: threading.Event | None = None) -> None:
+        super().__init__()
+        self.lines = lines
+        self.release = release
+
+    def execute_remediation(self, node_id, ansible_snippet, on_output=None):
+        for i in range(self.lines):
+            on_output("stdout", f"line {i}")
+            if i == 0 and self.release is not None:
+                self.release.wait(5)
+        on_output("stderr", "warning: deprecated module")
+        return {"status": "success", "message": "done"}
+
+
+class TestOutputBuffer:
+    def test_ring_buffer_drops_oldest_and_snapshots_by_seq(self):
+        buffer = OutputBuffer("rem-1", max_lines=3)
+        for i in range(5):
+            buffer.append("rem-1", "c", "stdout", f"l{i}")
+        assert [e["line"] for e in buffer.snapshot()] == ["l2", "l3", "l4"]
+        assert buffer.dropped == 2
+        assert [e["seq"] for e in buffer.snapshot(after_seq=4)] == [5]
+        buffer.finish("rem-1", "c", "success")
+        assert buffer.finished and buffer.snapshot()[-1]["stream"] == STREAM_EXIT
+
+    def test_store_forgets_oldest_finished_runs_only(self):
+        store = OutputStore(max_runs=2)
+        running = store.create("a")
+        store.create("b").finish("b", "c", "success")
+        store.create("c")
+        assert store.get("a") is running and store.get("b") is None and store.get("c") is not None
+
+
+class TestStreamedExecution:
+    def test_output_streamed_and_persisted(self):
+        svc = AutomationService(_StreamingMock(lines=3))
+        resp = svc.execute_remediation("customer-a-node", "ssh_root_login", "- name: x\n", dry_run=False)
+        assert resp.status == "success"
+        assert resp.output == "line 0\nline 1\nline 2\n[stderr] warning: deprecated module\ndone"
+        assert svc.get_history("customer-a-node")[-1].output == resp.output
+        entries = svc.get_output(resp.execution_id).snapshot()
+        assert [e["stream"] for e in entries][-2:] == ["status", STREAM_EXIT]
+        assert entries[-1]["line"] == "success"
+
+    def test_persisted_output_is_bounded(self):
+        svc = AutomationService(_StreamingMock(lines=10), output_store=OutputStore(max_lines=4))
+        resp = svc.execute_remediation("customer-a-node", "ssh_root_login", "- name: x\n", dry_run=False)
+        assert resp.output.startswith("[8 earlier lines dropped]\n")
+        assert resp.output.count("\n") == 4
+
+    def test_mock_provider_reports_tasks(self):
+        svc = AutomationService(ProxmoxMockService())
+        resp = svc.execute_remediation("customer-a-node", "c", "- name: A\n  x: 1\n- name: B\n  y: 2\n", dry_run=False)
+        assert "TASK [A]" in resp.output and "TASK [B]" in resp.output
+
+    def test_background_run_streams_while_running(self):
+        release = threading.Event()
+        svc = AutomationService(_StreamingMock(lines=2, release=release))
+        started = svc.start_remediation("customer-a-node", "ssh_root_login", "- name: x\n", dry_run=False)
+        assert started.status == "running"
+        buffer = svc.get_output(started.execution_id)
+        for _ in range(200):
+            if any(e["line"] == "line 0" for e in buffer.snapshot()):
+                break
+            threading.Event().wait(0.01)
+        assert not buffer.finished
+        release.set()
+        for _ in range(200):
+            if buffer.finished:
+                break
+            threading.Event().wait(0.01)
+        assert buffer.status == "success"
+        assert svc.get_history("customer-a-node")[-1].execution_id == started.execution_id
+
+    def test_plan_steps_share_the_plan_buffer(self):
+        svc = AutomationService(ProxmoxMockService())
+        steps = [plan_step("a", "- name: A\n"), plan_step("b", "- name: B\n", ["a"])]
+        resp = svc.execute_plan("customer-a-node", steps, dry_run=False)
+        entries = svc.get_output(resp.plan_id).snapshot()
+        assert {e["check_id"] for e in entries if e["stream"] == "stdout"} == {"a", "b"}
+        assert entries[-1]["stream"] == STREAM_EXIT and entries[-1]["line"] == resp.status
+        assert sum(e["stream"] == STREAM_EXIT for e in entries) == 1
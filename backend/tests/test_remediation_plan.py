@@ -0,0 +1,147 @@
+"""Unit tests for dependency-ordered remediation plans."""
+
+import threading
+import time
+
+import pytest
+
+from app.core.audit_engine import default_engine
+from app.services.audit_service import AuditService
+from app.services.automation_service import AutomationService
+from app.services.proxmox_mock import ProxmoxMockService
+from app.services.remediation_plan import node_steps, plan_stages, plan_step, run_dag
+
+SSH_SNIPPET = "- name: Disable root\n  ansible.builtin.lineinfile:\n    path: /etc/ssh/sshd_config\n  notify: restart sshd\n"
+
+
+class _RecordingMock(ProxmoxMockService):
+    """Mock provider recording executed snippets; snippets containing 'boom' fail."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        super().__init__()
+        self.delay = delay
+        self.executed: list[str] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def execute_remediation(self, node_id: str, ansible_snippet: str) -> dict | None:
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+            self.executed.append(ansible_snippet)
+        if "boom" in ansible_snippet:
+            return {"status": "error", "error": "task failed"}
+        return {"status": "success", "output": "ok"}
+
+
+class TestPlanSteps:
+    def test_notify_is_lifted_out_of_snippet(self):
+        step = plan_step("ssh_root_login", SSH_SNIPPET, ["firewall_enabled"])
+        assert step.notify == ("restart sshd",)
+        assert "notify" not in step.snippet
+        assert step.run_after == ("firewall_enabled",)
+
+    def test_stages_follow_run_after_and_ignore_absent_checks(self):
+        steps = [plan_step("a", "- name: a\n", ["b"]), plan_step("b", "- name: b\n", ["missing"]), plan_step("c", "- name: c\n")]
+        assert plan_stages(steps) == [["b", "c"], ["a"]]
+
+    def test_cycle_rejected(self):
+        steps = [plan_step("a", "- name: a\n", ["b"]), plan_step("b", "- name: b\n", ["a"])]
+        with pytest.raises(ValueError, match="cycle"):
+            plan_stages(steps)
+
+    def test_node_steps_use_catalog_hints(self):
+        audit = AuditService(ProxmoxMockService(), default_engine).get_node_audit("customer-a-node")
+        run_after = {c.check_id: c.run_after for c in default_engine.get_catalog().checks}
+        stages = plan_stages(node_steps(audit, run_after))
+        flat = [c for stage in stages for c in stage]
+        assert flat.index("firewall_enabled") < flat.index("ssh_root_login")
+        with pytest.raises(ValueError, match="not found"):
+            node_steps(audit, run_after, ["vm_resource_limits_unknown"])
+
+
+class TestRunDag:
+    def test_independent_steps_run_concurrently(self):
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def run(step):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return step.check_id
+
+        steps = [plan_step(c, f"- name: {c}\n") for c in "abcd"]
+        done = run_dag(steps, run, ok=lambda r: True, blocked=lambda s, d: None, max_parallel=4)
+        assert sorted(r for _, r in done) == list("abcd")
+        assert peak[0] > 1
+
+    def test_dependents_of_failed_step_are_blocked(self):
+        steps = [
+            plan_step("a", "- name: a\n"),
+            plan_step("b", "- name: b\n", ["a"]),
+            plan_step("c", "- name: c\n", ["b"]),
+            plan_step("d", "- name: d\n"),
+        ]
+        ran = []
+
+        def run(step):
+            ran.append(step.check_id)
+            return step.check_id != "a"
+
+        done = run_dag(steps, run, ok=bool, blocked=lambda s, dep: f"blocked by {dep}")
+        results = {s.check_id: r for s, r in done}
+        assert sorted(ran) == ["a", "d"]
+        assert results["b"] == "blocked by a" and results["c"] == "blocked by b"
+
+
+class TestExecutePlan:
+    def test_handler_runs_once_after_notifying_steps(self):
+        prox = _RecordingMock()
+        svc = AutomationService(prox)
+        steps = [
+            plan_step("firewall_enabled", "- name: fw\n  ansible.builtin.command: pve-firewall start\n"),
+            plan_step("ssh_root_login", SSH_SNIPPET, ["firewall_enabled"]),
+            plan_step("ssh_ciphers", SSH_SNIPPET.replace("Disable root", "Ciphers"), ["firewall_enabled"]),
+        ]
+        resp = svc.execute_plan("customer-a-node", steps, dry_run=False)
+        assert resp.status == "success"
+        assert resp.stages == [["firewall_enabled"], ["ssh_root_login", "ssh_ciphers"]]
+        assert [h.check_id for h in resp.handlers] == ["handler:restart sshd"]
+        assert sum("state: restarted" in s for s in prox.executed) == 1
+        assert "state: restarted" in prox.executed[-1]
+        assert "pve-firewall" in prox.executed[0]
+        assert {h.check_id for h in svc.get_history("customer-a-node")} >= {"ssh_root_login", "handler:restart sshd"}
+
+    def test_failed_step_skips_dependents_and_their_handlers(self):
+        prox = _RecordingMock()
+        steps = [
+            plan_step("firewall_enabled", "- name: boom\n"),
+            plan_step("ssh_root_login", SSH_SNIPPET, ["firewall_enabled"]),
+        ]
+        resp = AutomationService(prox).execute_plan("customer-a-node", steps, dry_run=False)
+        assert resp.status == "error"
+        by_check = {s.check_id: s for s in resp.steps}
+        assert by_check["firewall_enabled"].status == "error"
+        assert by_check["ssh_root_login"].status == "skipped"
+        assert resp.handlers == []
+        assert len(prox.executed) == 1
+
+    def test_max_parallel_bounds_concurrency(self):
+        prox = _RecordingMock(delay=0.03)
+        steps = [plan_step(f"c{i}", f"- name: c{i}\n") for i in range(6)]
+        AutomationService(prox, max_parallel=2).execute_plan("customer-a-node", steps, dry_run=False)
+        assert prox.max_active == 2
+
+    def test_dry_run_plan_is_skipped(self):
+        resp = AutomationService(ProxmoxMockService()).execute_plan(
+            "customer-a-node", [plan_step("ssh_root_login", SSH_SNIPPET)], dry_run=True
+        )
+        assert resp.status == "skipped"
+        assert [h.status for h in resp.handlers] == ["skipped"]
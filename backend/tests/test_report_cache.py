@@ -0,0 +1,76 @@
+"""Unit tests for the on-disk report cache and Range parsing."""
+
+import threading
+import time
+
+import pytest
+
+from app.services.report_cache import ReportCache, iter_file_range, parse_range
+
+
+class TestParseRange:
+    def test_forms(self):
+        assert parse_range(None, 100) is None
+        assert parse_range("bytes=0-9", 100) == (0, 9)
+        assert parse_range("bytes=90-", 100) == (90, 99)
+        assert parse_range("bytes=-10", 100) == (90, 99)
+        assert parse_range("bytes=50-500", 100) == (50, 99)
+        assert parse_range("bytes=0-1,5-6", 100) is None  # multi-range: full body
+
+    def test_unsatisfiable(self):
+        with pytest.raises(ValueError):
+            parse_range("bytes=100-", 100)
+        with pytest.raises(ValueError):
+            parse_range("bytes=-0", 100)
+
+
+class TestReportCache:
+    """Render once, stream from disk."""
+
+    def test_concurrent_opens_share_one_render(self, tmp_path):
+        cache = ReportCache(str(tmp_path))
+
+        def render(out):
+            time.sleep(0.1)
+            out.write(b"%PDF-report")
+
+        sizes = []
+
+        def download():
+            file, size = cache.open("node:a:1", render)
+            sizes.append((b"".join(iter_file_range(file, 0, size)), size))
+
+        threads = [threading.Thread(target=download) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert cache.renders == 1
+        assert sizes == [(b"%PDF-report", 11)] * 8
+
+        file, _ = cache.open("node:a:1", render)
+        file.close()
+        assert cache.renders == 1
+
+    def test_failed_render_leaves_no_file(self, tmp_path):
+        cache = ReportCache(str(tmp_path))
+
+        def render(out):
+            out.write(b"partial")
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            cache.open("k", render)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_least_recently_used_reports_are_pruned(self, tmp_path):
+        cache = ReportCache(str(tmp_path), max_files=2)
+        for key in ("a", "b", "c"):
+            cache.open(key, lambda out: out.write(key.encode()))[0].close()
+        assert len(list(tmp_path.glob("*.pdf"))) == 2
+
+    def test_range_read(self, tmp_path):
+        cache = ReportCache(str(tmp_path))
+        file, size = cache.open("k", lambda out: out.write(b"0123456789"))
+        assert b"".join(iter_file_range(file, 3, 4, chunk_size=2)) == b"3456"
+        assert file.closed
@@ -0,0 +1,72 @@
+"""Unit tests for the consolidated customer PDF report."""
+
+from reportlab.platypus import Paragraph
+
+from app.core.audit_engine import default_engine
+from app.services.audit_service import AuditService
+from app.services.proxmox_mock import ProxmoxMockService
+from app.services.report_service import ReportService, _LazyStory, report_styles
+
+
+class _CountingMock(ProxmoxMockService):
+    def __init__(self) -> None:
+        super().__init__()
+        self.fetches = 0
+
+    def get_node_config(self, node_id: str) -> dict:
+        self.fetches += 1
+        return super().get_node_config(node_id)
+
+
+class TestCustomerReport:
+    """Incremental rendering into a spooled file."""
+
+    def test_renders_all_nodes_of_customer(self):
+        service = AuditService(ProxmoxMockService(), default_engine, customer_map={"customer-b-node": "customer-a"})
+        rollup = service.get_customer_rollup("customer-a")
+        controls = service.get_control_coverage(customer_id="customer-a")
+        pdf = ReportService().render_customer_report(
+            rollup, service.iter_customer_nodes("customer-a"), controls=controls
+        )
+        data = pdf.read()
+        assert data.startswith(b"%PDF") and data.rstrip().endswith(b"%%EOF")
+        assert pdf.tell() == len(data)
+
+    def test_renders_from_recorded_snapshots_without_reaudit(self):
+        prox = _CountingMock()
+        service = AuditService(prox, default_engine)
+        rollup = service.get_customer_rollup("customer-a")
+        fetches, version = prox.fetches, rollup.version
+        nodes = list(service.iter_customer_nodes("customer-a"))
+        assert [n.node_id for n in nodes] == ["customer-a-node"]
+        assert nodes[0].compliance_score == rollup.average_compliance
+        assert prox.fetches == fetches
+        assert service.get_customer_rollup("customer-a").version == version
+
+    def test_cache_fingerprint_follows_content_across_restarts(self):
+        prox = _CountingMock()
+        first = AuditService(prox, default_engine)
+        first.get_fleet_summary()
+        key = first.customer_fingerprint("customer-a")
+
+        restarted = AuditService(prox, default_engine)  # fleet version restarts from 0
+        prox.get_node_config = lambda node_id: {
+            **ProxmoxMockService.get_node_config(prox, node_id), "firewall_enabled": True,
+        }
+        restarted.get_fleet_summary()
+        assert restarted.get_customer_rollup("customer-a").version == first.get_customer_rollup("customer-a").version
+        assert restarted.customer_fingerprint("customer-a") != key
+        assert restarted.customer_fingerprint("customer-b") == first.customer_fingerprint("customer-b")
+
+    def test_story_is_pulled_lazily(self):
+        pulled = []
+
+        def groups():
+            for i in range(1000):
+                pulled.append(i)
+                yield [Paragraph(f"line {i}", report_styles().body)]
+
+        story = _LazyStory(groups(), lookahead=8)
+        assert len(story) == 8 and len(pulled) == 8
+        del story[:5]
+        assert len(story) == 8 and len(pulled) == 13
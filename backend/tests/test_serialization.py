@@ -0,0 +1,57 @@
+"""Unit tests for the fast audit payload encoder."""
+
+import json
+
+from app.core.audit_engine import default_engine
+from app.core.serialization import AuditPayloadEncoder, FastJSONResponse
+from app.models.check import CompactFleetSummary
+from app.services.audit_service import AuditService
+from app.services.proxmox_mock import ProxmoxMockService
+
+
+class TestAuditPayloadEncoder:
+    """Fast path must produce the same document as Pydantic's JSON serialization."""
+
+    @staticmethod
+    def _service():
+        return AuditService(proxmox_service=ProxmoxMockService(), audit_engine=default_engine)
+
+    def test_fleet_summary_matches_pydantic(self):
+        summary = self._service().get_fleet_summary()
+        fast = AuditPayloadEncoder().encode_fleet_summary(summary)
+        assert json.loads(fast) == json.loads(summary.model_dump_json())
+
+    def test_node_result_matches_pydantic(self):
+        node = self._service().get_node_audit("customer-a-node")
+        encoder = AuditPayloadEncoder()
+        first = encoder.encode_node_result(node)
+        second = encoder.encode_node_result(node)  # served from cached fragments
+        assert first == second
+        assert json.loads(first) == json.loads(node.model_dump_json())
+
+    def test_fragments_follow_changed_mapping(self):
+        node = self._service().get_node_audit("customer-c-node")
+        encoder = AuditPayloadEncoder()
+        encoder.encode_node_result(node)
+        result = node.check_results[0]
+        changed = result.model_copy(
+            update={"compliance_mapping": result.compliance_mapping.model_copy(update={"iso_27001": ["A.5.1"]})}
+        )
+        decoded = json.loads(encoder.encode_check_result(changed))
+        assert decoded["compliance_mapping"]["iso_27001"] == ["A.5.1"]
+
+    def test_fast_json_response_passes_bytes_through(self):
+        resp = FastJSONResponse(b'{"a":1}')
+        assert resp.body == b'{"a":1}'
+        assert resp.media_type == "application/json"
+
+    def test_compact_fleet_summary_validates_against_model(self):
+        svc = self._service()
+        summary = svc.get_fleet_summary()
+        version = svc.get_check_catalog().version
+        encoder = AuditPayloadEncoder()
+        compact = encoder.encode_fleet_summary(summary, catalog_version=version)
+        parsed = CompactFleetSummary.model_validate_json(compact)
+        assert parsed.catalog_version == version
+        assert parsed.nodes[0].check_results[0].check_id == summary.nodes[0].check_results[0].check_id
+        assert len(compact) * 2 < len(encoder.encode_fleet_summary(summary))
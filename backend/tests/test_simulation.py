@@ -0,0 +1,98 @@
+"""Unit tests for what-if compliance simulation."""
+
+import time
+
+import pytest
+
+from app.core.audit_engine import default_engine
+from app.models.check import SimulationRequest
+from app.services.audit_service import AuditService
+from app.services.proxmox_mock import ProxmoxMockService
+from app.services.simulation import simulate
+from app.services.state_backend import MemoryStateBackend
+
+
+class _CountingMock(ProxmoxMockService):
+    def __init__(self) -> None:
+        super().__init__()
+        self.fetches = 0
+
+    def get_node_config(self, node_id: str) -> dict:
+        self.fetches += 1
+        return super().get_node_config(node_id)
+
+
+def _service(prox=None) -> AuditService:
+    return AuditService(prox or _CountingMock(), default_engine, state_backend=MemoryStateBackend())
+
+
+class TestSimulate:
+    def test_fixing_checks_moves_node_off_critical_list(self):
+        svc = _service()
+        res = svc.simulate(SimulationRequest(
+            customer_id="customer-a", fix_checks=["ssh_root_login", "firewall_enabled"]
+        ))
+        assert res.total_nodes == 1 and res.critical_before == 1 and res.critical_after == 0
+        assert res.leaving_critical == ["customer-a-node"] and res.improved_nodes == 1
+        node = res.nodes[0]
+        assert (node.current_score, node.projected_score) == (40, 60)
+        assert sorted(node.changed_checks) == ["firewall_enabled", "ssh_root_login"]
+        assert res.fleet_projected_average > res.fleet_current_average
+        # Nothing is recorded
+        assert svc.get_node_audit("customer-a-node").compliance_score == 40
+
+    def test_overrides_recheck_only_dependent_checks_from_snapshots(self):
+        prox = _CountingMock()
+        svc = _service(prox)
+        svc.get_fleet_summary()
+        fetches = prox.fetches
+        res = svc.simulate(SimulationRequest(overrides={"two_factor_enabled": True}, include_nodes=False))
+        assert res.rechecked_checks == ["two_factor_enabled"]
+        assert res.total_nodes == 3 and res.improved_nodes == 1 and res.nodes == []
+        assert prox.fetches == fetches and res.fetched_nodes == 0
+
+    def test_override_can_make_checks_fail(self):
+        svc = _service()
+        res = svc.simulate(SimulationRequest(node_ids=["customer-c-node"], overrides={"firewall_enabled": False}))
+        assert res.nodes[0].changed_checks == ["firewall_enabled"]
+        assert res.nodes[0].projected_score < res.nodes[0].current_score
+
+    def test_missing_snapshot_is_fetched(self):
+        svc = _service()
+        svc.get_fleet_summary()
+        svc._configs = type(svc._configs)()
+        res = svc.simulate(SimulationRequest(node_ids=["customer-a-node"], overrides={"two_factor_enabled": True}))
+        assert res.fetched_nodes == 1 and res.nodes[0].projected_score == 50
+
+    def test_unknown_check_node_or_customer(self):
+        svc = _service()
+        with pytest.raises(ValueError, match="Check not found"):
+            svc.simulate(SimulationRequest(fix_checks=["nope"]))
+        with pytest.raises(ValueError, match="not found"):
+            svc.simulate(SimulationRequest(node_ids=["nope"]))
+        with pytest.raises(ValueError, match="not found"):
+            svc.simulate(SimulationRequest(customer_id="nope"))
+
+
+class TestSimulateBulk:
+    def test_memoizes_evaluation_across_nodes(self):
+        svc = _service()
+        base = svc.get_node_audit("customer-a-node")
+        config = svc._configs.get("customer-a-node")
+        calls = []
+
+        def evaluate(check_id, cfg):
+            calls.append(check_id)
+            return default_engine.evaluate_check(check_id, cfg)
+
+        nodes = [(base.model_copy(update={"node_id": f"n{i}"}), config) for i in range(10_000)]
+        recheck = {c: default_engine.get_check(c).config_keys for c in default_engine.checks_reading(["two_factor_enabled"])}
+        start = time.perf_counter()
+        res = simulate(
+            nodes, evaluate, recheck, {"two_factor_enabled": True}, set(), 60,
+            fleet_score_sum=40 * 10_000, fleet_count=10_000, include_nodes=False,
+        )
+        elapsed = time.perf_counter() - start
+        assert calls == ["two_factor_enabled"]
+        assert res.total_nodes == 10_000 and res.projected_average == 50.0 and res.critical_after == 10_000
+        assert elapsed < 5.0
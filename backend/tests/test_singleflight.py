@@ -0,0 +1,104 @@
+"""Unit tests for single-flight coalescing of concurrent audits."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.audit_engine import default_engine
+from app.core.singleflight import SingleFlight
+from app.services.audit_service import AuditService
+from app.services.proxmox_mock import ProxmoxMockService
+
+
+class _SlowMock(ProxmoxMockService):
+    """Mock provider whose config fetch blocks until released, counting calls per node."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = threading.Event()
+        self.calls: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get_node_config(self, node_id: str) -> dict:
+        with self._lock:
+            self.calls[node_id] = self.calls.get(node_id, 0) + 1
+        self.release.wait(5)
+        return super().get_node_config(node_id)
+
+
+def _wait_for_waiters(flights: SingleFlight, count: int) -> None:
+    deadline = time.monotonic() + 5
+    while flights.coalesced < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestSingleFlight:
+    """Leader/follower sharing of results and errors."""
+
+    def test_concurrent_callers_share_one_call(self):
+        flights = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def work():
+            calls.append(1)
+            release.wait(5)
+            return object()
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            futures = [pool.submit(flights.do, "k", work) for _ in range(5)]
+            _wait_for_waiters(flights, 4)
+            release.set()
+            results = [f.result() for f in futures]
+
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+        assert flights.in_flight() == 0
+
+    def test_error_is_shared_and_not_cached(self):
+        flights = SingleFlight()
+        release = threading.Event()
+
+        def fail():
+            release.wait(5)
+            raise ValueError("Node not found: x")
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(flights.do, "k", fail) for _ in range(3)]
+            _wait_for_waiters(flights, 2)
+            release.set()
+            for f in futures:
+                with pytest.raises(ValueError):
+                    f.result()
+
+        assert flights.do("k", lambda: 42) == 42
+
+
+class TestAuditCoalescing:
+    """AuditService shares node and fleet audits between concurrent callers."""
+
+    def test_concurrent_node_audits_fetch_once(self):
+        prox = _SlowMock()
+        service = AuditService(prox, default_engine)
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            futures = [pool.submit(service.get_node_audit, "customer-a-node") for _ in range(10)]
+            _wait_for_waiters(service._flights, 9)
+            prox.release.set()
+            results = [f.result() for f in futures]
+
+        assert prox.calls == {"customer-a-node": 1}
+        assert {r.compliance_score for r in results} == {results[0].compliance_score}
+
+    def test_concurrent_fleet_summaries_audit_fleet_once(self):
+        prox = _SlowMock()
+        service = AuditService(prox, default_engine)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(service.get_fleet_summary) for _ in range(4)]
+            _wait_for_waiters(service._flights, 3)
+            prox.release.set()
+            summaries = [f.result() for f in futures]
+
+        assert all(count == 1 for count in prox.calls.values())
+        assert all(s is summaries[0] for s in summaries)
@@ -0,0 +1,156 @@
+"""Unit tests for the SSH host-fact collector."""
+
+import io
+import threading
+import time
+
+import pytest
+
+from app.services.ssh_collector import SSHCollector, facts_to_config, parse_probe_output
+
+HARDENED_OUTPUT = """\
+permitrootlogin=prohibit-password
+rsyslog_forwarding=yes
+rsyslog_active=active
+snmpd_active=active
+snmpd_configured=yes
+auditd_active=active
+auditd_priv_rules=4
+probe_ok=1
+"""
+
+
+class _FakeTransport:
+    def __init__(self) -> None:
+        self.active = True
+
+    def is_active(self) -> bool:
+        return self.active
+
+    def set_keepalive(self, interval: int) -> None:
+        pass
+
+
+class _FakeClient:
+    """paramiko.SSHClient stand-in recording connects and probe concurrency."""
+
+    stats = {"connects": 0, "execs": 0, "active": 0, "max_active": 0}
+    lock = threading.Lock()
+
+    def __init__(self, output: str = HARDENED_OUTPUT, delay: float = 0.0) -> None:
+        self._transport = _FakeTransport()
+        self._output = output
+        self._delay = delay
+
+    def connect(self, host: str, **kwargs) -> None:
+        with self.lock:
+            self.stats["connects"] += 1
+
+    def get_transport(self) -> _FakeTransport:
+        return self._transport
+
+    def exec_command(self, command: str, timeout: float | None = None):
+        with self.lock:
+            self.stats["execs"] += 1
+            self.stats["active"] += 1
+            self.stats["max_active"] = max(self.stats["max_active"], self.stats["active"])
+        time.sleep(self._delay)
+        with self.lock:
+            self.stats["active"] -= 1
+        return None, io.BytesIO(self._output.encode()), None
+
+    def close(self) -> None:
+        self._transport.active = False
+
+
+class _DeadClient(_FakeClient):
+    """Host that never answers: every connect times out."""
+
+    def connect(self, host: str, **kwargs) -> None:
+        super().connect(host, **kwargs)
+        time.sleep(self._delay)
+        raise TimeoutError(f"timed out connecting to {host}")
+
+
+@pytest.fixture(autouse=True)
+def _reset_stats():
+    _FakeClient.stats = {"connects": 0, "execs": 0, "active": 0, "max_active": 0}
+
+
+class TestProbeParsing:
+    """Probe output to config keys."""
+
+    def test_hardened_host(self):
+        config = facts_to_config(parse_probe_output(HARDENED_OUTPUT))
+        assert config == {
+            "syslog_forwarding": True,
+            "snmp_configured": True,
+            "privileged_access_logging": True,
+            "ssh_permit_root_login": "prohibit-password",
+        }
+
+    def test_inactive_services_fail(self):
+        output = HARDENED_OUTPUT.replace("auditd_active=active", "auditd_active=inactive")
+        output = output.replace("rsyslog_forwarding=yes", "rsyslog_forwarding=no")
+        config = facts_to_config(parse_probe_output(output))
+        assert config["privileged_access_logging"] is False
+        assert config["syslog_forwarding"] is False
+
+    def test_incomplete_probe_raises(self):
+        with pytest.raises(RuntimeError):
+            facts_to_config(parse_probe_output("permitrootlogin=yes\n"))
+
+
+class TestSSHCollector:
+    """Connection reuse, caching and bounded parallelism."""
+
+    def test_connection_is_reused_between_cycles(self):
+        collector = SSHCollector("root", cache_seconds=0, client_factory=_FakeClient)
+        collector.collect("pve1")
+        collector.collect("pve1")
+        assert _FakeClient.stats == {"connects": 1, "execs": 2, "active": 0, "max_active": 1}
+
+    def test_dead_connection_is_replaced(self):
+        collector = SSHCollector("root", cache_seconds=0, client_factory=_FakeClient)
+        collector.collect("pve1")
+        collector._clients["pve1"].get_transport().active = False
+        collector.collect("pve1")
+        assert _FakeClient.stats["connects"] == 2
+
+    def test_cached_facts_skip_probe(self):
+        collector = SSHCollector("root", cache_seconds=60, client_factory=_FakeClient)
+        collector.collect_many(["pve1", "pve2"])
+        collector.collect("pve1")
+        assert _FakeClient.stats["execs"] == 2
+
+    def test_force_bypasses_cached_facts(self):
+        collector = SSHCollector("root", cache_seconds=60, client_factory=_FakeClient)
+        collector.collect("pve1")
+        collector.collect("pve1", force=True)
+        assert _FakeClient.stats["execs"] == 2
+
+    def test_failed_probe_is_cached_for_serial_collects(self):
+        collector = SSHCollector("root", cache_seconds=60, client_factory=lambda: _DeadClient(delay=0.05))
+        nodes = [f"pve{i}" for i in range(5)]
+        assert all(isinstance(r, TimeoutError) for r in collector.collect_many(nodes).values())
+        start = time.perf_counter()
+        for node_id in nodes:
+            with pytest.raises(TimeoutError):
+                collector.collect(node_id)
+        assert time.perf_counter() - start < 0.05
+        assert _FakeClient.stats["connects"] == 5
+        with pytest.raises(TimeoutError):
+            collector.collect("pve0", force=True)
+        assert _FakeClient.stats["connects"] == 6
+
+    def test_collect_many_is_bounded_and_returns_errors(self):
+        def factory():
+            return _FakeClient(delay=0.01)
+
+        collector = SSHCollector("root", max_parallel=3, client_factory=factory)
+        results = collector.collect_many([f"pve{i}" for i in range(12)])
+        assert len(results) == 12
+        assert _FakeClient.stats["max_active"] <= 3
+
+        broken = SSHCollector("root", client_factory=lambda: _FakeClient(output="garbage"))
+        assert isinstance(broken.collect_many(["pve1"])["pve1"], RuntimeError)
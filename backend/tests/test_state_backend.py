@@ -0,0 +1,122 @@
+"""Unit tests for shared state backends and cross-worker reuse of audits and history."""
+
+import pytest
+
+from app.core.audit_engine import default_engine
+from app.services.audit_service import AuditService
+from app.services.automation_service import AutomationService
+from app.services.proxmox_mock import ProxmoxMockService
+from app.services.state_backend import MemoryStateBackend, SQLiteStateBackend, create_state_backend
+
+
+class _CountingMock(ProxmoxMockService):
+    def __init__(self) -> None:
+        super().__init__()
+        self.config_calls = 0
+
+    def get_node_config(self, node_id: str) -> dict:
+        self.config_calls += 1
+        return super().get_node_config(node_id)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteStateBackend(str(tmp_path / "state.db"))
+    return MemoryStateBackend()
+
+
+class TestStateBackend:
+    """Key/value, counter and bounded list semantics shared by all backends."""
+
+    def test_get_set_delete(self, backend):
+        assert backend.get("k") is None
+        backend.set("k", b"v")
+        assert backend.get("k") == b"v"
+        backend.delete("k")
+        assert backend.get("k") is None
+
+    def test_expired_value_is_missing(self, backend):
+        backend.set("k", b"v", ttl_seconds=-1)
+        assert backend.get("k") is None
+
+    def test_incr_and_get_counter(self, backend):
+        assert backend.get_counter("c") == 0
+        assert backend.incr("c") == 1
+        assert backend.incr("c") == 2
+        assert backend.get_counter("c") == 2
+
+    def test_list_is_trimmed_to_max_len(self, backend):
+        for i in range(5):
+            backend.list_append("l", str(i).encode(), max_len=3)
+        assert backend.list_items("l") == [b"2", b"3", b"4"]
+
+    def test_list_iter_pages_through_all_entries(self, backend):
+        for i in range(7):
+            backend.list_append("l", str(i).encode(), max_len=100)
+        assert list(backend.list_iter("l", batch_size=3)) == [str(i).encode() for i in range(7)]
+
+    def test_incr_and_append_writes_counter_and_entry_together(self, backend):
+        for _ in range(4):
+            backend.incr_and_append("c", "l", lambda v: str(v).encode(), max_len=3)
+        assert backend.get_counter("c") == 4
+        assert backend.list_items("l") == [b"2", b"3", b"4"]
+
+    def test_list_len(self, backend):
+        assert backend.list_len("l") == 0
+        for i in range(5):
+            backend.list_append("l", str(i).encode(), max_len=3)
+        assert backend.list_len("l") == 3
+
+    def test_set_if_changed_reports_only_real_changes(self, backend):
+        assert backend.set_if_changed("k", b"a") is True
+        assert backend.set_if_changed("k", b"a") is False
+        assert backend.set_if_changed("k", b"b") is True
+        assert backend.get("k") == b"b"
+
+    def test_set_add_remove_members(self, backend):
+        assert backend.set_add("s", "b") is True
+        assert backend.set_add("s", "a") is True
+        assert backend.set_add("s", "a") is False
+        assert backend.set_members("s") == ["a", "b"]
+        assert backend.set_remove("s", "a") is True
+        assert backend.set_remove("s", "a") is False
+        assert backend.set_members("s") == ["b"]
+
+    def test_unknown_kind_falls_back_to_memory(self):
+        assert isinstance(create_state_backend("bogus"), MemoryStateBackend)
+
+
+class TestSharedState:
+    """Two service instances on one SQLite file behave like two uvicorn workers."""
+
+    def test_second_worker_reuses_cached_audit(self, tmp_path):
+        path = str(tmp_path / "state.db")
+        prox_a, prox_b = _CountingMock(), _CountingMock()
+        worker_a = AuditService(prox_a, default_engine, state_backend=SQLiteStateBackend(path), cache_ttl_seconds=60)
+        worker_b = AuditService(prox_b, default_engine, state_backend=SQLiteStateBackend(path), cache_ttl_seconds=60)
+
+        summary_a = worker_a.get_fleet_summary()
+        summary_b = worker_b.get_fleet_summary()
+
+        assert prox_a.config_calls == summary_a.total_nodes
+        assert prox_b.config_calls == 0
+        assert summary_b.version == summary_a.version
+        assert [n.compliance_score for n in summary_b.nodes] == [n.compliance_score for n in summary_a.nodes]
+
+    def test_cache_disabled_by_default(self, tmp_path):
+        prox = _CountingMock()
+        service = AuditService(prox, default_engine, state_backend=SQLiteStateBackend(str(tmp_path / "s.db")))
+        service.get_node_audit("customer-a-node")
+        service.get_node_audit("customer-a-node")
+        assert prox.config_calls == 2
+
+    def test_remediation_history_is_shared(self, tmp_path):
+        path = str(tmp_path / "state.db")
+        worker_a = AutomationService(ProxmoxMockService(), state_backend=SQLiteStateBackend(path))
+        worker_b = AutomationService(ProxmoxMockService(), state_backend=SQLiteStateBackend(path))
+        worker_a.execute_remediation("customer-a-node", "ssh_root_login", "- name: x", dry_run=True)
+        history = worker_b.get_history("customer-a-node")
+        assert len(history) == 1
+        assert history[0].check_id == "ssh_root_login"
+        assert worker_b.get_status()["history_count"] == 1
@@ -0,0 +1,73 @@
+"""Unit tests for request phase timing and the sampling profiler."""
+
+import threading
+import time
+
+from app.core.timing import (
+    RequestTimer,
+    SamplingProfiler,
+    current_timer,
+    request_timing,
+    timed_endpoint,
+    timed_phase,
+)
+
+
+class TestRequestTimer:
+    """Phase accumulation and Server-Timing formatting."""
+
+    def test_header_value_sums_repeated_phases(self):
+        timer = RequestTimer()
+        timer.add("fetch", 1.0)
+        timer.add("fetch", 2.5)
+        timer.add("render", 4.0)
+        header = timer.header_value()
+        assert 'fetch;dur=3.50;desc="x2"' in header
+        assert "render;dur=4.00" in header
+
+    def test_timed_phase_noop_without_request(self):
+        assert current_timer() is None
+        with timed_phase("fetch"):
+            pass
+        assert current_timer() is None
+
+    def test_timed_phase_records_inside_request(self):
+        with request_timing() as timer:
+            with timed_phase("fetch"):
+                time.sleep(0.002)
+        assert timer.get("fetch") >= 1.0
+        assert current_timer() is None
+
+    def test_timed_endpoint_is_idempotent(self):
+        def endpoint(node_id: str) -> str:
+            return node_id
+
+        wrapped = timed_endpoint(endpoint)
+        assert timed_endpoint(wrapped) is wrapped
+        with request_timing() as timer:
+            assert wrapped("pve1") == "pve1"
+        assert "endpoint" in timer.phases()
+
+
+class TestSamplingProfiler:
+    """Collapsed-stack sampling of registered threads."""
+
+    def test_collapsed_output_contains_busy_function(self):
+        def busy_loop_for_profiler(stop):
+            while not stop.is_set():
+                sum(range(1000))
+
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_loop_for_profiler, args=(stop,))
+        worker.start()
+        profiler = SamplingProfiler(interval_seconds=0.001)
+        profiler.add_thread(worker.ident)
+        profiler.start()
+        time.sleep(0.05)
+        profiler.stop()
+        stop.set()
+        worker.join()
+        assert profiler.sample_count > 0
+        first_line = profiler.collapsed().splitlines()[0]
+        assert "busy_loop_for_profiler" in first_line
+        assert first_line.rsplit(" ", 1)[1].isdigit()
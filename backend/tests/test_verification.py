@@ -0,0 +1,123 @@
+"""Unit tests for targeted post-remediation verification."""
+
+import pytest
+
+from app.core.audit_engine import default_engine
+from app.services.audit_service import AuditService
+from app.services.automation_service import AutomationService
+from app.services.proxmox_mock import ProxmoxMockService
+from app.services.remediation_plan import plan_step
+from app.services.state_backend import MemoryStateBackend
+
+
+class _RemediableMock(ProxmoxMockService):
+    """Mock whose remediation sets config values, visible after `lag` further key fetches."""
+
+    def __init__(self, fixes: dict | None = None, lag: int = 0) -> None:
+        super().__init__()
+        self.fixes = fixes or {}
+        self.lag = lag
+        self.applied: dict = {}
+        self.full_fetches = 0
+        self.key_fetches: list[list[str]] = []
+
+    def get_node_config(self, node_id: str) -> dict:
+        self.full_fetches += 1
+        config = super().get_node_config(node_id)
+        config.update(self.applied)
+        return config
+
+    def get_node_config_keys(self, node_id: str, keys: list[str], force: bool = False) -> dict:
+        assert force, "verification must bypass provider caches"
+        self.key_fetches.append(list(keys))
+        config = super().get_node_config(node_id)
+        if self.lag:
+            self.lag -= 1
+        else:
+            config.update(self.applied)
+        return {k: config[k] for k in keys if k in config}
+
+    def execute_remediation(self, node_id, ansible_snippet, on_output=None):
+        self.applied.update(self.fixes)
+        return {"status": "success", "message": "applied"}
+
+
+def _service(prox, **kwargs) -> tuple[AuditService, list[float]]:
+    sleeps: list[float] = []
+    svc = AuditService(
+        prox, default_engine, state_backend=MemoryStateBackend(), sleep=sleeps.append, **kwargs
+    )
+    return svc, sleeps
+
+
+class TestVerifyCheck:
+    def test_refetches_only_check_keys_and_updates_cached_result(self):
+        prox = _RemediableMock()
+        svc, _ = _service(prox)
+        before = svc.get_node_audit("customer-a-node")
+        fetches = prox.full_fetches
+        prox.applied["firewall_enabled"] = True
+
+        v = svc.verify_check("customer-a-node", "firewall_enabled")
+        assert v.verified and v.status == "PASS" and v.attempts == 1
+        assert prox.key_fetches == [["firewall_enabled"]] and prox.full_fetches == fetches
+        assert v.fetched_keys == ["firewall_enabled"] and v.latency_ms >= 0
+
+        after = svc.get_node_audit("customer-a-node")
+        assert after.passed_checks == before.passed_checks + 1
+        assert after.compliance_score == v.compliance_score > before.compliance_score
+        assert next(r for r in after.check_results if r.check_id == "firewall_enabled").status == "PASS"
+        assert svc.get_customer_rollup("customer-a").average_compliance == after.compliance_score
+        rows = list(svc._history.entries({"customer-a-node"}))
+        assert rows[-1]["s"] == after.compliance_score
+
+    def test_retries_with_capped_exponential_backoff(self):
+        prox = _RemediableMock(lag=3)
+        svc, sleeps = _service(prox, verify_backoff_seconds=1.0, verify_backoff_max_seconds=3.0)
+        svc.get_node_audit("customer-a-node")
+        prox.applied["firewall_enabled"] = True
+        v = svc.verify_check("customer-a-node", "firewall_enabled")
+        assert v.verified and v.attempts == 4
+        assert sleeps == [1.0, 2.0, 3.0]
+
+    def test_not_verified_after_attempts(self):
+        prox = _RemediableMock()
+        svc, sleeps = _service(prox)
+        v = svc.verify_check("customer-a-node", "firewall_enabled", attempts=2)
+        assert not v.verified and v.status == "FAIL" and v.attempts == 2 and len(sleeps) == 1
+
+    def test_unknown_check_or_node(self):
+        svc, _ = _service(_RemediableMock())
+        with pytest.raises(ValueError, match="Check not found"):
+            svc.verify_check("customer-a-node", "nope")
+        with pytest.raises(ValueError, match="not found"):
+            svc.verify_check("nope", "firewall_enabled")
+
+
+class TestRemediationVerification:
+    def test_successful_execution_is_verified_and_recorded(self):
+        prox = _RemediableMock({"firewall_enabled": True})
+        audit, _ = _service(prox)
+        auto = AutomationService(prox, verifier=audit.verify_check)
+        resp = auto.execute_remediation("customer-a-node", "firewall_enabled", "- name: fw\n", dry_run=False)
+        assert resp.verification is not None and resp.verification.verified
+        assert "Verification: firewall_enabled verified" in resp.output
+        assert auto.get_history("customer-a-node")[-1].verification.verified
+
+    def test_dry_run_is_not_verified(self):
+        prox = _RemediableMock({"firewall_enabled": True})
+        audit, _ = _service(prox)
+        auto = AutomationService(prox, verifier=audit.verify_check)
+        assert auto.execute_remediation("customer-a-node", "firewall_enabled", "x", dry_run=True).verification is None
+
+    def test_plan_verifies_steps_after_handlers(self):
+        prox = _RemediableMock({"firewall_enabled": True, "ssh_permit_root_login": "no"})
+        audit, _ = _service(prox)
+        auto = AutomationService(prox, verifier=audit.verify_check)
+        steps = [
+            plan_step("firewall_enabled", "- name: fw\n"),
+            plan_step("ssh_root_login", "- name: ssh\n  notify: restart sshd\n", ["firewall_enabled"]),
+        ]
+        resp = auto.execute_plan("customer-a-node", steps, dry_run=False)
+        assert [s.verification.verified for s in resp.steps] == [True, True]
+        assert resp.handlers[0].verification is None
@@ -20,6 +20,7 @@ export default function CheckResultCard({ checkResult, onRemediationClick }) {
   } = checkResult;
   const iso = compliance_mapping?.iso_27001 ?? [];
   const bsi = compliance_mapping?.bsi_grundschutz ?? [];
+  const nis2 = compliance_mapping?.nis2 ?? [];
   const showRemediation = status === 'FAIL' && remediation;
 
   return (
@@ -54,6 +55,14 @@ export default function CheckResultCard({ checkResult, onRemediationClick }) {
               BSI {ref}
             </span>
           ))}
+          {nis2.map((ref) => (
+            <span
+              key={ref}
+              className="inline-flex rounded bg-primary-100 px-1.5 py-0.5 text-xs text-primary-800"
+            >
+              NIS2 {ref}
+            </span>
+          ))}
         </div>
       </td>
       <td className="whitespace-nowrap px-4 py-3 text-right">
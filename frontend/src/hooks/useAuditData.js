@@ -1,23 +1,58 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import * as api from '../services/api';
 
+/**
+ * Applies a FleetChanges delta to the current node list (keeps order, appends added nodes).
+ */
+function applyChanges(nodes, changes) {
+  const byId = new Map(changes.map((c) => [c.node_id, c]));
+  const next = [];
+  for (const node of nodes) {
+    const change = byId.get(node.node_id);
+    if (!change) {
+      next.push(node);
+    } else if (change.change_type !== 'removed') {
+      next.push(change.node);
+    }
+    byId.delete(node.node_id);
+  }
+  for (const change of byId.values()) {
+    if (change.change_type !== 'removed' && change.node) next.push(change.node);
+  }
+  return next;
+}
+
 /**
  * Fetches fleet summary on mount and exposes nodes, loading, error, refetch.
+ * refetch only transfers changed nodes (GET /audit/nodes/changes) once a fleet version is known.
  */
 export function useAuditData() {
   const [nodes, setNodes] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const versionRef = useRef(null);
 
   const fetchNodes = useCallback(async () => {
     setLoading(true);
     setError(null);
     try {
-      const data = await api.getNodes();
-      setNodes(data.nodes ?? []);
+      if (versionRef.current === null) {
+        const data = await api.getNodes();
+        versionRef.current = data.version ?? null;
+        setNodes(data.nodes ?? []);
+      } else {
+        const delta = await api.getNodeChanges(versionRef.current);
+        versionRef.current = delta.version;
+        if (delta.full_resync) {
+          setNodes(delta.changes.filter((c) => c.node).map((c) => c.node));
+        } else if (delta.changes.length > 0) {
+          setNodes((current) => applyChanges(current, delta.changes));
+        }
+      }
     } catch (err) {
       setError(err.message ?? 'Failed to load audit data');
       setNodes([]);
+      versionRef.current = null;
     } finally {
       setLoading(false);
     }
@@ -30,6 +30,13 @@ export function getNodes() {
   return api.get('/audit/nodes').then((res) => res.data);
 }
 
+/**
+ * GET /audit/nodes/changes?since={version} - Delta since fleet version (FleetChanges)
+ */
+export function getNodeChanges(since) {
+  return api.get('/audit/nodes/changes', { params: { since } }).then((res) => res.data);
+}
+
 /**
  * GET /audit/nodes/{nodeId} - Single node audit (NodeAuditResult)
  */